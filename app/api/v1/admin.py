@@ -0,0 +1,29 @@
+from typing import Literal
+from fastapi import APIRouter, Depends, Query
+from app.db.query_log import get_slow_queries, reset_slow_queries
+from app.services.history_writer import history_writer
+from app.models.user_model import User
+from app.core.security import get_admin_user
+from app.core.profiler import ProfiledRoute
+
+router = APIRouter(prefix="/admin", tags=["Admin"], route_class=ProfiledRoute)
+
+
+@router.get("/slow-queries")
+def list_slow_queries(
+    limit: int = Query(20, ge=1, le=200),
+    order_by: Literal["total_ms", "max_ms", "mean_ms", "count"] = "total_ms",
+    current_user: User = Depends(get_admin_user),
+):
+    return get_slow_queries(limit, order_by)
+
+
+@router.delete("/slow-queries")
+def clear_slow_queries(current_user: User = Depends(get_admin_user)):
+    reset_slow_queries()
+    return {"message": "Slow query log cleared"}
+
+
+@router.get("/history-writer")
+def get_history_writer_stats(current_user: User = Depends(get_admin_user)):
+    return history_writer.stats()
@@ -0,0 +1,56 @@
+from datetime import datetime
+from typing import Literal
+from fastapi import APIRouter, Depends, Query
+from app.services.analytics_service import AnalyticsService
+from app.repository.analytics_repo import AnalyticsRepository
+from app.db.database import get_db, get_read_db
+from app.schemas.analytics_schema import SalesRollupResponse, ProductSalesResponse
+from app.models.analytics_model import RollupGranularity
+from app.models.order_model import OrderStatus
+from app.models.user_model import User
+from app.core.security import get_admin_user
+from app.core.profiler import ProfiledRoute
+
+router = APIRouter(prefix="/analytics", tags=["Analytics"], route_class=ProfiledRoute)
+
+
+def get_analytics_service(db=Depends(get_db)):
+    return AnalyticsService(AnalyticsRepository(db))
+
+
+def get_analytics_read_service(db=Depends(get_read_db)):
+    return AnalyticsService(AnalyticsRepository(db))
+
+
+@router.get("/sales", response_model=list[SalesRollupResponse])
+def get_sales(
+    granularity: RollupGranularity = RollupGranularity.hour,
+    start: datetime | None = None,
+    end: datetime | None = None,
+    product_id: int | None = None,
+    status: OrderStatus | None = None,
+    service: AnalyticsService = Depends(get_analytics_read_service),
+    current_user: User = Depends(get_admin_user),
+):
+    return service.get_sales(granularity, start, end, product_id, status)
+
+
+@router.get("/products/top", response_model=list[ProductSalesResponse])
+def get_top_products(
+    start: datetime | None = None,
+    end: datetime | None = None,
+    limit: int = Query(10, ge=1, le=100),
+    metric: Literal["revenue", "units"] = "revenue",
+    service: AnalyticsService = Depends(get_analytics_read_service),
+    current_user: User = Depends(get_admin_user),
+):
+    return service.get_top_products(start, end, limit, metric)
+
+
+@router.post("/rebuild")
+def rebuild_rollups(
+    service: AnalyticsService = Depends(get_analytics_service),
+    current_user: User = Depends(get_admin_user),
+):
+    service.rebuild_rollups()
+    return {"message": "Sales rollups rebuilt successfully"}
@@ -0,0 +1,20 @@
+from fastapi import APIRouter, Depends, Request
+from starlette.concurrency import run_in_threadpool
+from app.core.batch import run_batch, validate_batch
+from app.core.security import get_token_claims, load_principal
+from app.db.database import create_session
+from app.schemas.batch_schema import BatchRequest, BatchResponse
+
+router = APIRouter(prefix="/batch", tags=["Batch"])
+
+
+@router.post("", response_model=BatchResponse)
+async def execute_batch(batch: BatchRequest, request: Request, claims: dict = Depends(get_token_claims)):
+    validate_batch(batch.requests)
+    db = create_session()
+    try:
+        principal = await run_in_threadpool(load_principal, db, claims)
+        responses = await run_batch(request, batch.requests, principal, db)
+    finally:
+        await run_in_threadpool(db.close)
+    return {"responses": responses}
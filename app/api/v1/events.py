@@ -0,0 +1,68 @@
+import asyncio
+from fastapi import APIRouter, Depends, Query, Request
+from fastapi.responses import StreamingResponse
+from app.core.config import settings
+from app.core.events import Subscription, event_hub, product_channel, user_channel
+from app.core.exceptions import InvalidFieldsException
+from app.core.security import get_token_claims
+from app.core.profiler import ProfiledRoute
+
+router = APIRouter(prefix="/events", tags=["Events"], route_class=ProfiledRoute)
+
+MAX_PRODUCT_SUBSCRIPTIONS = 50
+
+
+def parse_product_ids(products: str | None) -> set[int]:
+    if not products:
+        return set()
+    try:
+        product_ids = {int(value) for value in products.split(",") if value.strip()}
+    except ValueError:
+        raise InvalidFieldsException("products must be a comma-separated list of ids")
+    if len(product_ids) > MAX_PRODUCT_SUBSCRIPTIONS:
+        raise InvalidFieldsException(f"At most {MAX_PRODUCT_SUBSCRIPTIONS} products can be subscribed")
+    return product_ids
+
+
+class EventStreamResponse(StreamingResponse):
+
+    def __init__(self, content, subscription: Subscription):
+        super().__init__(
+            content,
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
+        self.subscription = subscription
+
+
+    async def __call__(self, scope, receive, send):
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            event_hub.unsubscribe(self.subscription)
+
+
+@router.get("/stream")
+async def stream_events(
+    request: Request,
+    products: str | None = Query(None, description="Comma-separated product ids to receive stock updates for"),
+    claims: dict = Depends(get_token_claims),
+):
+    channels = {user_channel(claims["sub"])}
+    channels.update(product_channel(product_id) for product_id in parse_product_ids(products))
+    subscription = event_hub.subscribe(channels)
+
+    async def event_stream():
+        try:
+            yield ": connected\n\n"
+            while not await request.is_disconnected():
+                try:
+                    data = await asyncio.wait_for(subscription.queue.get(), timeout=settings.EVENTS_HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": heartbeat\n\n"
+                    continue
+                yield f"data: {data}\n\n"
+        finally:
+            event_hub.unsubscribe(subscription)
+
+    return EventStreamResponse(event_stream(), subscription)
@@ -1,56 +1,114 @@
-from fastapi import APIRouter, Depends, Query, BackgroundTasks
+from fastapi import APIRouter, Depends, Query, BackgroundTasks, Request, Response
+from fastapi.responses import JSONResponse
+from sqlalchemy.orm import Session
 from app.services.order_service import OrderService
 from app.repository.order_repo import OrderRepository
-from app.db.database import get_db
-from app.schemas.order_schema import OrderCreate, OrderResponse, OrderUpdate
+from app.repository.analytics_repo import AnalyticsRepository
+from app.db.database import get_db, get_read_db
+from app.schemas.order_schema import OrderCreate, OrderResponse, OrderExpandedResponse, OrderTicketResponse, OrderUpdate
 from app.core.security import get_current_user, get_admin_user
-from app.models.user_model import User
+from app.core.rate_limit import limit_order_create
+from app.models.user_model import User, UserRole
 from app.schemas.pagination import PaginatedResponse
 from app.core.background_tasks import log_order_created, log_order_status_updated
+from app.jobs.reservation_sweeper import get_sweeper_metrics
+from app.services.order_batcher import order_batcher
+from app.services.order_intake import submit_order, get_ticket
+from app.core.exceptions import OrderTicketNotFoundException
+from app.core.config import settings
+from app.core.profiler import ProfiledRoute
 
-router = APIRouter(prefix="/orders", tags=["Orders"])
+router = APIRouter(prefix="/orders", tags=["Orders"], route_class=ProfiledRoute)
 
 
 def get_order_service(db=Depends(get_db)):
-    return OrderService(OrderRepository(db))
+    return OrderService(OrderRepository(db), AnalyticsRepository(db))
 
 
-@router.post("/", response_model=OrderResponse)
+def get_order_read_service(db=Depends(get_read_db)):
+    return OrderService(OrderRepository(db), AnalyticsRepository(db))
+
+
+@router.post("/", response_model=OrderResponse, dependencies=[Depends(limit_order_create)])
 def create_order(
     order: OrderCreate,
     background_tasks: BackgroundTasks,
     service: OrderService = Depends(get_order_service),
     current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
 ):
-    result = service.create_order(current_user.id, order.product_id, order.quantity)
+    user_id = current_user.id
+    if settings.ORDER_INTAKE_MODE == "batched":
+        # Release the request's pooled connection so the batcher can get one while this request waits.
+        db.rollback()
+        result = order_batcher.submit(user_id, order.product_id, order.quantity)
+    else:
+        result = service.create_order(user_id, order.product_id, order.quantity)
     background_tasks.add_task(
         log_order_created,
         result.id,
-        current_user.id,
+        user_id,
         order.product_id,
         order.quantity
     )
     return result
 
 
-@router.get("/", response_model=PaginatedResponse[OrderResponse])
+@router.post("/async", response_model=OrderTicketResponse, status_code=202, dependencies=[Depends(limit_order_create)])
+def create_order_async(
+    order: OrderCreate,
+    request: Request,
+    response: Response,
+    current_user: User = Depends(get_current_user),
+):
+    ticket = submit_order(current_user.id, order.product_id, order.quantity)
+    response.headers["Location"] = str(request.url_for("get_order_ticket", ticket_id=ticket["ticket_id"]))
+    return ticket
+
+
+@router.get("/tickets/{ticket_id}", response_model=OrderTicketResponse)
+def get_order_ticket(ticket_id: str, current_user: User = Depends(get_current_user)):
+    ticket = get_ticket(ticket_id)
+    if ticket is None or (ticket["user_id"] != current_user.id and current_user.role != UserRole.admin):
+        raise OrderTicketNotFoundException("Order ticket not found")
+    return ticket
+
+
+@router.get("/", response_model=PaginatedResponse[OrderExpandedResponse], response_model_exclude_unset=True)
 def get_all_orders(
     page: int = Query(1, ge=1),
     limit: int = Query(10, ge=1, le=100),
-    service: OrderService = Depends(get_order_service),
+    include_history: bool = False,
+    fields: str | None = Query(None, description="Comma-separated fields to return, e.g. id,name"),
+    expand: str | None = Query(None, description="Comma-separated relations to embed: product, user"),
+    service: OrderService = Depends(get_order_read_service),
     current_user: User = Depends(get_admin_user),
 ):
-    return service.get_all_orders(page, limit)
+    result = service.get_all_orders(page, limit, include_history, fields, expand)
+    if fields:
+        return JSONResponse(result)
+    return result
 
 
-@router.get("/me", response_model=PaginatedResponse[OrderResponse])
+@router.get("/me", response_model=PaginatedResponse[OrderExpandedResponse], response_model_exclude_unset=True)
 def get_my_orders(
     page: int = Query(1, ge=1),
     limit: int = Query(10, ge=1, le=100),
-    service: OrderService = Depends(get_order_service),
+    include_history: bool = False,
+    fields: str | None = Query(None, description="Comma-separated fields to return, e.g. id,name"),
+    expand: str | None = Query(None, description="Comma-separated relations to embed: product, user"),
+    service: OrderService = Depends(get_order_read_service),
     current_user: User = Depends(get_current_user),
 ):
-    return service.get_my_orders(current_user.id, page, limit)
+    result = service.get_my_orders(current_user.id, page, limit, include_history, fields, expand)
+    if fields:
+        return JSONResponse(result)
+    return result
+
+
+@router.get("/reservations/metrics")
+def get_reservation_sweeper_metrics(current_user: User = Depends(get_admin_user)):
+    return get_sweeper_metrics()
 
 
 @router.put("/{order_id}", response_model=OrderResponse)
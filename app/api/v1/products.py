@@ -1,19 +1,28 @@
-from fastapi import APIRouter, Depends, Query
+from decimal import Decimal
+from fastapi import APIRouter, Depends, Query, Request
+from fastapi.responses import JSONResponse
 from app.services.product_service import ProductService
 from app.repository.product_repo import ProductRepository
-from app.db.database import get_db
-from app.schemas.product_schema import ProductCreate, ProductResponse, ProductUpdate
+from app.db.database import get_db, get_read_db
+from app.schemas.product_schema import ProductCreate, ProductResponse, ProductUpdate, ProductHistoryResponse, ProductFilter, ProductSort
 from app.models.user_model import User
 from app.core.security import get_admin_user
-from app.schemas.pagination import PaginatedResponse
+from app.schemas.pagination import PaginatedResponse, CursorPage
+from app.core.redis_cache import get_cache_stats
+from app.core.profiler import ProfiledRoute
+from app.core.compression import EncodedBody, encoded_response, negotiate
 
-router = APIRouter(prefix="/products", tags=["Products"])
+router = APIRouter(prefix="/products", tags=["Products"], route_class=ProfiledRoute)
 
 
 def get_product_service(db=Depends(get_db)):
     return ProductService(ProductRepository(db))
 
 
+def get_product_read_service(db=Depends(get_read_db)):
+    return ProductService(ProductRepository(db))
+
+
 @router.post("/", response_model=ProductResponse)
 def create_product(
     product: ProductCreate,
@@ -25,20 +34,52 @@ def create_product(
 
 @router.get("/", response_model=PaginatedResponse[ProductResponse])
 def get_all_products(
+    request: Request,
     page: int = Query(1, ge=1),
     limit: int = Query(10, ge=1, le=100),
     search: str | None = None,
-    service: ProductService = Depends(get_product_service),
+    min_price: Decimal | None = Query(None, ge=0),
+    max_price: Decimal | None = Query(None, ge=0),
+    in_stock: bool = False,
+    sort: ProductSort = "-id",
+    fields: str | None = Query(None, description="Comma-separated fields to return, e.g. id,name"),
+    service: ProductService = Depends(get_product_read_service),
 ):
-    return service.get_all_products(page, limit, search)
+    filters = ProductFilter(search=search, min_price=min_price, max_price=max_price, in_stock=in_stock, sort=sort)
+    result = service.get_all_products(page, limit, filters, fields, negotiate(request.headers.get("accept-encoding")))
+    if isinstance(result, EncodedBody):
+        return encoded_response(result)
+    if fields:
+        return JSONResponse(result)
+    return result
+
+
+@router.get("/cache/metrics")
+def get_product_cache_metrics(current_user: User = Depends(get_admin_user)):
+    return get_cache_stats()
 
 
 @router.get("/{product_id}", response_model=ProductResponse)
 def get_product(
+    request: Request,
     product_id: int,
-    service: ProductService = Depends(get_product_service),
+    service: ProductService = Depends(get_product_read_service),
+):
+    result = service.get_product(product_id, negotiate(request.headers.get("accept-encoding")))
+    if isinstance(result, EncodedBody):
+        return encoded_response(result)
+    return result
+
+
+@router.get("/{product_id}/history", response_model=CursorPage[ProductHistoryResponse])
+def get_product_history(
+    product_id: int,
+    limit: int = Query(50, ge=1, le=500),
+    cursor: str | None = Query(None, description="next_cursor from the previous page"),
+    service: ProductService = Depends(get_product_read_service),
+    current_user: User = Depends(get_admin_user),
 ):
-    return service.get_product(product_id)
+    return service.get_history(product_id, limit, cursor)
 
 
 @router.put("/{product_id}", response_model=ProductResponse)
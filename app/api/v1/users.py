@@ -1,20 +1,32 @@
 from fastapi import APIRouter, Depends, Query, BackgroundTasks
+from fastapi.responses import JSONResponse
 from app.services.user_service import UserService
+from app.services.session_service import SessionService
 from app.schemas.user_schema import UserCreate, UserResponse, UserUpdate, TokenResponse, RefreshRequest
 from app.models.user_model import User
-from app.db.database import get_db
+from app.db.database import get_db, get_read_db
 from app.repository.user_repo import UserRepository
-from app.core.security import get_current_user, get_admin_user
+from app.core.security import get_current_user, get_admin_user, get_token_claims
+from app.core.rate_limit import limit_login
 from fastapi.security import OAuth2PasswordRequestForm
 from app.schemas.pagination import PaginatedResponse
 from app.core.background_tasks import log_user_registered
+from app.core.profiler import ProfiledRoute
 
-router = APIRouter(prefix="/users", tags=["Users"])
+router = APIRouter(prefix="/users", tags=["Users"], route_class=ProfiledRoute)
 
 def get_user_service(db = Depends(get_db)):
     return UserService(UserRepository(db))
 
 
+def get_user_read_service(db = Depends(get_read_db)):
+    return UserService(UserRepository(db))
+
+
+def get_session_service():
+    return SessionService()
+
+
 @router.post("/register", response_model=UserResponse)
 def register_user(
     user: UserCreate,
@@ -26,7 +38,7 @@ def register_user(
     return result
 
 
-@router.post("/login", response_model=TokenResponse)
+@router.post("/login", response_model=TokenResponse, dependencies=[Depends(limit_login)])
 def login_user(
     form_data: OAuth2PasswordRequestForm = Depends(),
     service: UserService = Depends(get_user_service),
@@ -34,20 +46,21 @@ def login_user(
     return service.login_user(form_data.username, form_data.password)
 
 
-@router.post("/refresh")
+@router.post("/refresh", response_model=TokenResponse)
 def refresh_token(
     request: RefreshRequest,
-    service: UserService = Depends(get_user_service),
+    service: SessionService = Depends(get_session_service),
 ):
     return service.refresh_token(request.refresh_token)
 
 
 @router.post("/logout")
 def logout_user(
-    service: UserService = Depends(get_user_service),
-    current_user: User = Depends(get_current_user),
+    request: RefreshRequest | None = None,
+    service: SessionService = Depends(get_session_service),
+    claims: dict = Depends(get_token_claims),
 ):
-    service.logout_user(current_user.id)
+    service.logout_user(claims["sub"], request.refresh_token if request else None)
     return {"message": "Logged out successfully"}
 
 
@@ -55,10 +68,14 @@ def logout_user(
 def get_users(
     page: int = Query(1, ge=1),
     limit: int = Query(10, ge=1, le=100),
-    service: UserService = Depends(get_user_service),
+    fields: str | None = Query(None, description="Comma-separated fields to return, e.g. id,name"),
+    service: UserService = Depends(get_user_read_service),
     current_user: User = Depends(get_admin_user)
 ):
-    return service.get_all_users(page, limit)
+    result = service.get_all_users(page, limit, fields)
+    if fields:
+        return JSONResponse(result)
+    return result
 
 
 @router.get("/me", response_model=UserResponse)
@@ -69,7 +86,7 @@ def read_current_user(current_user: User = Depends(get_current_user)):
 @router.get("/{user_id}", response_model=UserResponse)
 def get_user(
     user_id: int,
-    service: UserService = Depends(get_user_service),
+    service: UserService = Depends(get_user_read_service),
     current_user: User = Depends(get_current_user),
 ):
     return service.get_user_by_id(user_id, current_user)
@@ -0,0 +1,68 @@
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class AdmissionRejected(Exception):
+    pass
+
+
+class ConcurrencyLimiter:
+
+    def __init__(self, name: str, max_concurrent: int, max_queue: int, queue_timeout: float):
+        self.name = name
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self._semaphore = asyncio.Semaphore(max_concurrent)
+        self._waiting = 0
+
+
+    @asynccontextmanager
+    async def slot(self):
+        if self._semaphore.locked():
+            if self._waiting >= self.max_queue:
+                raise AdmissionRejected(f"{self.name} queue full")
+            self._waiting += 1
+            try:
+                await asyncio.wait_for(self._semaphore.acquire(), timeout=self.queue_timeout)
+            except asyncio.TimeoutError:
+                raise AdmissionRejected(f"{self.name} queue wait timed out")
+            finally:
+                self._waiting -= 1
+        else:
+            await self._semaphore.acquire()
+        try:
+            yield
+        finally:
+            self._semaphore.release()
+
+
+_queue_timeout = settings.ADMISSION_QUEUE_TIMEOUT_MS / 1000
+
+_limiters = {
+    "auth": ConcurrencyLimiter(
+        "auth", settings.ADMISSION_AUTH_CONCURRENCY, settings.ADMISSION_AUTH_QUEUE, _queue_timeout
+    ),
+    "catalogue": ConcurrencyLimiter(
+        "catalogue", settings.ADMISSION_CATALOGUE_CONCURRENCY, settings.ADMISSION_CATALOGUE_QUEUE, _queue_timeout
+    ),
+    "order_writes": ConcurrencyLimiter(
+        "order_writes", settings.ADMISSION_ORDER_WRITES_CONCURRENCY, settings.ADMISSION_ORDER_WRITES_QUEUE, _queue_timeout
+    ),
+}
+
+ROUTE_GROUPS = (
+    ("auth", {"POST"}, ("/api/v1/users/login", "/api/v1/users/refresh", "/api/v1/users/register")),
+    ("catalogue", {"GET"}, ("/api/v1/products",)),
+    ("order_writes", {"POST", "PUT"}, ("/api/v1/orders",)),
+)
+
+
+def get_limiter(method: str, path: str) -> ConcurrencyLimiter | None:
+    for group, methods, prefixes in ROUTE_GROUPS:
+        if method in methods and path.startswith(prefixes):
+            return _limiters[group]
+    return None
@@ -0,0 +1,109 @@
+import asyncio
+import json
+import logging
+from urllib.parse import urlsplit
+from fastapi import Request
+from starlette.concurrency import run_in_threadpool
+from app.core.config import settings
+from app.core.exceptions import InvalidBatchException
+from app.schemas.batch_schema import BatchSubRequest
+
+logger = logging.getLogger(__name__)
+
+API_PREFIX = "/api/v1/"
+EXCLUDED_PREFIXES = ("/api/v1/batch", "/api/v1/events")
+
+
+def validate_batch(requests: list[BatchSubRequest]):
+    if len(requests) > settings.BATCH_MAX_REQUESTS:
+        raise InvalidBatchException(f"At most {settings.BATCH_MAX_REQUESTS} requests per batch")
+    for sub in requests:
+        path = urlsplit(sub.path).path
+        if not path.startswith(API_PREFIX) or path.startswith(EXCLUDED_PREFIXES):
+            raise InvalidBatchException(f"Path not allowed in a batch: {sub.path}")
+
+
+def plan_waves(requests: list[BatchSubRequest]) -> list[list[int]]:
+    waves: list[list[int]] = []
+    for index, sub in enumerate(requests):
+        if sub.method == "GET" and waves and requests[waves[-1][0]].method == "GET":
+            waves[-1].append(index)
+        else:
+            waves.append([index])
+    return waves
+
+
+async def call_subrequest(parent: Request, sub: BatchSubRequest, state: dict) -> dict:
+    url = urlsplit(sub.path)
+    body = json.dumps(sub.body).encode() if sub.body is not None else b""
+    headers = [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())]
+    authorization = parent.headers.get("authorization")
+    if authorization:
+        headers.append((b"authorization", authorization.encode()))
+    scope = {
+        "type": "http",
+        "asgi": parent.scope.get("asgi", {"version": "3.0"}),
+        "http_version": "1.1",
+        "method": sub.method,
+        "scheme": parent.url.scheme,
+        "path": url.path,
+        "raw_path": url.path.encode(),
+        "query_string": url.query.encode(),
+        "root_path": "",
+        "headers": headers,
+        "client": parent.scope.get("client"),
+        "server": parent.scope.get("server"),
+        "state": state,
+    }
+    received = False
+
+    async def receive():
+        nonlocal received
+        if received:
+            return {"type": "http.disconnect"}
+        received = True
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    response = {"status": 500, "headers": {}, "body": b""}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            response["status"] = message["status"]
+            response["headers"] = {key.decode("latin-1"): value.decode("latin-1") for key, value in message.get("headers", [])}
+        elif message["type"] == "http.response.body":
+            response["body"] += message.get("body", b"")
+
+    try:
+        await parent.app(scope, receive, send)
+    except Exception as e:
+        logger.error(f"Batch sub-request failed - {sub.method} {sub.path}, error: {e}")
+    content = response["body"]
+    if content and response["headers"].get("content-type", "").startswith("application/json"):
+        content = json.loads(content)
+    elif content:
+        content = content.decode("utf-8", errors="replace")
+    else:
+        content = None
+    return {"id": sub.id, "status": response["status"], "headers": response["headers"], "body": content}
+
+
+async def run_batch(parent: Request, requests: list[BatchSubRequest], principal, db) -> list[dict]:
+    base_state = dict(parent.scope.get("state") or {})
+    results: list[dict | None] = [None] * len(requests)
+    limit = asyncio.Semaphore(settings.BATCH_MAX_CONCURRENCY)
+
+    async def run(index: int, shared_db):
+        async with limit:
+            state = {**base_state, "batch_principal": principal}
+            if shared_db is not None:
+                state["batch_db"] = shared_db
+            results[index] = await call_subrequest(parent, requests[index], state)
+
+    for wave in plan_waves(requests):
+        if len(wave) == 1:
+            await run(wave[0], db)
+            if results[wave[0]]["status"] >= 400:
+                await run_in_threadpool(db.rollback)
+        else:
+            await asyncio.gather(*(run(index, None) for index in wave))
+    return results
@@ -0,0 +1,39 @@
+import logging
+import threading
+import time
+from app.core.config import settings
+from app.core.security import warm_password_hashing
+from app.db.database import prewarm_pool
+from app.jobs.cache_warmup import run_cache_warmup
+
+logger = logging.getLogger(__name__)
+
+_ready = threading.Event()
+
+
+def is_ready() -> bool:
+    return _ready.is_set()
+
+
+def reset_ready():
+    _ready.clear()
+
+
+def _warm_step(name: str, func):
+    started = time.perf_counter()
+    try:
+        func()
+    except Exception as e:
+        logger.warning(f"Boot warm-up step failed - step: {name}, error: {e}")
+        return
+    logger.info(f"Boot warm-up step done - step: {name}, elapsed: {(time.perf_counter() - started) * 1000:.1f}ms")
+
+
+def run_boot_warmup():
+    started = time.perf_counter()
+    _warm_step("db-pool", prewarm_pool)
+    _warm_step("password-hashing", warm_password_hashing)
+    if settings.BOOT_WARM_CACHE:
+        _warm_step("cache", run_cache_warmup)
+    _ready.set()
+    logger.info(f"Application ready - warm-up: {(time.perf_counter() - started) * 1000:.1f}ms")
@@ -0,0 +1,111 @@
+import gzip
+import json
+from typing import NamedTuple
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.responses import Response
+from app.core.config import settings
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESSIBLE_TYPES = ("application/json", "text/plain", "text/html")
+
+ENCODERS = {}
+if brotli is not None:
+    ENCODERS["br"] = lambda data: brotli.compress(data, quality=settings.COMPRESSION_BROTLI_QUALITY)
+ENCODERS["gzip"] = lambda data: gzip.compress(data, compresslevel=settings.COMPRESSION_GZIP_LEVEL, mtime=0)
+
+
+class EncodedBody(NamedTuple):
+    content: bytes
+    encoding: str
+
+
+def negotiate(accept_encoding: str | None) -> str | None:
+    if not settings.COMPRESSION_ENABLED or not accept_encoding:
+        return None
+    weights: dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.partition(";")
+        params = params.strip()
+        try:
+            weights[name.strip().lower()] = float(params[2:]) if params.startswith("q=") else 1.0
+        except ValueError:
+            continue
+    best, best_weight = None, 0.0
+    for encoding in ENCODERS:
+        weight = weights.get(encoding, weights.get("*", 0.0))
+        if weight > best_weight:
+            best, best_weight = encoding, weight
+    return best
+
+
+def render_json(value) -> bytes:
+    return json.dumps(value, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+
+
+def precompress(value) -> dict[str, bytes]:
+    if not settings.COMPRESSION_ENABLED or not settings.COMPRESSION_PRECOMPRESS_CACHE:
+        return {}
+    body = render_json(value)
+    if len(body) < settings.COMPRESSION_MIN_BYTES:
+        return {}
+    return {encoding: encode(body) for encoding, encode in ENCODERS.items()}
+
+
+def encoded_response(body: EncodedBody) -> Response:
+    return Response(
+        body.content,
+        media_type="application/json",
+        headers={"Content-Encoding": body.encoding, "Vary": "Accept-Encoding"},
+    )
+
+
+class CompressionMiddleware:
+
+    def __init__(self, app, minimum_size: int):
+        self.app = app
+        self.minimum_size = minimum_size
+
+
+    async def __call__(self, scope, receive, send):
+        encoding = negotiate(Headers(scope=scope).get("accept-encoding")) if scope["type"] == "http" else None
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start = None
+        chunks: list[bytes] = []
+        passthrough = False
+
+        async def send_compressed(message):
+            nonlocal start, passthrough
+            if passthrough:
+                await send(message)
+                return
+            if message["type"] == "http.response.start":
+                headers = Headers(raw=message["headers"])
+                if "content-encoding" in headers or not headers.get("content-type", "").startswith(COMPRESSIBLE_TYPES):
+                    passthrough = True
+                    await send(message)
+                else:
+                    start = message
+                return
+            chunks.append(message.get("body", b""))
+            if message.get("more_body", False):
+                return
+            body = b"".join(chunks)
+            if len(body) >= self.minimum_size:
+                compressed = ENCODERS[encoding](body)
+                if len(compressed) < len(body):
+                    headers = MutableHeaders(raw=start["headers"])
+                    headers["Content-Encoding"] = encoding
+                    headers["Content-Length"] = str(len(compressed))
+                    headers.add_vary_header("Accept-Encoding")
+                    body = compressed
+            await send(start)
+            await send({"type": "http.response.body", "body": body})
+
+        await self.app(scope, receive, send_compressed)
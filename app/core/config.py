@@ -12,10 +12,147 @@ class Settings(BaseSettings):
     ALLOWED_ORIGINS: str
     REDIS_URL: str
 
+    JWT_KEYS_DIR: str = "keys"
+    JWT_ACTIVE_KID: str = ""
+    TOKEN_CACHE_SIZE: int = 10000
+    JWKS_MAX_AGE_SECONDS: int = 300
+
+    REDIS_CACHE_MAX_CONNECTIONS: int = 50
+    REDIS_CACHE_POOL_TIMEOUT_MS: int = 100
+    REDIS_CACHE_SOCKET_TIMEOUT_MS: int = 250
+    REDIS_SOCKET_TIMEOUT_MS: int = 1000
+    REDIS_CACHE_CONNECT_TIMEOUT_MS: int = 250
+    REDIS_SCAN_COUNT: int = 500
+    REDIS_BREAKER_WINDOW_SECONDS: float = 10.0
+    REDIS_BREAKER_MIN_CALLS: int = 20
+    REDIS_BREAKER_ERROR_RATE: float = 0.5
+    REDIS_BREAKER_SLOW_CALL_MS: float = 100.0
+    REDIS_BREAKER_SLOW_CALL_RATE: float = 0.5
+    REDIS_BREAKER_OPEN_SECONDS: float = 5.0
+
+    CACHE_CODEC: str = "msgpack"
+    CACHE_COMPRESSION: str = "zlib"
+    CACHE_COMPRESS_MIN_BYTES: int = 1024
+    PRODUCT_NEGATIVE_CACHE_TTL_SECONDS: int = 30
+
+    COMPRESSION_ENABLED: bool = True
+    COMPRESSION_MIN_BYTES: int = 1024
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_BROTLI_QUALITY: int = 5
+    COMPRESSION_PRECOMPRESS_CACHE: bool = True
+    CACHE_WARMUP_TOP_PRODUCTS: int = 50
+    CACHE_WARMUP_TOP_DAYS: int = 7
+    CACHE_WARMUP_LIST_PAGES: int = 3
+    CACHE_WARMUP_LIST_LIMIT: int = 10
+    CACHE_WARMUP_INTERVAL_SECONDS: int = 240
+
+    SERVER_HOST: str = "0.0.0.0"
+    PORT: int = 8000
+    SERVER_WORKERS: int = 0
+    SERVER_BACKLOG: int = 2048
+    SERVER_MAX_REQUESTS: int = 10000
+    SERVER_MAX_REQUESTS_JITTER: int = 1000
+    SERVER_MAX_MEMORY_MB: int = 0
+    SERVER_MEMORY_CHECK_SECONDS: int = 10
+    SERVER_GRACEFUL_TIMEOUT_SECONDS: int = 30
+    SERVER_SHUTDOWN_GRACE_SECONDS: int = 10
+    RUN_PERIODIC_JOBS: bool = True
+
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_PREWARM: int = 2
+
+    BOOT_SCHEMA_MODE: str = "fingerprint"
+    BOOT_WARM_CACHE: bool = True
+
+    PRODUCT_HISTORY_ENABLED: bool = True
+    PRODUCT_HISTORY_BUFFER_SIZE: int = 10000
+    PRODUCT_HISTORY_FLUSH_SIZE: int = 500
+    PRODUCT_HISTORY_FLUSH_INTERVAL_MS: int = 1000
+    PRODUCT_HISTORY_ENQUEUE_TIMEOUT_MS: int = 50
+    PRODUCT_HISTORY_SHUTDOWN_TIMEOUT_SECONDS: float = 10.0
+
+    REPLICA_DATABASE_URLS: str = ""
+    REPLICA_RETRY_SECONDS: int = 30
+    READ_YOUR_WRITES_SECONDS: int = 5
+
+    ORDER_PARTITION_MONTHS_AHEAD: int = 3
+    ORDER_ARCHIVE_AFTER_DAYS: int = 90
+    ORDER_ARCHIVE_BATCH_SIZE: int = 1000
+    ORDER_ARCHIVE_INTERVAL_SECONDS: int = 3600
+
+    ADMISSION_AUTH_CONCURRENCY: int = 8
+    ADMISSION_AUTH_QUEUE: int = 32
+    ADMISSION_CATALOGUE_CONCURRENCY: int = 16
+    ADMISSION_CATALOGUE_QUEUE: int = 64
+    ADMISSION_ORDER_WRITES_CONCURRENCY: int = 16
+    ADMISSION_ORDER_WRITES_QUEUE: int = 64
+    ADMISSION_QUEUE_TIMEOUT_MS: int = 2000
+    ADMISSION_RETRY_AFTER_SECONDS: int = 1
+
+    RATE_LIMIT_LOGIN_CAPACITY: int = 10
+    RATE_LIMIT_LOGIN_REFILL_PER_SECOND: float = 0.2
+    RATE_LIMIT_LOGIN_ACCOUNT_CAPACITY: int = 100
+    RATE_LIMIT_LOGIN_ACCOUNT_REFILL_PER_SECOND: float = 1.0
+    RATE_LIMIT_ORDERS_CAPACITY: int = 20
+    RATE_LIMIT_ORDERS_REFILL_PER_SECOND: float = 2.0
+
+    EVENTS_MAX_CONNECTIONS_PER_WORKER: int = 500
+    EVENTS_QUEUE_SIZE: int = 100
+    EVENTS_HEARTBEAT_SECONDS: int = 15
+
+    ORDER_RESERVATION_TTL_MINUTES: int = 30
+    ORDER_SWEEP_BATCH_SIZE: int = 500
+    ORDER_SWEEP_INTERVAL_SECONDS: int = 60
+
+    ORDER_INTAKE_MODE: str = "direct"
+    ORDER_BATCH_WINDOW_MS: int = 5
+    ORDER_BATCH_MAX_SIZE: int = 100
+    ORDER_BATCH_TIMEOUT_SECONDS: int = 10
+
+    ORDER_INTAKE_BACKEND: str = "redis"
+    ORDER_INTAKE_STREAM: str = "orders:intake"
+    ORDER_INTAKE_GROUP: str = "order-intake"
+    ORDER_INTAKE_DEAD_LETTER_STREAM: str = "orders:intake:dead"
+    ORDER_INTAKE_STREAM_MAXLEN: int = 100000
+    ORDER_INTAKE_MAX_ATTEMPTS: int = 3
+    ORDER_INTAKE_RETRY_IDLE_MS: int = 5000
+    ORDER_INTAKE_READ_COUNT: int = 50
+    ORDER_INTAKE_BLOCK_MS: int = 5000
+    ORDER_TICKET_TTL_SECONDS: int = 86400
+    ORDER_INTAKE_RECEIPT_RETENTION_DAYS: int = 7
+
+    ORDER_READ_MODEL_TTL_SECONDS: int = 3600
+    ORDER_READ_MODEL_REPLICA_TTL_SECONDS: int = 5
+    ORDER_READ_MODEL_MAX_ORDERS: int = 1000
+
+    PROFILER_ENABLED: bool = True
+    PROFILER_SAMPLE_RATE: float = 0.0
+    PROFILER_DIR: str = "profiles"
+    PROFILER_MAX_FILES: int = 200
+    PROFILER_MAX_AGE_HOURS: int = 72
+    PROFILER_TOP_FUNCTIONS: int = 5
+
+    SLOW_QUERY_MS: float = 200.0
+    SLOW_QUERY_MAX_ENTRIES: int = 500
+    SLOW_QUERY_LOG_PARAMETERS: bool = True
+    SLOW_QUERY_PARAMETERS_MAX_CHARS: int = 500
+    SLOW_QUERY_EXPLAIN_SAMPLE_RATE: float = 0.1
+    SLOW_QUERY_EXPLAIN_INTERVAL_SECONDS: int = 300
+    SLOW_QUERY_EXPLAIN_TIMEOUT_MS: int = 5000
+
+    BATCH_MAX_REQUESTS: int = 20
+    BATCH_MAX_CONCURRENCY: int = 6
+
+    REQUEST_TIMEOUT_SECONDS: float = 10.0
+    REQUEST_TIMEOUT_MAX_SECONDS: float = 30.0
+    REQUEST_TIMEOUT_ROUTES: str = "POST /api/v1/orders=5,* /api/v1/analytics=30,POST /api/v1/batch=15"
+    LOCK_TIMEOUT_MS: int = 2000
+
     model_config = SettingsConfigDict(
         env_file=ENV_FILE,
         env_file_encoding="utf-8",
         extra="ignore"
     )
 
-settings = Settings()
\ No newline at end of file
+settings = Settings()
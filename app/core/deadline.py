@@ -0,0 +1,83 @@
+import contextvars
+import logging
+import math
+import time
+from sqlalchemy import event, text
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.core.exceptions import DeadlineExceededException
+
+logger = logging.getLogger(__name__)
+
+TIMEOUT_HEADER = "X-Request-Timeout"
+
+_deadline: contextvars.ContextVar[float | None] = contextvars.ContextVar("request_deadline", default=None)
+
+
+def _parse_route_timeouts(value: str) -> list[tuple[str, str, float]]:
+    routes = []
+    for item in value.split(","):
+        if not item.strip():
+            continue
+        route, _, seconds = item.partition("=")
+        method, _, prefix = route.strip().partition(" ")
+        routes.append((method.upper(), prefix.strip(), float(seconds)))
+    return sorted(routes, key=lambda route: len(route[1]), reverse=True)
+
+
+ROUTE_TIMEOUTS = _parse_route_timeouts(settings.REQUEST_TIMEOUT_ROUTES)
+
+
+def resolve_timeout(method: str, path: str, header: str | None) -> float:
+    timeout = settings.REQUEST_TIMEOUT_SECONDS
+    for route_method, prefix, seconds in ROUTE_TIMEOUTS:
+        if route_method in (method, "*") and path.startswith(prefix):
+            timeout = seconds
+            break
+    if header:
+        try:
+            requested = float(header)
+        except ValueError:
+            requested = math.nan
+        if math.isfinite(requested):
+            timeout = min(requested, settings.REQUEST_TIMEOUT_MAX_SECONDS)
+    return max(timeout, 0.001)
+
+
+def start_deadline(timeout: float) -> tuple[float, contextvars.Token]:
+    deadline = time.monotonic() + timeout
+    current = _deadline.get()
+    if current is not None:
+        deadline = min(deadline, current)
+    return deadline - time.monotonic(), _deadline.set(deadline)
+
+
+def reset_deadline(token: contextvars.Token):
+    _deadline.reset(token)
+
+
+def remaining_seconds() -> float | None:
+    deadline = _deadline.get()
+    if deadline is None:
+        return None
+    return deadline - time.monotonic()
+
+
+def check_deadline():
+    remaining = remaining_seconds()
+    if remaining is not None and remaining <= 0:
+        raise DeadlineExceededException("Request deadline exceeded")
+
+
+@event.listens_for(Session, "after_begin")
+def _apply_statement_timeout(session, transaction, connection):
+    remaining = remaining_seconds()
+    if remaining is None or connection.dialect.name != "postgresql":
+        return
+    check_deadline()
+    connection.execute(text(f"SET LOCAL statement_timeout = {max(int(remaining * 1000), 1)}"))
+
+
+def set_lock_timeout(db: Session):
+    if db.get_bind().dialect.name == "postgresql" and settings.LOCK_TIMEOUT_MS > 0:
+        db.execute(text(f"SET LOCAL lock_timeout = {int(settings.LOCK_TIMEOUT_MS)}"))
@@ -0,0 +1,144 @@
+import asyncio
+import json
+import logging
+import threading
+import time
+from app.core.config import settings
+from app.core.exceptions import EventStreamLimitException
+from app.core.redis_cache import CacheUnavailable, get_redis_client, guarded
+
+logger = logging.getLogger(__name__)
+
+CHANNEL_PREFIX = "events:"
+
+
+def user_channel(user_id: int) -> str:
+    return f"{CHANNEL_PREFIX}user:{user_id}"
+
+
+def product_channel(product_id: int) -> str:
+    return f"{CHANNEL_PREFIX}product:{product_id}"
+
+
+def publish_event(channel: str, event: dict):
+    # Publishing runs on the request path, so it uses the cache client's short timeouts and skips Redis while the
+    # breaker is open; events are best effort and clients resync from the API.
+    try:
+        guarded(lambda client: client.publish(channel, json.dumps(event)))
+    except CacheUnavailable:
+        logger.debug(f"Redis PUBLISH skipped - channel: {channel}")
+    except Exception as e:
+        logger.warning(f"Redis PUBLISH failed - channel: {channel}, error: {e}")
+
+
+def publish_order_event(order, event_type: str):
+    publish_event(user_channel(order.user_id), {
+        "type": event_type,
+        "order_id": order.id,
+        "product_id": order.product_id,
+        "quantity": order.quantity,
+        "status": order.status.value,
+    })
+
+
+def publish_stock_event(product_id: int, stock: int):
+    publish_event(product_channel(product_id), {
+        "type": "product.stock",
+        "product_id": product_id,
+        "stock": stock,
+    })
+
+
+class Subscription:
+
+    def __init__(self, channels: set[str], loop: asyncio.AbstractEventLoop, queue_size: int):
+        self.channels = channels
+        self.loop = loop
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.closed = False
+
+
+    def deliver(self, data: str):
+        self.loop.call_soon_threadsafe(self._put, data)
+
+
+    def _put(self, data: str):
+        if self.queue.full():
+            self.queue.get_nowait()
+        self.queue.put_nowait(data)
+
+
+class EventHub:
+
+    def __init__(self, max_connections: int, queue_size: int):
+        self.max_connections = max_connections
+        self.queue_size = queue_size
+        self._subscriptions: dict[str, set[Subscription]] = {}
+        self._count = 0
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+
+    def subscribe(self, channels: set[str]) -> Subscription:
+        subscription = Subscription(channels, asyncio.get_running_loop(), self.queue_size)
+        with self._lock:
+            if self._count >= self.max_connections:
+                raise EventStreamLimitException("Too many event stream connections")
+            self._count += 1
+            for channel in channels:
+                self._subscriptions.setdefault(channel, set()).add(subscription)
+            if self._thread is None or not self._thread.is_alive():
+                self._stop.clear()
+                self._thread = threading.Thread(target=self._listen, name="event-hub", daemon=True)
+                self._thread.start()
+        return subscription
+
+
+    def unsubscribe(self, subscription: Subscription):
+        with self._lock:
+            if subscription.closed:
+                return
+            subscription.closed = True
+            self._count -= 1
+            for channel in subscription.channels:
+                subscribers = self._subscriptions.get(channel)
+                if subscribers is not None:
+                    subscribers.discard(subscription)
+                    if not subscribers:
+                        del self._subscriptions[channel]
+
+
+    def _dispatch(self, channel: str, data: str):
+        with self._lock:
+            subscribers = list(self._subscriptions.get(channel, ()))
+        for subscription in subscribers:
+            subscription.deliver(data)
+
+
+    def _listen(self):
+        while not self._stop.is_set():
+            pubsub = None
+            try:
+                pubsub = get_redis_client().pubsub(ignore_subscribe_messages=True)
+                pubsub.psubscribe(f"{CHANNEL_PREFIX}*")
+                while not self._stop.is_set():
+                    message = pubsub.get_message(timeout=1.0)
+                    if message and message["type"] == "pmessage":
+                        self._dispatch(message["channel"], message["data"])
+            except Exception as e:
+                logger.warning(f"Event hub Redis subscription failed, reconnecting - error: {e}")
+                time.sleep(1)
+            finally:
+                if pubsub is not None:
+                    pubsub.close()
+
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+
+event_hub = EventHub(settings.EVENTS_MAX_CONNECTIONS_PER_WORKER, settings.EVENTS_QUEUE_SIZE)
@@ -25,4 +25,39 @@ class ProductNotDeletedException(Exception):
     pass
 
 class UnauthorizedException(Exception):
-    pass
\ No newline at end of file
+    pass
+
+class InvalidFieldsException(Exception):
+    pass
+
+class EventStreamLimitException(Exception):
+    pass
+
+class SessionStoreUnavailableException(Exception):
+    pass
+
+class OrderIntakeUnavailableException(Exception):
+    pass
+
+class OrderTicketNotFoundException(Exception):
+    pass
+
+class InvalidBatchException(Exception):
+    pass
+
+class DeadlineExceededException(Exception):
+    pass
+
+class InvalidCursorException(Exception):
+    pass
+
+class OrderBatchTimeoutException(Exception):
+    pass
+
+class OrderOutcomeUnknownException(Exception):
+    pass
+
+class RateLimitExceededException(Exception):
+    def __init__(self, message: str, retry_after: int):
+        super().__init__(message)
+        self.retry_after = retry_after
\ No newline at end of file
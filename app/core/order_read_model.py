@@ -0,0 +1,155 @@
+import logging
+import redis
+from app.core.config import settings
+from app.core.redis_cache import CacheUnavailable, guarded, encode_value, decode_value
+from app.schemas.order_schema import OrderResponse
+
+logger = logging.getLogger(__name__)
+
+UPSERT_SCRIPT = """
+redis.call('INCR', KEYS[1])
+redis.call('EXPIRE', KEYS[1], ARGV[1])
+if redis.call('EXISTS', KEYS[2]) == 1 then
+    redis.call('ZADD', KEYS[3], ARGV[2], ARGV[3])
+    redis.call('HSET', KEYS[4], ARGV[3], ARGV[4])
+end
+return 1
+"""
+
+_upsert_script = None
+
+
+def _keys(user_id: int) -> tuple[str, str, str, str]:
+    prefix = f"orders:{{user:{user_id}}}"
+    return f"{prefix}:version", f"{prefix}:ready", f"{prefix}:ids", f"{prefix}:data"
+
+
+def _member(order_id: int) -> str:
+    return f"{order_id:010d}"
+
+
+def _score(order) -> float:
+    return order.created_at.timestamp()
+
+
+def _payload(order) -> bytes:
+    return encode_value(OrderResponse.model_validate(order).model_dump(mode='json'))
+
+
+def get_version(user_id: int) -> bytes | None:
+    try:
+        return guarded(lambda client: client.get(_keys(user_id)[0]))
+    except CacheUnavailable:
+        return None
+    except Exception as e:
+        logger.warning(f"Order read model version lookup failed - user: {user_id}, error: {e}")
+        return None
+
+
+def record_orders(orders: list):
+    if not orders:
+        return
+
+    def upsert(client):
+        global _upsert_script
+        if _upsert_script is None:
+            _upsert_script = client.register_script(UPSERT_SCRIPT)
+        pipe = client.pipeline(transaction=False)
+        for order in orders:
+            _upsert_script(
+                keys=_keys(order.user_id),
+                args=[settings.ORDER_READ_MODEL_TTL_SECONDS, _score(order), _member(order.id), _payload(order)],
+                client=pipe,
+            )
+        pipe.execute()
+
+    try:
+        guarded(upsert, essential=True)
+    except CacheUnavailable:
+        pass
+    except Exception as e:
+        logger.warning(f"Order read model update failed - orders: {len(orders)}, error: {e}")
+
+
+def invalidate_users(user_ids: set[int]):
+    if not user_ids:
+        return
+
+    def invalidate(client):
+        pipe = client.pipeline(transaction=False)
+        for user_id in user_ids:
+            version, ready, _, _ = _keys(user_id)
+            pipe.incr(version)
+            pipe.expire(version, settings.ORDER_READ_MODEL_TTL_SECONDS)
+            pipe.delete(ready)
+        pipe.execute()
+
+    try:
+        guarded(invalidate, essential=True)
+    except CacheUnavailable:
+        pass
+    except Exception as e:
+        logger.warning(f"Order read model invalidation failed - users: {len(user_ids)}, error: {e}")
+
+
+def store_user_orders(user_id: int, version: bytes | None, orders: list, ttl: int | None = None) -> bool:
+    version_key, ready, ids, data = _keys(user_id)
+    ttl = ttl or settings.ORDER_READ_MODEL_TTL_SECONDS
+
+    def rebuild(client) -> bool:
+        with client.pipeline() as pipe:
+            pipe.watch(version_key)
+            if pipe.get(version_key) != version:
+                logger.debug(f"Order read model rebuild skipped, concurrent write - user: {user_id}")
+                return False
+            pipe.multi()
+            pipe.delete(ids, data)
+            if orders:
+                pipe.zadd(ids, {_member(order.id): _score(order) for order in orders})
+                pipe.hset(data, mapping={_member(order.id): _payload(order) for order in orders})
+                pipe.expire(ids, ttl + 60)
+                pipe.expire(data, ttl + 60)
+            pipe.set(ready, 1, ex=ttl)
+            pipe.execute()
+        return True
+
+    try:
+        rebuilt = guarded(rebuild)
+        if rebuilt:
+            logger.debug(f"Order read model rebuilt - user: {user_id}, orders: {len(orders)}")
+        return rebuilt
+    except (redis.WatchError, CacheUnavailable):
+        return False
+    except Exception as e:
+        logger.warning(f"Order read model rebuild failed - user: {user_id}, error: {e}")
+        return False
+
+
+def get_user_orders_page(user_id: int, skip: int, limit: int) -> tuple[list[dict], int] | None:
+    _, ready, ids, data = _keys(user_id)
+
+    def read(client):
+        pipe = client.pipeline(transaction=False)
+        pipe.exists(ready)
+        pipe.zcard(ids)
+        pipe.zrevrange(ids, skip, skip + limit - 1)
+        is_ready, total, members = pipe.execute()
+        if not is_ready:
+            return None
+        payloads = client.hmget(data, members) if members else []
+        return payloads, total
+
+    try:
+        page = guarded(read)
+        if page is None:
+            return None
+        payloads, total = page
+        if any(payload is None for payload in payloads):
+            logger.warning(f"Order read model inconsistent, rebuilding - user: {user_id}")
+            return None
+        return [decode_value(payload) for payload in payloads], total
+    except CacheUnavailable:
+        return None
+    except Exception as e:
+        logger.warning(f"Order read model read failed, falling back to DB - user: {user_id}, error: {e}")
+        return None
@@ -0,0 +1,179 @@
+import contextvars
+import cProfile
+import functools
+import inspect
+import logging
+import os
+import pstats
+import random
+import re
+import time
+import uuid
+from fastapi.routing import APIRoute
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from app.core.config import settings
+from app.core.security import get_bearer_claims
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = "X-Profile"
+
+REDIS_CALLS = {("client.py", "execute_command"), ("client.py", "execute")}
+
+_current_profile: contextvars.ContextVar["ProfileSession | None"] = contextvars.ContextVar("current_profile", default=None)
+
+
+class ProfileSession:
+
+    def __init__(self, method: str, path: str):
+        self.id = uuid.uuid4().hex[:12]
+        self.method = method
+        self.path = path
+        self.profile = cProfile.Profile()
+        self.sql_seconds = 0.0
+        self.sql_statements = 0
+        self.started = time.perf_counter()
+        self.total_seconds = 0.0
+        self.handler_started: float | None = None
+        self.handler_finished: float | None = None
+        self.endpoint_started: float | None = None
+        self.endpoint_finished: float | None = None
+
+
+def should_profile(request) -> bool:
+    if not settings.PROFILER_ENABLED:
+        return False
+    requested = request.headers.get(PROFILE_HEADER, "").lower() in {"1", "true", "yes"}
+    if not requested and not (settings.PROFILER_SAMPLE_RATE > 0 and random.random() < settings.PROFILER_SAMPLE_RATE):
+        return False
+    claims = get_bearer_claims(request)
+    return claims is not None and claims.get("role") == "admin"
+
+
+def start_profile(method: str, path: str) -> tuple[ProfileSession, contextvars.Token]:
+    session = ProfileSession(method, path)
+    return session, _current_profile.set(session)
+
+
+def stop_profile(session: ProfileSession, token: contextvars.Token):
+    session.total_seconds = time.perf_counter() - session.started
+    _current_profile.reset(token)
+
+
+def _profiled(func):
+    # include_router rebuilds routes with the already wrapped endpoint.
+    if getattr(func, "__profiled__", False):
+        return func
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        session = _current_profile.get()
+        if session is None:
+            return func(*args, **kwargs)
+        session.endpoint_started = time.perf_counter()
+        session.profile.enable()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            session.profile.disable()
+            session.endpoint_finished = time.perf_counter()
+    wrapper.__profiled__ = True
+    return wrapper
+
+
+class ProfiledRoute(APIRoute):
+
+    def __init__(self, path: str, endpoint, **kwargs):
+        if not inspect.iscoroutinefunction(endpoint):
+            endpoint = _profiled(endpoint)
+        super().__init__(path, endpoint, **kwargs)
+
+
+    def get_route_handler(self):
+        handler = super().get_route_handler()
+
+        # Dependency resolution and response serialisation are split between the event loop and other threadpool
+        # threads, where cProfile would also record unrelated requests, so they are only timed around the endpoint.
+        async def timed_handler(request):
+            session = _current_profile.get()
+            if session is None:
+                return await handler(request)
+            session.handler_started = time.perf_counter()
+            try:
+                return await handler(request)
+            finally:
+                session.handler_finished = time.perf_counter()
+
+        return timed_handler
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current_profile.get() is not None:
+        conn.info.setdefault("profile_started", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    session = _current_profile.get()
+    started = conn.info.get("profile_started")
+    if session is not None and started:
+        session.sql_seconds += time.perf_counter() - started.pop()
+        session.sql_statements += 1
+
+
+@event.listens_for(Engine, "handle_error")
+def _handle_error(context):
+    connection = context.connection
+    if connection is not None and connection.info.get("profile_started"):
+        connection.info["profile_started"].pop()
+
+
+def _label(func: tuple) -> str:
+    filename, line, name = func
+    return f"{os.path.basename(filename)}:{line}({name})"
+
+
+def _retain(directory: str):
+    files = sorted(
+        (entry for entry in os.scandir(directory) if entry.name.endswith(".prof")),
+        key=lambda entry: entry.stat().st_mtime,
+    )
+    cutoff = time.time() - settings.PROFILER_MAX_AGE_HOURS * 3600
+    excess = len(files) - settings.PROFILER_MAX_FILES
+    for index, entry in enumerate(files):
+        if index < excess or entry.stat().st_mtime < cutoff:
+            os.remove(entry.path)
+
+
+def finish_profile(session: ProfileSession) -> dict[str, str]:
+    stats = pstats.Stats(session.profile)
+    cache_seconds = sum(
+        cumulative
+        for (filename, _, name), (_, _, _, cumulative, _) in stats.stats.items()
+        if "redis" in filename and (os.path.basename(filename), name) in REDIS_CALLS
+    )
+    top = sorted(stats.stats.items(), key=lambda item: item[1][2], reverse=True)[:settings.PROFILER_TOP_FUNCTIONS]
+    headers = {
+        "X-Profile-Id": session.id,
+        "X-Profile-Total-Ms": f"{session.total_seconds * 1000:.1f}",
+        "X-Profile-SQL-Ms": f"{session.sql_seconds * 1000:.1f}",
+        "X-Profile-SQL-Statements": str(session.sql_statements),
+        "X-Profile-Cache-Ms": f"{cache_seconds * 1000:.1f}",
+        "X-Profile-Top": "; ".join(f"{_label(func)}={data[2] * 1000:.2f}ms" for func, data in top),
+    }
+    if session.endpoint_finished is not None and session.handler_finished is not None:
+        headers["X-Profile-Dependencies-Ms"] = f"{(session.endpoint_started - session.handler_started) * 1000:.1f}"
+        headers["X-Profile-Endpoint-Ms"] = f"{(session.endpoint_finished - session.endpoint_started) * 1000:.1f}"
+        headers["X-Profile-Serialization-Ms"] = f"{(session.handler_finished - session.endpoint_finished) * 1000:.1f}"
+    try:
+        os.makedirs(settings.PROFILER_DIR, exist_ok=True)
+        slug = re.sub(r"[^A-Za-z0-9]+", "_", session.path).strip("_") or "root"
+        filename = f"{time.strftime('%Y%m%dT%H%M%S')}-{session.method}-{slug}-{session.id}.prof"
+        stats.dump_stats(os.path.join(settings.PROFILER_DIR, filename))
+        _retain(settings.PROFILER_DIR)
+    except OSError as e:
+        logger.warning(f"Profile could not be saved - id: {session.id}, error: {e}")
+    logger.info(f"Request profiled - id: {session.id}, path: {session.path}, total: {headers['X-Profile-Total-Ms']}ms, sql: {headers['X-Profile-SQL-Ms']}ms")
+    return headers
@@ -0,0 +1,97 @@
+import logging
+import math
+from fastapi import Depends, Request
+from fastapi.security import OAuth2PasswordRequestForm
+from app.core.config import settings
+from app.core.deadline import check_deadline
+from app.core.exceptions import RateLimitExceededException
+from app.core.redis_cache import get_redis_client
+from app.core.security import get_current_user
+from app.models.user_model import User
+
+logger = logging.getLogger(__name__)
+
+# All buckets must have a token for the request to pass; tokens are only taken when it does.
+TOKEN_BUCKET_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local time = redis.call('TIME')
+local now = tonumber(time[1]) + tonumber(time[2]) / 1000000
+local ttl = math.ceil(capacity / rate) + 1
+local levels = {}
+local retry_after = 0
+for i, key in ipairs(KEYS) do
+    local state = redis.call('HMGET', key, 'tokens', 'ts')
+    local tokens = tonumber(state[1]) or capacity
+    local ts = tonumber(state[2]) or now
+    tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+    levels[i] = tokens
+    if tokens < 1 then
+        retry_after = math.max(retry_after, (1 - tokens) / rate)
+    end
+end
+local allowed = retry_after == 0 and 1 or 0
+for i, key in ipairs(KEYS) do
+    local tokens = levels[i]
+    if allowed == 1 then
+        tokens = tokens - 1
+    end
+    redis.call('HSET', key, 'tokens', tostring(tokens), 'ts', tostring(now))
+    redis.call('EXPIRE', key, ttl)
+end
+return {allowed, tostring(retry_after)}
+"""
+
+
+class RateLimiter:
+
+    def __init__(self, scope: str, capacity: int, refill_per_second: float):
+        self.scope = scope
+        self.capacity = capacity
+        self.refill_per_second = refill_per_second
+        self._script = None
+
+
+    def check(self, *identities: str):
+        keys = [f"ratelimit:{self.scope}:{identity}" for identity in identities]
+        check_deadline()
+        try:
+            if self._script is None:
+                self._script = get_redis_client().register_script(TOKEN_BUCKET_SCRIPT)
+            allowed, retry_after = self._script(keys=keys, args=[self.capacity, self.refill_per_second])
+        except Exception as e:
+            logger.warning(f"Rate limiter unavailable, allowing request - scope: {self.scope}, error: {e}")
+            return
+        if int(allowed) != 1:
+            logger.warning(f"Rate limit exceeded - scope: {self.scope}, keys: {keys}")
+            raise RateLimitExceededException("Too many requests", max(1, math.ceil(float(retry_after))))
+
+
+login_rate_limiter = RateLimiter(
+    "login", settings.RATE_LIMIT_LOGIN_CAPACITY, settings.RATE_LIMIT_LOGIN_REFILL_PER_SECOND
+)
+
+login_account_rate_limiter = RateLimiter(
+    "login-account", settings.RATE_LIMIT_LOGIN_ACCOUNT_CAPACITY, settings.RATE_LIMIT_LOGIN_ACCOUNT_REFILL_PER_SECOND
+)
+
+order_rate_limiter = RateLimiter(
+    "orders", settings.RATE_LIMIT_ORDERS_CAPACITY, settings.RATE_LIMIT_ORDERS_REFILL_PER_SECOND
+)
+
+
+def get_client_ip(request: Request) -> str:
+    return request.client.host if request.client else "unknown"
+
+
+def limit_login(request: Request, form_data: OAuth2PasswordRequestForm = Depends()):
+    # The tight bucket is per (username, IP), so another client cannot lock a user out; the per-account bucket is a
+    # much larger cap against distributed guessing. It is checked second so a throttled IP cannot drain it.
+    username = form_data.username.strip().lower()
+    ip = get_client_ip(request)
+    login_rate_limiter.check(f"user:{username}:ip:{ip}", f"ip:{ip}")
+    login_account_rate_limiter.check(f"user:{username}")
+
+
+def limit_order_create(request: Request, current_user: User = Depends(get_current_user)):
+    order_rate_limiter.check(f"user:{current_user.id}", f"ip:{get_client_ip(request)}")
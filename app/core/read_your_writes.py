@@ -0,0 +1,36 @@
+import threading
+import time
+from app.core.config import settings
+from app.core.redis_cache import cache_get, cache_set
+
+_local_writes: dict[int, float] = {}
+_local_lock = threading.Lock()
+
+
+def _key(user_id: int) -> str:
+    return f"ryw:user:{user_id}"
+
+
+def mark_recent_write(user_id: int):
+    now = time.monotonic()
+    with _local_lock:
+        # Every entry lives equally long, so re-inserting at the end keeps the dict ordered by expiry and expired
+        # entries can be pruned from the front.
+        _local_writes.pop(user_id, None)
+        _local_writes[user_id] = now + settings.READ_YOUR_WRITES_SECONDS
+        while _local_writes:
+            oldest = next(iter(_local_writes))
+            if _local_writes[oldest] > now:
+                break
+            del _local_writes[oldest]
+    cache_set(_key(user_id), 1, ttl=settings.READ_YOUR_WRITES_SECONDS)
+
+
+def has_recent_write(user_id: int) -> bool:
+    with _local_lock:
+        expires_at = _local_writes.get(user_id)
+        if expires_at is not None:
+            if expires_at > time.monotonic():
+                return True
+            del _local_writes[user_id]
+    return cache_get(_key(user_id)) is not None
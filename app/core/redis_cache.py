@@ -1,11 +1,56 @@
 import json
 import logging
+import threading
+import time
+import zlib
+from collections import deque
+import msgpack
 import redis
 from app.core.config import settings
+from app.core.deadline import remaining_seconds
+
+try:
+    import lz4.frame as lz4_frame
+except ImportError:
+    lz4_frame = None
 
 logger = logging.getLogger(__name__)
 
 _redis_client = None
+_binary_client = None
+
+HEADER_MAGIC = b"\x00"
+
+CODECS = {
+    "json": (1, lambda value: json.dumps(value, separators=(",", ":")).encode(), json.loads),
+    "msgpack": (2, lambda value: msgpack.packb(value, use_bin_type=True), lambda data: msgpack.unpackb(data, raw=False)),
+}
+
+COMPRESSORS = {
+    "none": (0, lambda data: data, lambda data: data),
+    "zlib": (1, lambda data: zlib.compress(data, 6), zlib.decompress),
+}
+if lz4_frame is not None:
+    COMPRESSORS["lz4"] = (2, lz4_frame.compress, lz4_frame.decompress)
+elif settings.CACHE_COMPRESSION == "lz4":
+    logger.warning("CACHE_COMPRESSION=lz4 but the lz4 package is not installed, using zlib")
+
+_decoders = {codec_id: decode for codec_id, _, decode in CODECS.values()}
+_decompressors = {compressor_id: decompress for compressor_id, _, decompress in COMPRESSORS.values()}
+
+_stats_lock = threading.Lock()
+
+cache_stats = {
+    "encodes": 0,
+    "decodes": 0,
+    "legacy_decodes": 0,
+    "decode_errors": 0,
+    "compressed": 0,
+    "raw_bytes": 0,
+    "stored_bytes": 0,
+    "encode_seconds": 0.0,
+    "decode_seconds": 0.0,
+}
 
 
 def get_redis_client():
@@ -14,49 +59,330 @@ def get_redis_client():
         _redis_client = redis.from_url(
             settings.REDIS_URL,
             decode_responses=True,
-            socket_connect_timeout=5
+            socket_connect_timeout=5,
+            socket_timeout=settings.REDIS_SOCKET_TIMEOUT_MS / 1000,
         )
     return _redis_client
 
 
-def cache_get(key: str):
+def get_binary_redis_client():
+    global _binary_client
+    if _binary_client is None:
+        pool = redis.BlockingConnectionPool.from_url(
+            settings.REDIS_URL,
+            max_connections=settings.REDIS_CACHE_MAX_CONNECTIONS,
+            timeout=settings.REDIS_CACHE_POOL_TIMEOUT_MS / 1000,
+            socket_timeout=settings.REDIS_CACHE_SOCKET_TIMEOUT_MS / 1000,
+            socket_connect_timeout=settings.REDIS_CACHE_CONNECT_TIMEOUT_MS / 1000,
+        )
+        _binary_client = redis.Redis(connection_pool=pool)
+    return _binary_client
+
+
+class CacheUnavailable(Exception):
+    pass
+
+
+class CircuitBreaker:
+
+    def __init__(
+        self,
+        name: str,
+        window_seconds: float,
+        min_calls: int,
+        error_rate: float,
+        slow_call_ms: float,
+        slow_call_rate: float,
+        open_seconds: float,
+    ):
+        self.name = name
+        self.window_seconds = window_seconds
+        self.min_calls = min_calls
+        self.error_rate = error_rate
+        self.slow_call_seconds = slow_call_ms / 1000
+        self.slow_call_rate = slow_call_rate
+        self.open_seconds = open_seconds
+        self.state = "closed"
+        self.opened_at = 0.0
+        self.trips = 0
+        self.rejected = 0
+        self._calls: deque = deque()
+        self._probing = False
+        self._lock = threading.Lock()
+
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.state == "closed":
+                return True
+            if self.state == "open" and time.monotonic() - self.opened_at >= self.open_seconds:
+                self.state = "half_open"
+            if self.state == "half_open" and not self._probing:
+                self._probing = True
+                return True
+            self.rejected += 1
+            return False
+
+
+    def record(self, ok: bool, elapsed: float):
+        now = time.monotonic()
+        with self._lock:
+            if self.state == "half_open":
+                self._probing = False
+                if ok and elapsed < self.slow_call_seconds:
+                    self.state = "closed"
+                    self._calls.clear()
+                    logger.info(f"Circuit closed - breaker: {self.name}")
+                else:
+                    self._open(now)
+                return
+            if self.state != "closed":
+                return
+            self._calls.append((now, ok, elapsed >= self.slow_call_seconds))
+            while self._calls and now - self._calls[0][0] > self.window_seconds:
+                self._calls.popleft()
+            total = len(self._calls)
+            if total < self.min_calls:
+                return
+            failures = sum(1 for _, call_ok, _ in self._calls if not call_ok)
+            slow = sum(1 for _, _, call_slow in self._calls if call_slow)
+            if failures / total >= self.error_rate or slow / total >= self.slow_call_rate:
+                self._open(now)
+
+
+    def _open(self, now: float):
+        self.state = "open"
+        self.opened_at = now
+        self.trips += 1
+        self._calls.clear()
+        logger.warning(f"Circuit opened - breaker: {self.name}, retry in {self.open_seconds}s")
+
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {"state": self.state, "trips": self.trips, "rejected": self.rejected}
+
+
+cache_breaker = CircuitBreaker(
+    "redis-cache",
+    settings.REDIS_BREAKER_WINDOW_SECONDS,
+    settings.REDIS_BREAKER_MIN_CALLS,
+    settings.REDIS_BREAKER_ERROR_RATE,
+    settings.REDIS_BREAKER_SLOW_CALL_MS,
+    settings.REDIS_BREAKER_SLOW_CALL_RATE,
+    settings.REDIS_BREAKER_OPEN_SECONDS,
+)
+
+
+# Essential calls (invalidations, read model writes) that were skipped or failed may have left stale entries behind,
+# so the next call that reaches Redis first drops everything they could have touched.
+RECOVERY_FLUSH_PATTERNS = ("products:*", "orders:{user:*}:ready")
+
+_flush_needed = threading.Event()
+
+
+def _flush_stale_entries(client):
+    _flush_needed.clear()
+    deleted = 0
+    try:
+        for pattern in RECOVERY_FLUSH_PATTERNS:
+            for batch in _batched(client.scan_iter(match=pattern, count=settings.REDIS_SCAN_COUNT)):
+                deleted += client.unlink(*batch)
+    except Exception:
+        _flush_needed.set()
+        raise
+    logger.warning(f"Flushed cache entries possibly stale after a Redis outage - keys: {deleted}")
+
+
+def _batched(keys):
+    batch = []
+    for key in keys:
+        batch.append(key)
+        if len(batch) == settings.REDIS_SCAN_COUNT:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def guarded(operation, essential: bool = False):
+    remaining = remaining_seconds()
+    if not essential and remaining is not None and remaining <= 0:
+        raise CacheUnavailable("request deadline exceeded")
+    if not cache_breaker.allow():
+        if essential:
+            _flush_needed.set()
+        raise CacheUnavailable("circuit open")
+    started = time.perf_counter()
     try:
-        client = get_redis_client()
-        data = client.get(key)
-        if data:
-            logger.debug(f"Cache HIT - key: {key}")
-            return json.loads(data)
+        if _flush_needed.is_set():
+            _flush_stale_entries(get_binary_redis_client())
+        result = operation(get_binary_redis_client())
+    except Exception:
+        if essential:
+            _flush_needed.set()
+        cache_breaker.record(False, time.perf_counter() - started)
+        raise
+    cache_breaker.record(True, time.perf_counter() - started)
+    return result
+
+
+def _record(**deltas):
+    with _stats_lock:
+        for name, delta in deltas.items():
+            cache_stats[name] += delta
+
+
+def get_cache_stats() -> dict:
+    with _stats_lock:
+        stats = dict(cache_stats)
+    stats["codec"] = settings.CACHE_CODEC
+    stats["compression"] = settings.CACHE_COMPRESSION
+    stats["compression_ratio"] = round(stats["stored_bytes"] / stats["raw_bytes"], 3) if stats["raw_bytes"] else None
+    stats["breaker"] = cache_breaker.snapshot()
+    return stats
+
+
+def encode_value(value) -> bytes:
+    started = time.perf_counter()
+    codec_id, encode, _ = CODECS[settings.CACHE_CODEC]
+    compressor = settings.CACHE_COMPRESSION if settings.CACHE_COMPRESSION in COMPRESSORS else "zlib"
+    payload = encode(value)
+    raw_size = len(payload)
+    compressor_id = 0
+    if compressor != "none" and raw_size >= settings.CACHE_COMPRESS_MIN_BYTES:
+        compressor_id, compress, _ = COMPRESSORS[compressor]
+        payload = compress(payload)
+    data = HEADER_MAGIC + bytes((codec_id, compressor_id)) + payload
+    _record(
+        encodes=1,
+        compressed=1 if compressor_id else 0,
+        raw_bytes=raw_size,
+        stored_bytes=len(data),
+        encode_seconds=time.perf_counter() - started,
+    )
+    return data
+
+
+def decode_value(data: bytes):
+    started = time.perf_counter()
+    if not data.startswith(HEADER_MAGIC):
+        value = json.loads(data)
+        _record(legacy_decodes=1, decode_seconds=time.perf_counter() - started)
+        return value
+    codec_id, compressor_id = data[1], data[2]
+    value = _decoders[codec_id](_decompressors[compressor_id](data[3:]))
+    _record(decodes=1, decode_seconds=time.perf_counter() - started)
+    return value
+
+
+BODY_ENCODINGS = ("br", "gzip")
+
+
+def body_key(key: str, encoding: str) -> str:
+    return f"{key}:body:{encoding}"
+
+
+def body_keys(key: str) -> list[str]:
+    return [body_key(key, encoding) for encoding in BODY_ENCODINGS]
+
+
+def _decode_cached(key: str, data: bytes | None):
+    if data is None:
         logger.debug(f"Cache MISS - key: {key}")
         return None
+    logger.debug(f"Cache HIT - key: {key}")
+    return decode_value(data)
+
+
+def cache_get(key: str):
+    return cache_get_variant(key, None)[0]
+
+
+def cache_get_variant(key: str, encoding: str | None) -> tuple:
+    try:
+        if encoding is None:
+            return _decode_cached(key, guarded(lambda client: client.get(key))), None
+        body, data = guarded(lambda client: client.mget(body_key(key, encoding), key))
+        if body is not None:
+            logger.debug(f"Cache HIT (precompressed {encoding}) - key: {key}")
+            return None, body
+        return _decode_cached(key, data), None
+    except CacheUnavailable:
+        return None, None
+    except (KeyError, ValueError, zlib.error) as e:
+        _record(decode_errors=1)
+        logger.warning(f"Cache value could not be decoded, treating as miss - key: {key}, error: {e}")
+        return None, None
     except Exception as e:
         logger.warning(f"Redis GET failed, falling back to DB - key: {key}, error: {e}")
-        return None
+        return None, None
 
 
-def cache_set(key: str, value, ttl: int = 300):
+def cache_set(key: str, value, ttl: int = 300, bodies: dict[str, bytes] | None = None):
     try:
-        client = get_redis_client()
-        client.setex(key, ttl, json.dumps(value))
-        logger.debug(f"Cache SET - key: {key}, ttl: {ttl}s")
+        data = encode_value(value)
+
+        def write(client):
+            if not bodies:
+                return client.setex(key, ttl, data)
+            pipe = client.pipeline(transaction=False)
+            pipe.setex(key, ttl, data)
+            for encoding, body in bodies.items():
+                pipe.setex(body_key(key, encoding), ttl, body)
+            return pipe.execute()
+
+        guarded(write)
+        logger.debug(f"Cache SET - key: {key}, ttl: {ttl}s, precompressed: {len(bodies or {})}")
+    except CacheUnavailable:
+        pass
     except Exception as e:
         logger.warning(f"Redis SET failed - key: {key}, error: {e}")
 
 
-def cache_delete(key: str):
+def cache_set_many(values: dict, ttl: int = 300):
+    if not values:
+        return
     try:
-        client = get_redis_client()
-        client.delete(key)
-        logger.debug(f"Cache DELETE - key: {key}")
+        encoded = {key: encode_value(value) for key, value in values.items()}
+
+        def write(client):
+            pipe = client.pipeline(transaction=False)
+            for key, data in encoded.items():
+                pipe.setex(key, ttl, data)
+            pipe.execute()
+
+        guarded(write)
+        logger.debug(f"Cache SET many - keys: {len(values)}, ttl: {ttl}s")
+    except CacheUnavailable:
+        pass
     except Exception as e:
-        logger.warning(f"Redis DELETE failed - key: {key}, error: {e}")
+        logger.warning(f"Redis SET many failed - keys: {len(values)}, error: {e}")
+
+
+def cache_delete(key: str):
+    cache_invalidate(keys=[key])
 
 
 def cache_delete_pattern(pattern: str):
+    cache_invalidate(patterns=[pattern])
+
+
+def cache_invalidate(keys: list[str] = (), patterns: list[str] = ()):
+    def delete(client):
+        matched = list(keys)
+        for pattern in patterns:
+            matched.extend(client.scan_iter(match=pattern, count=settings.REDIS_SCAN_COUNT))
+        pipe = client.pipeline(transaction=False)
+        for start in range(0, len(matched), settings.REDIS_SCAN_COUNT):
+            pipe.unlink(*matched[start:start + settings.REDIS_SCAN_COUNT])
+        pipe.execute()
+        return len(matched)
+
     try:
-        client = get_redis_client()
-        keys = client.keys(pattern)
-        if keys:
-            client.delete(*keys)
-            logger.debug(f"Cache DELETE pattern: {pattern}, keys deleted: {len(keys)}")
+        deleted = guarded(delete, essential=True)
+        logger.debug(f"Cache DELETE - keys: {list(keys)}, patterns: {list(patterns)}, deleted: {deleted}")
+    except CacheUnavailable:
+        logger.debug(f"Cache DELETE skipped, flush pending - keys: {list(keys)}, patterns: {list(patterns)}")
     except Exception as e:
-        logger.warning(f"Redis DELETE pattern failed - pattern: {pattern}, error: {e}")
\ No newline at end of file
+        logger.warning(f"Redis DELETE failed - keys: {list(keys)}, patterns: {list(patterns)}, error: {e}")
@@ -0,0 +1,33 @@
+import asyncio
+import logging
+from starlette.concurrency import run_in_threadpool
+
+logger = logging.getLogger(__name__)
+
+_tasks: list[asyncio.Task] = []
+
+
+async def _run_periodically(name: str, interval_seconds: float, func, run_immediately: bool):
+    if not run_immediately:
+        await asyncio.sleep(interval_seconds)
+    while True:
+        try:
+            await run_in_threadpool(func)
+        except Exception as e:
+            logger.exception(f"Periodic job failed - job: {name}, error: {e}")
+        await asyncio.sleep(interval_seconds)
+
+
+def schedule_periodic(name: str, interval_seconds: float, func, run_immediately: bool = False):
+    if interval_seconds <= 0:
+        logger.info(f"Periodic job disabled - job: {name}")
+        return
+    _tasks.append(asyncio.create_task(_run_periodically(name, interval_seconds, func, run_immediately), name=name))
+    logger.info(f"Periodic job scheduled - job: {name}, interval: {interval_seconds}s")
+
+
+async def stop_scheduler():
+    for task in _tasks:
+        task.cancel()
+    await asyncio.gather(*_tasks, return_exceptions=True)
+    _tasks.clear()
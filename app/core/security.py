@@ -1,71 +1,210 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta
-from jose import JWTError, jwt
-from passlib.context import CryptContext
-from fastapi import Depends, HTTPException, status
+from functools import lru_cache
+from pathlib import Path
+from jose import JWTError, jwk, jwt
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.orm import Session
 from app.models.user_model import User, UserRole
 from app.db.database import get_db
 from app.core.config import settings
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/users/login")
 
+REFRESH_TOKEN_EXPIRE_DAYS = 7
+
+ASYMMETRIC_ALGORITHMS = {"ES256", "ES384", "ES512", "RS256", "RS384", "RS512"}
+
+_verified_tokens: OrderedDict[bytes, dict] = OrderedDict()
+_verified_lock = threading.Lock()
+
+
+@lru_cache(maxsize=1)
+def _password_context():
+    from passlib.context import CryptContext
+
+    return CryptContext(schemes=["bcrypt"], deprecated="auto")
+
 
 def hash_password(password: str) -> str:
-    return pwd_context.hash(password)
+    return _password_context().hash(password)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+    return _password_context().verify(plain_password, hashed_password)
+
+
+def warm_password_hashing():
+    context = _password_context()
+    context.verify("warm-up", context.hash("warm-up"))
+
+
+def uses_key_ring() -> bool:
+    return settings.ALGORITHM in ASYMMETRIC_ALGORITHMS
+
 
+@lru_cache(maxsize=1)
+def _key_ring() -> dict[str, dict]:
+    ring: dict[str, dict] = {}
+    for path in sorted(Path(settings.JWT_KEYS_DIR).glob("*.pem")):
+        kid = path.name.removesuffix(".pem")
+        entry = ring.setdefault(kid.removesuffix(".pub"), {})
+        key = jwk.construct(path.read_text(), settings.ALGORITHM)
+        if kid.endswith(".pub"):
+            entry["public"] = key
+        else:
+            entry["private"] = key
+            entry["public"] = key.public_key()
+    if "private" not in ring.get(settings.JWT_ACTIVE_KID, {}):
+        raise RuntimeError(f"No private key for JWT_ACTIVE_KID '{settings.JWT_ACTIVE_KID}' in {settings.JWT_KEYS_DIR}")
+    return ring
 
-def create_access_token(user: User) -> str:
+
+def load_signing_keys():
+    if uses_key_ring():
+        _key_ring()
+
+
+def _encode(payload: dict) -> str:
+    if not uses_key_ring():
+        return jwt.encode(payload, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+    key = _key_ring()[settings.JWT_ACTIVE_KID]["private"]
+    return jwt.encode(payload, key, algorithm=settings.ALGORITHM, headers={"kid": settings.JWT_ACTIVE_KID})
+
+
+def _verification_key(token: str):
+    if not uses_key_ring():
+        return settings.SECRET_KEY
+    entry = _key_ring().get(jwt.get_unverified_header(token).get("kid"))
+    if entry is None:
+        raise JWTError("Unknown key id")
+    return entry["public"]
+
+
+def get_jwks() -> dict:
+    if not uses_key_ring():
+        return {"keys": []}
+    return {
+        "keys": [
+            {**entry["public"].to_dict(), "kid": kid, "use": "sig", "alg": settings.ALGORITHM}
+            for kid, entry in _key_ring().items()
+        ]
+    }
+
+
+def _verify(token: str) -> dict:
+    if settings.TOKEN_CACHE_SIZE <= 0:
+        return jwt.decode(token, _verification_key(token), algorithms=[settings.ALGORITHM])
+    digest = hashlib.sha256(token.encode()).digest()
+    with _verified_lock:
+        payload = _verified_tokens.get(digest)
+        if payload is not None:
+            if payload.get("exp", 0) > time.time():
+                _verified_tokens.move_to_end(digest)
+                return payload
+            del _verified_tokens[digest]
+    payload = jwt.decode(token, _verification_key(token), algorithms=[settings.ALGORITHM])
+    with _verified_lock:
+        _verified_tokens[digest] = payload
+        while len(_verified_tokens) > settings.TOKEN_CACHE_SIZE:
+            _verified_tokens.popitem(last=False)
+    return payload
+
+
+def create_access_token(user_id: int, role: str) -> str:
     expire = datetime.utcnow() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     payload = {
-        "sub": str(user.id),
-        "role": user.role.value,
+        "sub": str(user_id),
+        "role": role,
         "type": "access",
         "exp": expire,
     }
-    return jwt.encode(payload, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+    return _encode(payload)
 
 
-def create_refresh_token(user: User) -> str:
-    expire = datetime.utcnow() + timedelta(days=7)
+def create_refresh_token(user_id: int, session_id: str, family_id: str) -> str:
+    expire = datetime.utcnow() + timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS)
     payload = {
-        "sub": str(user.id),
+        "sub": str(user_id),
         "type": "refresh",
+        "jti": session_id,
+        "fam": family_id,
         "exp": expire,
     }
-    return jwt.encode(payload, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+    return _encode(payload)
 
 
-def get_current_user(
-    token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db)
-) -> User:
-    credentials_exception = HTTPException(
+def decode_token(token: str, token_type: str) -> dict | None:
+    try:
+        payload = _verify(token)
+        if payload.get("sub") is None or payload.get("type") != token_type:
+            return None
+        return {**payload, "sub": int(payload["sub"])}
+    except (JWTError, ValueError, TypeError):
+        return None
+
+
+def get_token_subject(request: Request) -> int | None:
+    # Unverified peek at the bearer token, only for routing decisions - never for authorization.
+    scheme, _, token = request.headers.get("Authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    try:
+        payload = jwt.get_unverified_claims(token)
+        if payload.get("type") != "access":
+            return None
+        return int(payload.get("sub"))
+    except (JWTError, ValueError, TypeError):
+        return None
+
+
+def get_bearer_claims(request: Request) -> dict | None:
+    scheme, _, token = request.headers.get("Authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    return decode_token(token, "access")
+
+
+def _credentials_exception() -> HTTPException:
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
-    try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-        user_id: str = payload.get("sub")
-        token_type: str = payload.get("type")
 
-        if user_id is None or token_type != "access":
-            raise credentials_exception
 
-        user_id_int = int(user_id)
-    except (JWTError, ValueError, TypeError):
-        raise credentials_exception
+def get_token_claims(token: str = Depends(oauth2_scheme)) -> dict:
+    payload = decode_token(token, "access")
+    if payload is None:
+        raise _credentials_exception()
+    return payload
 
-    user = db.query(User).filter(User.id == user_id_int).first()
+
+def load_principal(db: Session, claims: dict) -> User:
+    user = db.query(User).filter(User.id == claims["sub"]).first()
+    if user is None:
+        raise _credentials_exception()
+    db.expunge(user)
+    # The batch keeps this session for its writes; don't hold a transaction (and its connection) open meanwhile.
+    db.rollback()
+    return user
+
+
+def get_current_user(
+    request: Request,
+    claims: dict = Depends(get_token_claims),
+    db: Session = Depends(get_db)
+) -> User:
+    principal = getattr(request.state, "batch_principal", None)
+    if principal is not None and principal.id == claims["sub"]:
+        return db.merge(principal, load=False)
+    user = db.query(User).filter(User.id == claims["sub"]).first()
     if user is None:
-        raise credentials_exception
+        raise _credentials_exception()
     return user
 
 
@@ -0,0 +1,106 @@
+import json
+import logging
+import uuid
+from app.core.exceptions import InvalidCredentialsException, SessionStoreUnavailableException
+from app.core.deadline import check_deadline
+from app.core.redis_cache import get_redis_client
+from app.core.security import REFRESH_TOKEN_EXPIRE_DAYS, create_refresh_token, decode_token
+
+logger = logging.getLogger(__name__)
+
+SESSION_TTL = REFRESH_TOKEN_EXPIRE_DAYS * 24 * 60 * 60
+
+
+def _session_key(session_id: str) -> str:
+    return f"session:{session_id}"
+
+
+def _family_key(family_id: str) -> str:
+    return f"session_family:{family_id}"
+
+
+def _user_key(user_id: int) -> str:
+    return f"user_sessions:{user_id}"
+
+
+def _client():
+    return get_redis_client()
+
+
+def create_session(user_id: int, role: str, family_id: str | None = None) -> str:
+    check_deadline()
+    session_id = uuid.uuid4().hex
+    family_id = family_id or uuid.uuid4().hex
+    try:
+        pipe = _client().pipeline()
+        pipe.set(_session_key(session_id), json.dumps({"user_id": user_id, "role": role, "family": family_id}), ex=SESSION_TTL)
+        pipe.sadd(_family_key(family_id), session_id)
+        pipe.expire(_family_key(family_id), SESSION_TTL)
+        pipe.sadd(_user_key(user_id), family_id)
+        pipe.expire(_user_key(user_id), SESSION_TTL)
+        pipe.execute()
+    except Exception as e:
+        logger.error(f"Session store write failed - UserID: {user_id}, error: {e}")
+        raise SessionStoreUnavailableException("Session store unavailable")
+    return create_refresh_token(user_id, session_id, family_id)
+
+
+def rotate_session(refresh_token: str) -> dict:
+    credentials_exception = InvalidCredentialsException("Invalid or expired refresh token")
+    payload = decode_token(refresh_token, "refresh")
+    if payload is None or not payload.get("jti") or not payload.get("fam"):
+        raise credentials_exception
+    user_id, session_id, family_id = payload["sub"], payload["jti"], payload["fam"]
+    check_deadline()
+    try:
+        client = _client()
+        raw = client.getdel(_session_key(session_id))
+        if raw is None:
+            if client.exists(_family_key(family_id)):
+                logger.warning(f"Refresh token reuse detected, revoking session family - UserID: {user_id}, family: {family_id}")
+                revoke_family(user_id, family_id)
+            raise credentials_exception
+    except InvalidCredentialsException:
+        raise
+    except Exception as e:
+        logger.error(f"Session store read failed - UserID: {user_id}, error: {e}")
+        raise SessionStoreUnavailableException("Session store unavailable")
+    session = json.loads(raw)
+    if session["user_id"] != user_id or session["family"] != family_id:
+        raise credentials_exception
+    new_refresh_token = create_session(user_id, session["role"], family_id)
+    return {"user_id": user_id, "role": session["role"], "refresh_token": new_refresh_token}
+
+
+def revoke_family(user_id: int, family_id: str):
+    check_deadline()
+    try:
+        client = _client()
+        session_ids = client.smembers(_family_key(family_id))
+        pipe = client.pipeline()
+        for session_id in session_ids:
+            pipe.delete(_session_key(session_id))
+        pipe.delete(_family_key(family_id))
+        pipe.srem(_user_key(user_id), family_id)
+        pipe.execute()
+    except Exception as e:
+        logger.error(f"Session revoke failed - UserID: {user_id}, family: {family_id}, error: {e}")
+        raise SessionStoreUnavailableException("Session store unavailable")
+
+
+def revoke_token_family(user_id: int, refresh_token: str):
+    payload = decode_token(refresh_token, "refresh")
+    if payload is None or payload["sub"] != user_id or not payload.get("fam"):
+        raise InvalidCredentialsException("Invalid or expired refresh token")
+    revoke_family(user_id, payload["fam"])
+
+
+def revoke_all_sessions(user_id: int):
+    check_deadline()
+    try:
+        family_ids = _client().smembers(_user_key(user_id))
+    except Exception as e:
+        logger.error(f"Session lookup failed - UserID: {user_id}, error: {e}")
+        raise SessionStoreUnavailableException("Session store unavailable")
+    for family_id in family_ids:
+        revoke_family(user_id, family_id)
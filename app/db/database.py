@@ -1,20 +1,40 @@
+import itertools
+import logging
+import os
+import threading
+import time
 from typing import Generator
+from fastapi import Request
 from sqlalchemy import create_engine
+from sqlalchemy.exc import OperationalError
 from sqlalchemy.orm import sessionmaker, declarative_base, Session
 from app.core.config import settings
+from app.db import query_log  # noqa: F401
+
+logger = logging.getLogger(__name__)
 
 DATABASE_URL = settings.DATABASE_URL
 
+REPLICA_DATABASE_URLS = [url.strip() for url in settings.REPLICA_DATABASE_URLS.split(",") if url.strip()]
+
 Base = declarative_base()
 
 _engine = None
 _SessionLocal = None
 
+_replica_engines = []
+_ReplicaSessionLocals = []
+_replica_down_until: list[float] = []
+_replica_cursor = itertools.count()
+_replica_lock = threading.Lock()
+
 def initialize_db():
-    global _engine, _SessionLocal
+    global _engine, _SessionLocal, _replica_down_until
     _engine = create_engine(
         DATABASE_URL,
         pool_pre_ping=True,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
         echo=False,
     )
     _SessionLocal = sessionmaker(
@@ -22,6 +42,48 @@ def initialize_db():
         autoflush=False,
         bind=_engine,
     )
+    for url in REPLICA_DATABASE_URLS:
+        replica_engine = create_engine(
+            url,
+            pool_pre_ping=True,
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            echo=False,
+        )
+        _replica_engines.append(replica_engine)
+        _ReplicaSessionLocals.append(sessionmaker(
+            autocommit=False,
+            autoflush=False,
+            bind=replica_engine,
+        ))
+    _replica_down_until = [0.0] * len(_replica_engines)
+    if _replica_engines:
+        logger.info(f"Read replicas configured: {len(_replica_engines)}")
+
+
+def prewarm_pool(count: int | None = None):
+    count = settings.DB_POOL_PREWARM if count is None else count
+    count = min(count, settings.DB_POOL_SIZE)
+    for engine in [get_engine(), *_replica_engines]:
+        connections = []
+        try:
+            for _ in range(count):
+                connections.append(engine.connect())
+        except OperationalError as e:
+            logger.warning(f"Connection pool prewarm stopped early - opened: {len(connections)}, error: {e}")
+        finally:
+            for connection in connections:
+                connection.close()
+    logger.info(f"Connection pool prewarmed - connections: {count}")
+
+
+def _dispose_after_fork():
+    for engine in [_engine, *_replica_engines]:
+        if engine is not None:
+            engine.dispose(close=False)
+
+
+os.register_at_fork(after_in_child=_dispose_after_fork)
 
 
 def shutdown_db():
@@ -29,12 +91,53 @@ def shutdown_db():
     if _engine is not None:
         _engine.dispose()
         _engine = None
+    for replica_engine in _replica_engines:
+        replica_engine.dispose()
+    _replica_engines.clear()
+    _ReplicaSessionLocals.clear()
 
 
-def get_db() -> Generator[Session, None, None]:
-    if _SessionLocal is None:
-        raise RuntimeError("Database not initialized. Call initialize_db() during app startup.")
-    db = _SessionLocal()
+def replicas_enabled() -> bool:
+    return bool(REPLICA_DATABASE_URLS)
+
+
+def is_replica_session(db: Session) -> bool:
+    return _engine is not None and db.get_bind() is not _engine
+
+
+def _replica_candidates() -> list[int]:
+    count = len(_ReplicaSessionLocals)
+    if count == 0:
+        return []
+    start = next(_replica_cursor)
+    now = time.monotonic()
+    return [
+        index
+        for index in ((start + offset) % count for offset in range(count))
+        if _replica_down_until[index] <= now
+    ]
+
+
+def _mark_replica_down(index: int, error: Exception):
+    with _replica_lock:
+        _replica_down_until[index] = time.monotonic() + settings.REPLICA_RETRY_SECONDS
+    logger.warning(f"Read replica {index} unavailable, retrying in {settings.REPLICA_RETRY_SECONDS}s - error: {error}")
+
+
+def _open_read_session(pin_primary: bool) -> Session:
+    if not pin_primary:
+        for index in _replica_candidates():
+            db = _ReplicaSessionLocals[index]()
+            try:
+                db.connection()
+                return db
+            except OperationalError as e:
+                db.close()
+                _mark_replica_down(index, e)
+    return _SessionLocal()
+
+
+def _session_scope(db: Session) -> Generator[Session, None, None]:
     try:
         yield db
     except Exception:
@@ -44,4 +147,37 @@ def get_db() -> Generator[Session, None, None]:
         try:
             db.close()
         except Exception:
-            pass
\ No newline at end of file
+            pass
+
+
+def get_engine():
+    if _engine is None:
+        raise RuntimeError("Database not initialized. Call initialize_db() during app startup.")
+    return _engine
+
+
+def create_session() -> Session:
+    if _SessionLocal is None:
+        raise RuntimeError("Database not initialized. Call initialize_db() during app startup.")
+    return _SessionLocal()
+
+
+def get_db(request: Request) -> Generator[Session, None, None]:
+    if _SessionLocal is None:
+        raise RuntimeError("Database not initialized. Call initialize_db() during app startup.")
+    batch_db = getattr(request.state, "batch_db", None)
+    if batch_db is not None:
+        yield batch_db
+        return
+    yield from _session_scope(_SessionLocal())
+
+
+def get_read_db(request: Request) -> Generator[Session, None, None]:
+    if _SessionLocal is None:
+        raise RuntimeError("Database not initialized. Call initialize_db() during app startup.")
+    batch_db = getattr(request.state, "batch_db", None)
+    if batch_db is not None:
+        yield batch_db
+        return
+    pin_primary = getattr(request.state, "pin_primary", False)
+    yield from _session_scope(_open_read_session(pin_primary))
@@ -0,0 +1,44 @@
+import logging
+from datetime import datetime, timezone
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def _month_start(year: int, month: int) -> datetime:
+    year, month = year + (month - 1) // 12, (month - 1) % 12 + 1
+    return datetime(year, month, 1, tzinfo=timezone.utc)
+
+
+def ensure_order_partitions(engine, months_ahead: int | None = None):
+    if engine.dialect.name != "postgresql":
+        return
+    months_ahead = settings.ORDER_PARTITION_MONTHS_AHEAD if months_ahead is None else months_ahead
+    with engine.begin() as conn:
+        partitioned = conn.execute(text(
+            "SELECT 1 FROM pg_partitioned_table pt "
+            "JOIN pg_class c ON c.oid = pt.partrelid "
+            "WHERE c.relname = 'orders'"
+        )).scalar()
+        if not partitioned:
+            logger.warning("orders table is not partitioned - skipping partition maintenance")
+            return
+
+        conn.execute(text("CREATE TABLE IF NOT EXISTS orders_default PARTITION OF orders DEFAULT"))
+
+        now = datetime.now(timezone.utc)
+        for offset in range(months_ahead + 1):
+            start = _month_start(now.year, now.month + offset)
+            end = _month_start(now.year, now.month + offset + 1)
+            name = f"orders_p{start:%Y_%m}"
+            try:
+                with conn.begin_nested():
+                    conn.execute(text(
+                        f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF orders "
+                        f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+                    ))
+            except DBAPIError as e:
+                logger.error(f"Could not create order partition {name} - error: {e}")
+    logger.info(f"Order partitions ensured through {months_ahead} month(s) ahead")
@@ -0,0 +1,174 @@
+import contextvars
+import json
+import logging
+import random
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+_current_route: contextvars.ContextVar[str | None] = contextvars.ContextVar("current_route", default=None)
+
+_lock = threading.Lock()
+_entries: dict[str, dict] = {}
+_explain_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="slow-query-explain")
+_explain_pending: set[str] = set()
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER = re.compile(r"%\([^)]+\)s|%s|\?|:\w+|\$\d+")
+_IN_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_VALUES_LIST = re.compile(r"(VALUES\s*)\(.*?\)(?:\s*,\s*\(.*?\))+", re.IGNORECASE | re.DOTALL)
+_WHITESPACE = re.compile(r"\s+")
+_PATH_ID = re.compile(r"/\d+(?=/|$)")
+_LOCKING_CLAUSE = re.compile(r"\bFOR\s+(?:NO\s+KEY\s+UPDATE|UPDATE|KEY\s+SHARE|SHARE)\b", re.IGNORECASE)
+_DATA_MODIFYING = re.compile(r"\b(?:INSERT|UPDATE|DELETE|MERGE)\b", re.IGNORECASE)
+
+
+def normalize_sql(statement: str) -> str:
+    sql = _STRING_LITERAL.sub("?", statement)
+    sql = _PLACEHOLDER.sub("?", sql)
+    sql = _NUMBER_LITERAL.sub("?", sql)
+    sql = _VALUES_LIST.sub(r"\1(...)", sql)
+    sql = _IN_LIST.sub("(...)", sql)
+    return _WHITESPACE.sub(" ", sql).strip()
+
+
+def explain_options(sql: str) -> str | None:
+    if sql.split(" ", 1)[0].upper() not in ("SELECT", "WITH"):
+        return None
+    # ANALYZE executes the statement, so row locks and data-modifying CTEs only get the estimated plan.
+    if _LOCKING_CLAUSE.search(sql) or _DATA_MODIFYING.search(sql):
+        return "FORMAT JSON"
+    return "ANALYZE, BUFFERS, FORMAT JSON"
+
+
+def set_current_route(method: str, path: str) -> contextvars.Token:
+    return _current_route.set(f"{method} {_PATH_ID.sub('/{id}', path)}")
+
+
+def reset_current_route(token: contextvars.Token):
+    _current_route.reset(token)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info.get("query_started")
+    if not started:
+        return
+    elapsed_ms = (time.perf_counter() - started.pop()) * 1000
+    if elapsed_ms < settings.SLOW_QUERY_MS or conn.info.get("explaining"):
+        return
+    try:
+        _record(conn.engine, statement, parameters, executemany, elapsed_ms)
+    except Exception as e:
+        logger.warning(f"Slow query could not be recorded - error: {e}")
+
+
+@event.listens_for(Engine, "handle_error")
+def _handle_error(context):
+    connection = context.connection
+    if connection is not None and connection.info.get("query_started"):
+        connection.info["query_started"].pop()
+
+
+def _record(engine: Engine, statement: str, parameters, executemany: bool, elapsed_ms: float):
+    sql = normalize_sql(statement)
+    route = _current_route.get() or "background"
+    now = datetime.now(timezone.utc).isoformat()
+    with _lock:
+        entry = _entries.get(sql)
+        if entry is None:
+            if len(_entries) >= settings.SLOW_QUERY_MAX_ENTRIES:
+                del _entries[min(_entries, key=lambda key: _entries[key]["total_ms"])]
+            entry = _entries[sql] = {
+                "sql": sql,
+                "count": 0,
+                "total_ms": 0.0,
+                "max_ms": 0.0,
+                "routes": {},
+                "last_parameters": None,
+                "last_seen": None,
+                "plan": None,
+                "plan_captured_at": None,
+            }
+        entry["count"] += 1
+        entry["total_ms"] += elapsed_ms
+        entry["max_ms"] = max(entry["max_ms"], elapsed_ms)
+        entry["routes"][route] = entry["routes"].get(route, 0) + 1
+        entry["last_parameters"] = repr(parameters)[:settings.SLOW_QUERY_PARAMETERS_MAX_CHARS] if settings.SLOW_QUERY_LOG_PARAMETERS else None
+        entry["last_seen"] = now
+        options = explain_options(sql)
+        explain = (
+            not executemany
+            and engine.dialect.name == "postgresql"
+            and options is not None
+            and sql not in _explain_pending
+            and _plan_is_stale(entry)
+            and random.random() < settings.SLOW_QUERY_EXPLAIN_SAMPLE_RATE
+        )
+        if explain:
+            _explain_pending.add(sql)
+    logger.warning(f"Slow query - {elapsed_ms:.1f}ms, route: {route}, sql: {sql[:200]}")
+    if explain:
+        _explain_executor.submit(_capture_plan, engine, sql, statement, parameters, options)
+
+
+def _plan_is_stale(entry: dict) -> bool:
+    captured = entry["plan_captured_at"]
+    return captured is None or time.time() - captured >= settings.SLOW_QUERY_EXPLAIN_INTERVAL_SECONDS
+
+
+def _capture_plan(engine: Engine, sql: str, statement: str, parameters, options: str):
+    try:
+        with engine.connect() as conn:
+            conn.info["explaining"] = True
+            try:
+                with conn.begin() as transaction:
+                    conn.exec_driver_sql(f"SET LOCAL statement_timeout = {int(settings.SLOW_QUERY_EXPLAIN_TIMEOUT_MS)}")
+                    plan = conn.exec_driver_sql(f"EXPLAIN ({options}) {statement}", parameters).scalar()
+                    transaction.rollback()
+            finally:
+                conn.info.pop("explaining", None)
+        with _lock:
+            if sql in _entries:
+                _entries[sql]["plan"] = plan if not isinstance(plan, str) else json.loads(plan)
+                _entries[sql]["plan_captured_at"] = time.time()
+    except Exception as e:
+        logger.warning(f"EXPLAIN capture failed - sql: {sql[:200]}, error: {e}")
+    finally:
+        with _lock:
+            _explain_pending.discard(sql)
+
+
+def get_slow_queries(limit: int, order_by: str = "total_ms") -> list[dict]:
+    with _lock:
+        entries = [
+            {
+                **entry,
+                "mean_ms": round(entry["total_ms"] / entry["count"], 2),
+                "total_ms": round(entry["total_ms"], 2),
+                "max_ms": round(entry["max_ms"], 2),
+                "routes": dict(entry["routes"]),
+                "plan_captured_at": datetime.fromtimestamp(entry["plan_captured_at"], timezone.utc).isoformat()
+                if entry["plan_captured_at"] else None,
+            }
+            for entry in _entries.values()
+        ]
+    return sorted(entries, key=lambda entry: entry[order_by], reverse=True)[:limit]
+
+
+def reset_slow_queries():
+    with _lock:
+        _entries.clear()
@@ -0,0 +1,100 @@
+import hashlib
+import logging
+from datetime import datetime, timezone
+from sqlalchemy import Column, DateTime, Integer, String, Table, delete, insert, inspect, select, text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.schema import CreateIndex, CreateTable
+from app.db.database import Base
+from app.db.partitions import ensure_order_partitions
+
+logger = logging.getLogger(__name__)
+
+SCHEMA_LOCK_ID = 4_512_001
+
+SCHEMA_MODES = {"fingerprint", "create_all", "skip"}
+
+# Columns added to tables that predate them; create_all never alters an existing table.
+ADDED_COLUMNS = {"orders": ("unit_price", "created_at", "reserved_until")}
+
+schema_meta = Table(
+    "schema_meta",
+    Base.metadata,
+    Column("id", Integer, primary_key=True),
+    Column("fingerprint", String(64), nullable=False),
+    Column("applied_at", DateTime(timezone=True), nullable=False),
+)
+
+
+def schema_fingerprint() -> str:
+    dialect = postgresql.dialect()
+    digest = hashlib.sha256()
+    for table in Base.metadata.sorted_tables:
+        digest.update(str(CreateTable(table).compile(dialect=dialect)).encode())
+        for index in sorted(table.indexes, key=lambda index: index.name or ""):
+            digest.update(str(CreateIndex(index).compile(dialect=dialect)).encode())
+    return digest.hexdigest()
+
+
+def _stored_fingerprint(engine) -> str | None:
+    try:
+        with engine.connect() as conn:
+            return conn.execute(select(schema_meta.c.fingerprint).where(schema_meta.c.id == 1)).scalar()
+    except DBAPIError:
+        return None
+
+
+def _add_missing_columns(conn):
+    inspector = inspect(conn)
+    for table_name, column_names in ADDED_COLUMNS.items():
+        if not inspector.has_table(table_name):
+            continue
+        existing = {column["name"] for column in inspector.get_columns(table_name)}
+        table = Base.metadata.tables[table_name]
+        for name in column_names:
+            if name in existing:
+                continue
+            column_type = table.c[name].type.compile(dialect=conn.dialect)
+            conn.execute(text(f"ALTER TABLE {table_name} ADD COLUMN {name} {column_type}"))
+            if name == "created_at":
+                # The real creation time of older rows is unknown; they are stamped with the upgrade time.
+                conn.execute(text(f"UPDATE {table_name} SET created_at = CURRENT_TIMESTAMP WHERE created_at IS NULL"))
+                if conn.dialect.name == "postgresql":
+                    conn.execute(text(f"ALTER TABLE {table_name} ALTER COLUMN created_at SET DEFAULT now()"))
+                    conn.execute(text(f"ALTER TABLE {table_name} ALTER COLUMN created_at SET NOT NULL"))
+            logger.warning(f"Schema upgrade - added column: {table_name}.{name}")
+
+
+def _apply_schema(engine, fingerprint: str, force: bool):
+    with engine.begin() as conn:
+        if engine.dialect.name == "postgresql":
+            conn.execute(text("SELECT pg_advisory_xact_lock(:lock_id)"), {"lock_id": SCHEMA_LOCK_ID})
+            stored = None
+            if engine.dialect.has_table(conn, schema_meta.name):
+                stored = conn.execute(select(schema_meta.c.fingerprint).where(schema_meta.c.id == 1)).scalar()
+            if stored == fingerprint and not force:
+                logger.info("Schema applied by another worker while waiting for the lock")
+                return
+        Base.metadata.create_all(bind=conn)
+        _add_missing_columns(conn)
+        # create_all skips tables that already exist, including indexes added to them later
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                index.create(conn, checkfirst=True)
+        conn.execute(delete(schema_meta))
+        conn.execute(insert(schema_meta).values(id=1, fingerprint=fingerprint, applied_at=datetime.now(timezone.utc)))
+    ensure_order_partitions(engine)
+    logger.info(f"Schema applied - fingerprint: {fingerprint[:12]}")
+
+
+def ensure_schema(engine, mode: str):
+    if mode not in SCHEMA_MODES:
+        raise ValueError(f"Unknown boot schema mode: {mode}")
+    if mode == "skip":
+        logger.info("Schema check skipped")
+        return
+    fingerprint = schema_fingerprint()
+    if mode == "fingerprint" and _stored_fingerprint(engine) == fingerprint:
+        logger.info(f"Schema up to date - fingerprint: {fingerprint[:12]}")
+        return
+    _apply_schema(engine, fingerprint, force=mode == "create_all")
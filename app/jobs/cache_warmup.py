@@ -0,0 +1,37 @@
+import logging
+from datetime import datetime, timedelta, timezone
+from app.core.config import settings
+from app.db.database import create_session, initialize_db, shutdown_db
+from app.repository.analytics_repo import AnalyticsRepository
+from app.repository.product_repo import ProductRepository
+from app.services.product_service import ProductService
+import app.models.user_model  # noqa: F401
+import app.models.order_model  # noqa: F401
+
+logger = logging.getLogger(__name__)
+
+
+def run_cache_warmup():
+    end = datetime.now(timezone.utc)
+    start = end - timedelta(days=settings.CACHE_WARMUP_TOP_DAYS)
+    db = create_session()
+    try:
+        top = AnalyticsRepository(db).get_top_products(start, end, settings.CACHE_WARMUP_TOP_PRODUCTS, order_by_units=True)
+        ProductService(ProductRepository(db)).warm_cache(
+            [row.product_id for row in top],
+            settings.CACHE_WARMUP_LIST_PAGES,
+            settings.CACHE_WARMUP_LIST_LIMIT,
+        )
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    from app.core.logger import setup_logging
+
+    setup_logging()
+    initialize_db()
+    try:
+        run_cache_warmup()
+    finally:
+        shutdown_db()
@@ -0,0 +1,45 @@
+import logging
+from datetime import datetime, timedelta, timezone
+from app.core.config import settings
+from app.db.database import create_session, get_engine, initialize_db, shutdown_db
+from app.db.partitions import ensure_order_partitions
+from app.repository.order_repo import OrderRepository
+from app.core.order_read_model import invalidate_users
+import app.models.user_model  # noqa: F401
+
+logger = logging.getLogger(__name__)
+
+
+def run_order_archival(max_batches: int = 100) -> int:
+    ensure_order_partitions(get_engine())
+    cutoff = datetime.now(timezone.utc) - timedelta(days=settings.ORDER_ARCHIVE_AFTER_DAYS)
+    archived = 0
+    db = create_session()
+    try:
+        repository = OrderRepository(db)
+        for _ in range(max_batches):
+            moved = repository.archive_terminal_orders(cutoff, settings.ORDER_ARCHIVE_BATCH_SIZE)
+            archived += len(moved)
+            invalidate_users({row.user_id for row in moved})
+            if len(moved) < settings.ORDER_ARCHIVE_BATCH_SIZE:
+                break
+        receipt_cutoff = datetime.now(timezone.utc) - timedelta(days=settings.ORDER_INTAKE_RECEIPT_RETENTION_DAYS)
+        pruned = repository.prune_intake_receipts(receipt_cutoff)
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+    logger.info(f"Order archival finished - archived: {archived}, receipts pruned: {pruned}, cutoff: {cutoff.isoformat()}")
+    return archived
+
+
+if __name__ == "__main__":
+    from app.core.logger import setup_logging
+
+    setup_logging()
+    initialize_db()
+    try:
+        run_order_archival()
+    finally:
+        shutdown_db()
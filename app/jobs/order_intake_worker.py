@@ -0,0 +1,121 @@
+import logging
+import os
+import socket
+import redis
+from app.core.config import settings
+from app.db.database import initialize_db, shutdown_db
+from app.services.order_intake import FINAL_STATUSES, find_intake_order, process_intake, ticket_key
+from app.services.history_writer import history_writer
+import app.models.user_model  # noqa: F401
+
+logger = logging.getLogger(__name__)
+
+
+def ensure_group(client):
+    try:
+        client.xgroup_create(settings.ORDER_INTAKE_STREAM, settings.ORDER_INTAKE_GROUP, id="0", mkstream=True)
+    except Exception as e:
+        if "BUSYGROUP" not in str(e):
+            raise
+
+
+def _set_ticket(pipe, key: str, mapping: dict):
+    pipe.hset(key, mapping=mapping)
+    pipe.expire(key, settings.ORDER_TICKET_TTL_SECONDS)
+
+
+def _update_ticket(client, key: str, mapping: dict):
+    pipe = client.pipeline()
+    _set_ticket(pipe, key, mapping)
+    pipe.execute()
+
+
+def _complete(client, key: str, entry_id: str, result: dict):
+    pipe = client.pipeline()
+    _set_ticket(pipe, key, result)
+    pipe.xack(settings.ORDER_INTAKE_STREAM, settings.ORDER_INTAKE_GROUP, entry_id)
+    pipe.execute()
+
+
+def _dead_letter(client, entry_id: str, fields: dict, error: str):
+    pipe = client.pipeline()
+    pipe.xadd(
+        settings.ORDER_INTAKE_DEAD_LETTER_STREAM,
+        {**fields, "source_id": entry_id, "error": error},
+        maxlen=settings.ORDER_INTAKE_STREAM_MAXLEN,
+        approximate=True,
+    )
+    _set_ticket(pipe, ticket_key(fields["ticket_id"]), {"status": "failed", "detail": "Order could not be processed"})
+    pipe.xack(settings.ORDER_INTAKE_STREAM, settings.ORDER_INTAKE_GROUP, entry_id)
+    pipe.execute()
+    logger.error(f"Order intake dead-lettered - ticket: {fields['ticket_id']}, error: {error}")
+
+
+def handle_entry(client, entry_id: str, fields: dict):
+    key = ticket_key(fields["ticket_id"])
+    if client.hget(key, "status") in FINAL_STATUSES:
+        client.xack(settings.ORDER_INTAKE_STREAM, settings.ORDER_INTAKE_GROUP, entry_id)
+        return
+    pipe = client.pipeline()
+    pipe.hincrby(key, "attempts", 1)
+    pipe.expire(key, settings.ORDER_TICKET_TTL_SECONDS)
+    attempts = pipe.execute()[0]
+    if attempts > settings.ORDER_INTAKE_MAX_ATTEMPTS:
+        # The last attempt may have committed before its status write failed.
+        result = find_intake_order(fields["ticket_id"])
+        if result is not None:
+            _complete(client, key, entry_id, result)
+        else:
+            _dead_letter(client, entry_id, fields, client.hget(key, "detail") or "max attempts exceeded")
+        return
+    _update_ticket(client, key, {"status": "processing"})
+    try:
+        result = process_intake(fields["ticket_id"], int(fields["user_id"]), int(fields["product_id"]), int(fields["quantity"]))
+    except Exception as e:
+        _update_ticket(client, key, {"status": "queued", "detail": str(e)})
+        logger.warning(f"Order intake attempt failed - ticket: {fields['ticket_id']}, attempt: {attempts}, error: {e}")
+        return
+    _complete(client, key, entry_id, result)
+
+
+def run_intake_worker(consumer: str, max_iterations: int | None = None):
+    # Own client without the request-path socket timeout: XREADGROUP blocks for ORDER_INTAKE_BLOCK_MS.
+    client = redis.from_url(settings.REDIS_URL, decode_responses=True, socket_connect_timeout=5)
+    ensure_group(client)
+    iterations = 0
+    while max_iterations is None or iterations < max_iterations:
+        iterations += 1
+        _, claimed, _ = client.xautoclaim(
+            settings.ORDER_INTAKE_STREAM,
+            settings.ORDER_INTAKE_GROUP,
+            consumer,
+            min_idle_time=settings.ORDER_INTAKE_RETRY_IDLE_MS,
+            count=settings.ORDER_INTAKE_READ_COUNT,
+        )
+        entries = [(entry_id, fields) for entry_id, fields in claimed if fields]
+        if not entries:
+            response = client.xreadgroup(
+                settings.ORDER_INTAKE_GROUP,
+                consumer,
+                {settings.ORDER_INTAKE_STREAM: ">"},
+                count=settings.ORDER_INTAKE_READ_COUNT,
+                block=settings.ORDER_INTAKE_BLOCK_MS,
+            )
+            entries = response[0][1] if response else []
+        for entry_id, fields in entries:
+            try:
+                handle_entry(client, entry_id, fields)
+            except Exception as e:
+                logger.warning(f"Order intake entry left pending for redelivery - entry: {entry_id}, error: {e}")
+
+
+if __name__ == "__main__":
+    from app.core.logger import setup_logging
+
+    setup_logging()
+    initialize_db()
+    try:
+        run_intake_worker(f"{socket.gethostname()}-{os.getpid()}")
+    finally:
+        history_writer.stop()
+        shutdown_db()
@@ -0,0 +1,80 @@
+import logging
+import threading
+from datetime import datetime, timezone
+from app.core.config import settings
+from app.db.database import create_session, initialize_db, shutdown_db
+from app.repository.analytics_repo import AnalyticsRepository
+from app.repository.order_repo import OrderRepository
+from app.services.order_service import OrderService
+from app.services.history_writer import history_writer
+import app.models.user_model  # noqa: F401
+
+logger = logging.getLogger(__name__)
+
+_metrics_lock = threading.Lock()
+
+sweeper_metrics = {
+    "runs": 0,
+    "orders_expired": 0,
+    "units_released": 0,
+    "units_released_by_product": {},
+    "last_run_at": None,
+    "last_run_orders_expired": 0,
+    "last_run_units_released": 0,
+}
+
+
+def _record_run(orders_expired: int, released: dict[int, int]):
+    with _metrics_lock:
+        units = sum(released.values())
+        sweeper_metrics["runs"] += 1
+        sweeper_metrics["orders_expired"] += orders_expired
+        sweeper_metrics["units_released"] += units
+        by_product = sweeper_metrics["units_released_by_product"]
+        for product_id, quantity in released.items():
+            by_product[product_id] = by_product.get(product_id, 0) + quantity
+        sweeper_metrics["last_run_at"] = datetime.now(timezone.utc).isoformat()
+        sweeper_metrics["last_run_orders_expired"] = orders_expired
+        sweeper_metrics["last_run_units_released"] = units
+
+
+def get_sweeper_metrics() -> dict:
+    with _metrics_lock:
+        return {
+            **sweeper_metrics,
+            "units_released_by_product": dict(sweeper_metrics["units_released_by_product"]),
+        }
+
+
+def run_reservation_sweep(max_batches: int = 20) -> dict[int, int]:
+    released: dict[int, int] = {}
+    orders_expired = 0
+    db = create_session()
+    try:
+        service = OrderService(OrderRepository(db), AnalyticsRepository(db))
+        for _ in range(max_batches):
+            count, batch = service.expire_reservations(settings.ORDER_SWEEP_BATCH_SIZE)
+            orders_expired += count
+            for product_id, quantity in batch.items():
+                released[product_id] = released.get(product_id, 0) + quantity
+            if count < settings.ORDER_SWEEP_BATCH_SIZE:
+                break
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+    _record_run(orders_expired, released)
+    return released
+
+
+if __name__ == "__main__":
+    from app.core.logger import setup_logging
+
+    setup_logging()
+    initialize_db()
+    try:
+        run_reservation_sweep()
+    finally:
+        history_writer.stop()
+        shutdown_db()
@@ -1,13 +1,37 @@
+import asyncio
 from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request
 from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
+from starlette.concurrency import run_in_threadpool
 from app.core.logger import logging, setup_logging
 from app.core.config import settings
-from app.db.database import initialize_db, shutdown_db
+from app.db.database import initialize_db, shutdown_db, replicas_enabled, get_engine
+from app.db.schema import ensure_schema
+from app.core.boot import is_ready, reset_ready, run_boot_warmup
+from app.core.scheduler import schedule_periodic, stop_scheduler
+from app.jobs.order_archival import run_order_archival
+from app.jobs.reservation_sweeper import run_reservation_sweep
+from app.jobs.cache_warmup import run_cache_warmup
+from app.core.security import get_token_subject, get_jwks, load_signing_keys
+from app.core.profiler import should_profile, start_profile, stop_profile, finish_profile
+from app.core.read_your_writes import mark_recent_write, has_recent_write
+from app.core.admission import AdmissionRejected, get_limiter
+from app.core.compression import CompressionMiddleware
+from app.core.deadline import TIMEOUT_HEADER, resolve_timeout, start_deadline, reset_deadline
+from sqlalchemy.exc import OperationalError
 from app.api.v1.users import router as users_router
 from app.api.v1.products import router as products_router
 from app.api.v1.orders import router as orders_router
+from app.api.v1.analytics import router as analytics_router
+from app.api.v1.events import router as events_router
+from app.api.v1.admin import router as admin_router
+from app.api.v1.batch import router as batch_router
+from app.db.query_log import set_current_route, reset_current_route
+from app.core.events import event_hub
+from app.services.order_batcher import order_batcher
+from app.services.order_intake import stop_intake
+from app.services.history_writer import history_writer
 
 from app.core.exceptions import (
     ProductNotFoundException,
@@ -19,7 +43,18 @@ from app.core.exceptions import (
     UserAlreadyExistsException,
     InvalidCredentialsException,
     UnauthorizedException,
-    ProductNotDeletedException
+    ProductNotDeletedException,
+    RateLimitExceededException,
+    SessionStoreUnavailableException,
+    InvalidFieldsException,
+    EventStreamLimitException,
+    OrderIntakeUnavailableException,
+    OrderTicketNotFoundException,
+    InvalidBatchException,
+    DeadlineExceededException,
+    InvalidCursorException,
+    OrderBatchTimeoutException,
+    OrderOutcomeUnknownException
 )
 
 logger = logging.getLogger(__name__)
@@ -29,11 +64,25 @@ setup_logging()
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     logger.info("Starting OMS Backend application")
+    reset_ready()
+    load_signing_keys()
     initialize_db()
-    from app.db.database import Base, _engine
-    Base.metadata.create_all(bind=_engine)
+    ensure_schema(get_engine(), settings.BOOT_SCHEMA_MODE)
+    if settings.RUN_PERIODIC_JOBS:
+        schedule_periodic("order-archival", settings.ORDER_ARCHIVE_INTERVAL_SECONDS, run_order_archival)
+        schedule_periodic("reservation-sweeper", settings.ORDER_SWEEP_INTERVAL_SECONDS, run_reservation_sweep)
+        schedule_periodic("cache-warmup", settings.CACHE_WARMUP_INTERVAL_SECONDS, run_cache_warmup)
+    else:
+        logger.info("Periodic jobs run elsewhere - skipping scheduler")
+    warmup = asyncio.create_task(run_in_threadpool(run_boot_warmup), name="boot-warmup")
     yield
     logger.info("Shutting down OMS Backend application")
+    warmup.cancel()
+    await stop_scheduler()
+    event_hub.stop()
+    order_batcher.stop()
+    stop_intake()
+    history_writer.stop()
     shutdown_db()
 
 
@@ -49,9 +98,30 @@ def open():
     return {"status": "Welcome to OMS Backend API!"}
 
 
+@app.get("/health")
+async def health():
+    return {"status": "ok"}
+
+
+@app.get("/ready")
+async def ready():
+    if not is_ready():
+        return JSONResponse(status_code=503, content={"status": "starting"})
+    return {"status": "ready"}
+
+
+@app.get("/.well-known/jwks.json")
+async def jwks():
+    return JSONResponse(get_jwks(), headers={"Cache-Control": f"public, max-age={settings.JWKS_MAX_AGE_SECONDS}"})
+
+
 app.include_router(users_router, prefix="/api/v1")
 app.include_router(products_router, prefix="/api/v1")
 app.include_router(orders_router, prefix="/api/v1")
+app.include_router(analytics_router, prefix="/api/v1")
+app.include_router(events_router, prefix="/api/v1")
+app.include_router(admin_router, prefix="/api/v1")
+app.include_router(batch_router, prefix="/api/v1")
 
 
 @app.exception_handler(ProductNotFoundException)
@@ -104,17 +174,160 @@ async def unauthorized_handler(request: Request, exc: UnauthorizedException):
     return JSONResponse(status_code=403, content={"detail": str(exc)})
 
 
+@app.exception_handler(InvalidFieldsException)
+async def invalid_fields_handler(request: Request, exc: InvalidFieldsException):
+    return JSONResponse(status_code=400, content={"detail": str(exc)})
+
+
+@app.exception_handler(EventStreamLimitException)
+async def event_stream_limit_handler(request: Request, exc: EventStreamLimitException):
+    return JSONResponse(status_code=503, content={"detail": str(exc)}, headers={"Retry-After": "5"})
+
+
+@app.exception_handler(SessionStoreUnavailableException)
+async def session_store_unavailable_handler(request: Request, exc: SessionStoreUnavailableException):
+    return JSONResponse(status_code=503, content={"detail": str(exc)})
+
+
+@app.exception_handler(OrderIntakeUnavailableException)
+async def order_intake_unavailable_handler(request: Request, exc: OrderIntakeUnavailableException):
+    return JSONResponse(status_code=503, content={"detail": str(exc)})
+
+
+@app.exception_handler(OrderTicketNotFoundException)
+async def order_ticket_not_found_handler(request: Request, exc: OrderTicketNotFoundException):
+    return JSONResponse(status_code=404, content={"detail": str(exc)})
+
+
+@app.exception_handler(InvalidBatchException)
+async def invalid_batch_handler(request: Request, exc: InvalidBatchException):
+    return JSONResponse(status_code=400, content={"detail": str(exc)})
+
+
+@app.exception_handler(InvalidCursorException)
+async def invalid_cursor_handler(request: Request, exc: InvalidCursorException):
+    return JSONResponse(status_code=400, content={"detail": str(exc)})
+
+
+@app.exception_handler(OrderBatchTimeoutException)
+async def order_batch_timeout_handler(request: Request, exc: OrderBatchTimeoutException):
+    return JSONResponse(status_code=503, content={"detail": str(exc)}, headers={"Retry-After": "1"})
+
+
+@app.exception_handler(OrderOutcomeUnknownException)
+async def order_outcome_unknown_handler(request: Request, exc: OrderOutcomeUnknownException):
+    return JSONResponse(status_code=504, content={"detail": str(exc)})
+
+
+@app.exception_handler(DeadlineExceededException)
+async def deadline_exceeded_handler(request: Request, exc: DeadlineExceededException):
+    return JSONResponse(status_code=504, content={"detail": str(exc)})
+
+
+PG_TIMEOUT_CODES = {"57014", "55P03"}
+
+
+@app.exception_handler(OperationalError)
+async def operational_error_handler(request: Request, exc: OperationalError):
+    if getattr(exc.orig, "pgcode", None) in PG_TIMEOUT_CODES:
+        logger.warning(f"Statement cancelled by timeout - path: {request.url.path}, error: {exc.orig}")
+        return JSONResponse(status_code=504, content={"detail": "Request deadline exceeded"})
+    logger.exception(f"Unhandled error: {str(exc)}")
+    return JSONResponse(status_code=500, content={"detail": "Internal Server Error"})
+
+
+@app.exception_handler(RateLimitExceededException)
+async def rate_limit_handler(request: Request, exc: RateLimitExceededException):
+    return JSONResponse(
+        status_code=429,
+        content={"detail": str(exc)},
+        headers={"Retry-After": str(exc.retry_after)},
+    )
+
+
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
     logger.exception(f"Unhandled error: {str(exc)}")
     return JSONResponse(status_code=500,content={"detail": "Internal Server Error"},)
 
 
+SAFE_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+
+@app.middleware("http")
+async def query_context_middleware(request: Request, call_next):
+    token = set_current_route(request.method, request.url.path)
+    try:
+        return await call_next(request)
+    finally:
+        reset_current_route(token)
+
+
+@app.middleware("http")
+async def profiler_middleware(request: Request, call_next):
+    if not should_profile(request):
+        return await call_next(request)
+    session, token = start_profile(request.method, request.url.path)
+    try:
+        response = await call_next(request)
+    finally:
+        stop_profile(session, token)
+    response.headers.update(await run_in_threadpool(finish_profile, session))
+    return response
+
+
+@app.middleware("http")
+async def read_your_writes_middleware(request: Request, call_next):
+    user_id = get_token_subject(request) if replicas_enabled() else None
+    if user_id is None:
+        return await call_next(request)
+    if request.method in SAFE_METHODS:
+        request.state.pin_primary = await run_in_threadpool(has_recent_write, user_id)
+        return await call_next(request)
+    response = await call_next(request)
+    if response.status_code < 400:
+        await run_in_threadpool(mark_recent_write, user_id)
+    return response
+
+
+@app.middleware("http")
+async def admission_control_middleware(request: Request, call_next):
+    limiter = get_limiter(request.method, request.url.path)
+    if limiter is None:
+        return await call_next(request)
+    try:
+        async with limiter.slot():
+            return await call_next(request)
+    except AdmissionRejected as e:
+        logger.warning(f"Request shed - {e}, path: {request.url.path}")
+        return JSONResponse(
+            status_code=503,
+            content={"detail": "Service overloaded, please retry"},
+            headers={"Retry-After": str(settings.ADMISSION_RETRY_AFTER_SECONDS)},
+        )
+
+
+@app.middleware("http")
+async def deadline_middleware(request: Request, call_next):
+    timeout = resolve_timeout(request.method, request.url.path, request.headers.get(TIMEOUT_HEADER))
+    remaining, token = start_deadline(timeout)
+    try:
+        return await asyncio.wait_for(call_next(request), timeout=max(remaining, 0))
+    except asyncio.TimeoutError:
+        logger.warning(f"Request deadline exceeded - {request.method} {request.url.path}, timeout: {timeout}s")
+        return JSONResponse(status_code=504, content={"detail": "Request deadline exceeded"})
+    finally:
+        reset_deadline(token)
+
+
+app.add_middleware(CompressionMiddleware, minimum_size=settings.COMPRESSION_MIN_BYTES)
+
+
 allowed_origins = [origin.strip() for origin in settings.ALLOWED_ORIGINS.split(",")]
 app.add_middleware(
     CORSMiddleware,
     allow_origins=allowed_origins,
     allow_credentials=True,
     allow_methods=["GET", "POST", "PUT", "DELETE"],
-    allow_headers=["Content-Type", "Authorization"],
+    allow_headers=["Content-Type", "Authorization", TIMEOUT_HEADER],
 )
\ No newline at end of file
@@ -0,0 +1,57 @@
+import enum
+from sqlalchemy import Column, Integer, ForeignKey, Enum, DateTime, Numeric, Index
+from app.db.database import Base
+from app.models.order_model import OrderStatus
+
+
+class RollupGranularity(str, enum.Enum):
+    hour = "hour"
+    day = "day"
+
+
+class SalesRollupHourly(Base):
+    __tablename__ = "sales_rollup_hourly"
+
+    bucket = Column(DateTime(timezone=True), primary_key=True)
+
+    product_id = Column(
+        Integer,
+        ForeignKey("products.id", ondelete="CASCADE"),
+        primary_key=True
+    )
+
+    status = Column(Enum(OrderStatus), primary_key=True)
+
+    order_count = Column(Integer, default=0, nullable=False)
+
+    units = Column(Integer, default=0, nullable=False)
+
+    revenue = Column(Numeric(14, 2), default=0, nullable=False)
+
+    __table_args__ = (
+        Index("ix_sales_rollup_hourly_product_bucket", "product_id", "bucket"),
+    )
+
+
+class SalesRollupDaily(Base):
+    __tablename__ = "sales_rollup_daily"
+
+    bucket = Column(DateTime(timezone=True), primary_key=True)
+
+    product_id = Column(
+        Integer,
+        ForeignKey("products.id", ondelete="CASCADE"),
+        primary_key=True
+    )
+
+    status = Column(Enum(OrderStatus), primary_key=True)
+
+    order_count = Column(Integer, default=0, nullable=False)
+
+    units = Column(Integer, default=0, nullable=False)
+
+    revenue = Column(Numeric(14, 2), default=0, nullable=False)
+
+    __table_args__ = (
+        Index("ix_sales_rollup_daily_product_bucket", "product_id", "bucket"),
+    )
@@ -1,5 +1,6 @@
 import enum
-from sqlalchemy import Column, Integer, ForeignKey, Enum
+from datetime import datetime, timezone
+from sqlalchemy import Column, Integer, ForeignKey, Enum, DateTime, Numeric, Index, String, func
 from sqlalchemy.orm import relationship
 from app.db.database import Base
 
@@ -14,7 +15,7 @@ class OrderStatus(str, enum.Enum):
 class Order(Base):
     __tablename__ = "orders"
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True, autoincrement=True, index=True)
 
     user_id = Column(
         Integer,
@@ -32,6 +33,8 @@ class Order(Base):
 
     quantity = Column(Integer, nullable=False)
 
+    unit_price = Column(Numeric(10, 2), nullable=True)
+
     status = Column(
         Enum(OrderStatus),
         default=OrderStatus.pending,
@@ -39,6 +42,60 @@ class Order(Base):
         index=True
     )
 
+    created_at = Column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(timezone.utc),
+        server_default=func.now(),
+        primary_key=True,
+        index=True
+    )
+
+    reserved_until = Column(DateTime(timezone=True), nullable=True)
+
     user = relationship("User", back_populates="orders")
 
-    product = relationship("Product", back_populates="orders")
\ No newline at end of file
+    product = relationship("Product", back_populates="orders")
+
+    __table_args__ = (
+        Index("ix_orders_user_created", "user_id", "created_at"),
+        Index(
+            "ix_orders_pending_reserved_until",
+            "reserved_until",
+            postgresql_where=status == OrderStatus.pending,
+        ),
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
+
+
+class OrderArchive(Base):
+    __tablename__ = "orders_archive"
+
+    id = Column(Integer, primary_key=True, autoincrement=False)
+
+    user_id = Column(Integer, nullable=False)
+
+    product_id = Column(Integer, nullable=False)
+
+    quantity = Column(Integer, nullable=False)
+
+    unit_price = Column(Numeric(10, 2), nullable=True)
+
+    status = Column(Enum(OrderStatus), nullable=False)
+
+    created_at = Column(DateTime(timezone=True), primary_key=True)
+
+    archived_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    __table_args__ = (
+        Index("ix_orders_archive_user_created", "user_id", "created_at"),
+    )
+
+
+class OrderIntakeReceipt(Base):
+    __tablename__ = "order_intake_receipts"
+
+    ticket_id = Column(String(32), primary_key=True)
+
+    order_id = Column(Integer, nullable=False)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False, index=True)
@@ -0,0 +1,44 @@
+import enum
+from datetime import datetime, timezone
+from sqlalchemy import Column, Integer, ForeignKey, Enum, DateTime, Numeric, Index
+from app.db.database import Base
+
+
+class ProductChangeReason(str, enum.Enum):
+    created = "created"
+    updated = "updated"
+    ordered = "ordered"
+    cancelled = "cancelled"
+    expired = "expired"
+
+
+class ProductHistory(Base):
+    __tablename__ = "product_history"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+
+    product_id = Column(
+        Integer,
+        ForeignKey("products.id", ondelete="CASCADE"),
+        nullable=False
+    )
+
+    reason = Column(Enum(ProductChangeReason), nullable=False)
+
+    price = Column(Numeric(10, 2), nullable=True)
+
+    stock = Column(Integer, nullable=True)
+
+    stock_delta = Column(Integer, nullable=True)
+
+    order_id = Column(Integer, nullable=True)
+
+    changed_at = Column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(timezone.utc),
+        nullable=False
+    )
+
+    __table_args__ = (
+        Index("ix_product_history_product_changed", "product_id", "changed_at", "id"),
+    )
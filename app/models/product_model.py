@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, Numeric
+from sqlalchemy import Column, Integer, String, Boolean, Numeric, Index
 from sqlalchemy.orm import relationship
 from app.db.database import Base
 
@@ -18,4 +18,11 @@ class Product(Base):
 
     is_deleted = Column(Boolean, default=False, nullable=False, index=True)
 
-    orders = relationship("Order", back_populates="product", cascade="all, delete-orphan")
\ No newline at end of file
+    orders = relationship("Order", back_populates="product", cascade="all, delete-orphan")
+
+    __table_args__ = (
+        Index("ix_products_active_price", "price", "id", postgresql_where=is_deleted.is_(False)),
+        Index("ix_products_active_name", "name", "id", postgresql_where=is_deleted.is_(False)),
+        Index("ix_products_in_stock_id", "id", postgresql_where=is_deleted.is_(False) & (stock > 0)),
+        Index("ix_products_in_stock_price", "price", "id", postgresql_where=is_deleted.is_(False) & (stock > 0)),
+    )
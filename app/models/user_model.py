@@ -27,6 +27,4 @@ class User(Base):
         nullable=False
     )
 
-    orders = relationship("Order", back_populates="user", cascade="all, delete-orphan")
-    
-    refresh_token = Column(String, nullable=True)
\ No newline at end of file
+    orders = relationship("Order", back_populates="user", cascade="all, delete-orphan")
\ No newline at end of file
@@ -0,0 +1,137 @@
+from datetime import datetime, timezone
+from decimal import Decimal
+from sqlalchemy import delete, func, insert, literal, select, text, union_all
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+from app.models.analytics_model import RollupGranularity, SalesRollupHourly, SalesRollupDaily
+from app.models.order_model import Order, OrderArchive, OrderStatus
+
+ROLLUP_MODELS = {
+    RollupGranularity.hour: SalesRollupHourly,
+    RollupGranularity.day: SalesRollupDaily,
+}
+
+
+def truncate_bucket(moment: datetime, granularity: RollupGranularity) -> datetime:
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    moment = moment.astimezone(timezone.utc).replace(minute=0, second=0, microsecond=0)
+    if granularity == RollupGranularity.day:
+        moment = moment.replace(hour=0)
+    return moment
+
+
+class AnalyticsRepository:
+
+    def __init__(self, db: Session):
+        self.db = db
+
+
+    def apply(self, changes: list[tuple[Order, OrderStatus, int]]) -> None:
+        totals: dict[tuple, list] = {}
+        for order, status, sign in changes:
+            if order.created_at is None:
+                continue
+            revenue = Decimal(order.unit_price or 0) * order.quantity
+            for granularity in ROLLUP_MODELS:
+                key = (granularity, truncate_bucket(order.created_at, granularity), order.product_id, status)
+                bucket_totals = totals.setdefault(key, [0, 0, Decimal(0)])
+                bucket_totals[0] += sign
+                bucket_totals[1] += sign * order.quantity
+                bucket_totals[2] += sign * revenue
+
+        for granularity, model in ROLLUP_MODELS.items():
+            rows = [
+                {
+                    "bucket": bucket,
+                    "product_id": product_id,
+                    "status": status,
+                    "order_count": order_count,
+                    "units": units,
+                    "revenue": revenue,
+                }
+                for (key_granularity, bucket, product_id, status), (order_count, units, revenue) in sorted(totals.items())
+                if key_granularity == granularity
+            ]
+            if not rows:
+                continue
+            stmt = pg_insert(model).values(rows)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[model.bucket, model.product_id, model.status],
+                set_={
+                    "order_count": model.order_count + stmt.excluded.order_count,
+                    "units": model.units + stmt.excluded.units,
+                    "revenue": model.revenue + stmt.excluded.revenue,
+                },
+            )
+            self.db.execute(stmt)
+
+
+    def get_rollups(
+        self,
+        granularity: RollupGranularity,
+        start: datetime,
+        end: datetime,
+        product_id: int | None,
+        status: OrderStatus | None,
+    ) -> list:
+        model = ROLLUP_MODELS[granularity]
+        query = self.db.query(model).filter(model.bucket >= start, model.bucket < end)
+
+        if product_id is not None:
+            query = query.filter(model.product_id == product_id)
+        if status is not None:
+            query = query.filter(model.status == status)
+
+        return query.order_by(model.bucket, model.product_id, model.status).all()
+
+
+    def get_top_products(self, start: datetime, end: datetime, limit: int, order_by_units: bool) -> list:
+        model = SalesRollupDaily
+        units = func.sum(model.units).label("units")
+        revenue = func.sum(model.revenue).label("revenue")
+        return (
+            self.db.query(
+                model.product_id,
+                func.sum(model.order_count).label("order_count"),
+                units,
+                revenue,
+            )
+            .filter(
+                model.bucket >= start,
+                model.bucket < end,
+                model.status != OrderStatus.cancelled,
+            )
+            .group_by(model.product_id)
+            .order_by((units if order_by_units else revenue).desc(), model.product_id)
+            .limit(limit)
+            .all()
+        )
+
+
+    def rebuild(self) -> None:
+        columns = ("id", "product_id", "status", "quantity", "unit_price", "created_at")
+        orders = union_all(
+            select(*(getattr(Order, column) for column in columns)),
+            select(*(getattr(OrderArchive, column) for column in columns)),
+        ).subquery("all_orders")
+        created_at_utc = func.timezone("UTC", orders.c.created_at)
+        self.db.execute(text("LOCK TABLE sales_rollup_hourly, sales_rollup_daily IN EXCLUSIVE MODE"))
+        for granularity, model in ROLLUP_MODELS.items():
+            bucket = func.timezone("UTC", func.date_trunc(granularity.value, created_at_utc))
+            self.db.execute(delete(model))
+            self.db.execute(
+                insert(model).from_select(
+                    ["bucket", "product_id", "status", "order_count", "units", "revenue"],
+                    select(
+                        bucket,
+                        orders.c.product_id,
+                        orders.c.status,
+                        func.count(orders.c.id),
+                        func.sum(orders.c.quantity),
+                        func.coalesce(func.sum(orders.c.quantity * orders.c.unit_price), literal(0)),
+                    )
+                    .group_by(bucket, orders.c.product_id, orders.c.status),
+                )
+            )
+        self.db.commit()
@@ -1,6 +1,15 @@
-from sqlalchemy.orm import Session, joinedload
-from app.models.order_model import Order, OrderStatus
+from datetime import datetime
+from sqlalchemy import column, delete, func, select, tuple_, union_all, update, values, Integer
+from sqlalchemy.orm import Session, load_only, selectinload
+from app.models.order_model import Order, OrderArchive, OrderIntakeReceipt, OrderStatus
 from app.models.product_model import Product
+from app.models.user_model import User
+from app.core.deadline import set_lock_timeout
+from app.db.database import is_replica_session
+
+ARCHIVABLE_STATUSES = (OrderStatus.delivered, OrderStatus.cancelled)
+
+ORDER_COLUMNS = ("id", "user_id", "product_id", "quantity", "unit_price", "status", "created_at")
 
 class OrderRepository:
 
@@ -17,27 +26,38 @@ class OrderRepository:
         )
 
 
-    def get_by_id_with_relations(self, order_id: int) -> Order | None:
-        return (
-            self.db.query(Order)
-            .options(joinedload(Order.product))
-            .filter(Order.id == order_id)
-            .first()
-        )
+    def _query(self, fields: tuple[str, ...] | None, expand: tuple[str, ...] = ()):
+        if not expand:
+            if fields:
+                return self.db.query(*(getattr(Order, name) for name in fields))
+            return self.db.query(Order)
+        query = self.db.query(Order).options(*(selectinload(getattr(Order, relation)) for relation in expand))
+        if fields:
+            columns = set(fields) | {f"{relation}_id" for relation in expand}
+            query = query.options(load_only(*(getattr(Order, name) for name in columns)))
+        return query
 
 
-    def get_all(self, skip: int, limit: int) -> list[Order]:
-        return self.db.query(Order).offset(skip).limit(limit).all()
+    def get_all(self, skip: int, limit: int, fields: tuple[str, ...] | None = None, expand: tuple[str, ...] = ()) -> list:
+        return self._query(fields, expand).offset(skip).limit(limit).all()
 
 
     def count_all(self) -> int:
         return self.db.query(Order).count()
 
 
-    def get_by_user(self, user_id: int, skip: int, limit: int) -> list[Order]:
+    def get_by_user(
+        self,
+        user_id: int,
+        skip: int,
+        limit: int,
+        fields: tuple[str, ...] | None = None,
+        expand: tuple[str, ...] = (),
+    ) -> list:
         return (
-            self.db.query(Order)
+            self._query(fields, expand)
             .filter(Order.user_id == user_id)
+            .order_by(Order.created_at.desc(), Order.id.desc())
             .offset(skip)
             .limit(limit)
             .all()
@@ -48,7 +68,142 @@ class OrderRepository:
         return self.db.query(Order).filter(Order.user_id == user_id).count()
 
 
+    def reads_from_replica(self) -> bool:
+        return is_replica_session(self.db)
+
+
+    def get_recent_by_user(self, user_id: int, limit: int) -> list[Order]:
+        return (
+            self.db.query(Order)
+            .filter(Order.user_id == user_id)
+            .order_by(Order.created_at.desc(), Order.id.desc())
+            .limit(limit)
+            .all()
+        )
+
+
+    def _history(self, user_id: int | None):
+        hot = select(*(getattr(Order, column) for column in ORDER_COLUMNS))
+        cold = select(*(getattr(OrderArchive, column) for column in ORDER_COLUMNS))
+        if user_id is not None:
+            hot = hot.where(Order.user_id == user_id)
+            cold = cold.where(OrderArchive.user_id == user_id)
+        return union_all(hot, cold).subquery("order_history")
+
+
+    def get_history(
+        self,
+        user_id: int | None,
+        skip: int,
+        limit: int,
+        fields: tuple[str, ...] | None = None,
+        expand: tuple[str, ...] = (),
+    ) -> list:
+        history = self._history(user_id)
+        columns = set(fields or ORDER_COLUMNS) | {f"{relation}_id" for relation in expand}
+        return self.db.execute(
+            select(*(history.c[name] for name in ORDER_COLUMNS if name in columns))
+            .order_by(history.c.created_at.desc(), history.c.id.desc())
+            .offset(skip)
+            .limit(limit)
+        ).all()
+
+
+    def count_history(self, user_id: int | None) -> int:
+        history = self._history(user_id)
+        return self.db.execute(select(func.count()).select_from(history)).scalar_one()
+
+
+    def get_related(self, rows: list, expand: tuple[str, ...]) -> dict[str, dict]:
+        related = {}
+        if "product" in expand:
+            product_ids = {row.product_id for row in rows}
+            related["product"] = {
+                product.id: product
+                for product in self.db.query(Product).filter(Product.id.in_(product_ids))
+            } if product_ids else {}
+        if "user" in expand:
+            user_ids = {row.user_id for row in rows}
+            related["user"] = {
+                user.id: user
+                for user in self.db.query(User).filter(User.id.in_(user_ids))
+            } if user_ids else {}
+        return related
+
+
+    def archive_terminal_orders(self, cutoff: datetime, batch_size: int) -> list:
+        batch = (
+            select(Order.id, Order.created_at)
+            .where(Order.status.in_(ARCHIVABLE_STATUSES), Order.created_at < cutoff)
+            .order_by(Order.created_at)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+        )
+        moved = (
+            Order.__table__.delete()
+            .where(tuple_(Order.id, Order.created_at).in_(batch))
+            .returning(*(Order.__table__.c[column] for column in ORDER_COLUMNS))
+            .cte("moved")
+        )
+        archived = self.db.execute(
+            OrderArchive.__table__.insert()
+            .from_select(list(ORDER_COLUMNS), select(*(moved.c[column] for column in ORDER_COLUMNS)))
+            .returning(OrderArchive.id, OrderArchive.user_id)
+        ).all()
+        self.db.commit()
+        return archived
+
+
+    def cancel_expired_reservations(self, now: datetime, batch_size: int) -> list:
+        expired = (
+            select(Order.id, Order.created_at)
+            .where(Order.status == OrderStatus.pending, Order.reserved_until < now)
+            .order_by(Order.reserved_until)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+        )
+        return self.db.execute(
+            update(Order)
+            .where(tuple_(Order.id, Order.created_at).in_(expired))
+            .values(status=OrderStatus.cancelled)
+            .returning(*(getattr(Order, name) for name in ORDER_COLUMNS))
+            .execution_options(synchronize_session=False)
+        ).all()
+
+
+    def get_products_for_update(self, product_ids: list[int]) -> dict:
+        rows = self.db.execute(
+            select(Product.id, Product.price, Product.stock)
+            .where(Product.id.in_(product_ids))
+            .order_by(Product.id)
+            .with_for_update()
+        ).all()
+        return {row.id: row for row in rows}
+
+
+    def adjust_stock(self, deltas: dict[int, int], lock: bool = True) -> dict[int, int]:
+        if not deltas:
+            return {}
+        product_ids = sorted(deltas)
+        if lock:
+            self.get_products_for_update(product_ids)
+        changes = values(
+            column("product_id", Integer),
+            column("delta", Integer),
+            name="changes",
+        ).data([(product_id, deltas[product_id]) for product_id in product_ids])
+        rows = self.db.execute(
+            update(Product)
+            .where(Product.id == changes.c.product_id)
+            .values(stock=Product.stock + changes.c.delta)
+            .returning(Product.id, Product.stock)
+            .execution_options(synchronize_session=False)
+        ).all()
+        return {row.id: row.stock for row in rows}
+
+
     def get_product_for_update(self, product_id: int) -> Product | None:
+        set_lock_timeout(self.db)
         return (
             self.db.query(Product)
             .filter(Product.id == product_id)
@@ -57,22 +212,59 @@ class OrderRepository:
         )
 
 
-    def create_order(self, user_id: int, product_id: int, quantity: int) -> Order:
+    def create_orders(self, rows: list[dict]) -> list:
+        return self.db.execute(
+            Order.__table__.insert()
+            .values(rows)
+            .returning(*(Order.__table__.c[name] for name in ORDER_COLUMNS), Order.__table__.c.reserved_until)
+        ).all()
+
+
+    def create_order(
+        self,
+        user_id: int,
+        product_id: int,
+        quantity: int,
+        unit_price,
+        reserved_until: datetime | None = None,
+    ) -> Order:
         order = Order(
             user_id=user_id,
             product_id=product_id,
             quantity=quantity,
+            unit_price=unit_price,
             status=OrderStatus.pending,
+            reserved_until=reserved_until,
         )
         self.db.add(order)
-        self.db.commit()
-        self.db.refresh(order)
+        self.db.flush()
         return order
 
 
+    def get_intake_receipt(self, ticket_id: str) -> int | None:
+        return self.db.execute(
+            select(OrderIntakeReceipt.order_id).where(OrderIntakeReceipt.ticket_id == ticket_id)
+        ).scalar()
+
+
+    def add_intake_receipt(self, ticket_id: str, order_id: int) -> None:
+        self.db.add(OrderIntakeReceipt(ticket_id=ticket_id, order_id=order_id))
+        self.db.flush()
+
+
+    def prune_intake_receipts(self, cutoff: datetime) -> int:
+        result = self.db.execute(delete(OrderIntakeReceipt).where(OrderIntakeReceipt.created_at < cutoff))
+        self.db.commit()
+        return result.rowcount
+
+
     def commit(self) -> None:
         self.db.commit()
 
 
+    def refresh(self, order: Order) -> None:
+        self.db.refresh(order)
+
+
     def rollback(self) -> None:
-        self.db.rollback()
\ No newline at end of file
+        self.db.rollback()
@@ -1,5 +1,9 @@
+from datetime import datetime
+from sqlalchemy import func, tuple_
 from sqlalchemy.orm import Session
 from app.models.product_model import Product
+from app.models.product_history_model import ProductHistory
+from app.schemas.product_schema import ProductFilter
 
 class ProductRepository:
 
@@ -24,22 +28,49 @@ class ProductRepository:
         return query.first()
 
 
-    def get_all(self, skip: int, limit: int, search: str | None) -> list[Product]:
-        query = self.db.query(Product).filter(Product.is_deleted.is_(False))
-
-        if search:
-            query = query.filter(Product.name.ilike(f"%{search}%"))
-
-        query = query.order_by(Product.id.desc())
+    def get_by_ids(self, product_ids: list[int]) -> list[Product]:
+        if not product_ids:
+            return []
+        return (
+            self.db.query(Product)
+            .filter(Product.id.in_(product_ids), Product.is_deleted.is_(False))
+            .all()
+        )
+
+
+    def _filtered(self, query, filters: ProductFilter):
+        query = query.filter(Product.is_deleted.is_(False))
+        if filters.search:
+            query = query.filter(Product.name.ilike(f"%{filters.search}%"))
+        if filters.min_price is not None:
+            query = query.filter(Product.price >= filters.min_price)
+        if filters.max_price is not None:
+            query = query.filter(Product.price <= filters.max_price)
+        if filters.in_stock:
+            query = query.filter(Product.stock > 0)
+        return query
+
+
+    def get_all(self, skip: int, limit: int, filters: ProductFilter, fields: tuple[str, ...] | None = None) -> list:
+        if fields:
+            query = self.db.query(*(getattr(Product, name) for name in fields))
+        else:
+            query = self.db.query(Product)
+        query = self._filtered(query, filters)
+
+        descending = filters.sort.startswith("-")
+        column = getattr(Product, filters.sort.lstrip("-"))
+        if column is Product.id:
+            order = [Product.id.desc() if descending else Product.id.asc()]
+        else:
+            order = [column.desc(), Product.id.desc()] if descending else [column.asc(), Product.id.asc()]
+        query = query.order_by(*order)
         return query.offset(skip).limit(limit).all()
     
     
-    def count_all(self, search: str | None) -> int:
-        query = self.db.query(Product).filter(Product.is_deleted.is_(False))
-        
-        if search:
-            query = query.filter(Product.name.ilike(f"%{search}%"))
-        return query.count()
+    def count_all(self, filters: ProductFilter) -> int:
+        query = self._filtered(self.db.query(func.count(Product.id)), filters)
+        return query.scalar()
 
 
     def update(self, product: Product, update_data: dict) -> Product:
@@ -60,4 +91,15 @@ class ProductRepository:
         product.is_deleted = False
         self.db.commit()
         self.db.refresh(product)
-        return product
\ No newline at end of file
+        return product
+
+
+    def get_history(self, product_id: int, before: tuple[datetime, int] | None, limit: int) -> list[ProductHistory]:
+        query = self.db.query(ProductHistory).filter(ProductHistory.product_id == product_id)
+        if before is not None:
+            query = query.filter(tuple_(ProductHistory.changed_at, ProductHistory.id) < before)
+        return (
+            query.order_by(ProductHistory.changed_at.desc(), ProductHistory.id.desc())
+            .limit(limit)
+            .all()
+        )
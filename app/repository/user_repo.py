@@ -37,8 +37,12 @@ class UserRepository:
         return user
 
 
-    def get_all(self, skip: int, limit: int) -> list[User]:
-        return self.db.query(User).offset(skip).limit(limit).all()
+    def get_all(self, skip: int, limit: int, fields: tuple[str, ...] | None = None) -> list:
+        if fields:
+            query = self.db.query(*(getattr(User, name) for name in fields))
+        else:
+            query = self.db.query(User)
+        return query.offset(skip).limit(limit).all()
 
 
     def count_all(self) -> int:
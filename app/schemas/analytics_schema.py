@@ -0,0 +1,22 @@
+from datetime import datetime
+from decimal import Decimal
+from pydantic import BaseModel, ConfigDict
+from app.models.order_model import OrderStatus
+
+
+class SalesRollupResponse(BaseModel):
+    bucket: datetime
+    product_id: int
+    status: OrderStatus
+    order_count: int
+    units: int
+    revenue: Decimal
+    model_config = ConfigDict(from_attributes=True)
+
+
+class ProductSalesResponse(BaseModel):
+    product_id: int
+    order_count: int
+    units: int
+    revenue: Decimal
+    model_config = ConfigDict(from_attributes=True)
@@ -0,0 +1,38 @@
+from functools import lru_cache
+from pydantic import BaseModel, ConfigDict, create_model
+from app.core.exceptions import InvalidFieldsException
+
+
+def parse_fields(fields: str | None, schema: type[BaseModel]) -> tuple[str, ...] | None:
+    if not fields:
+        return None
+    requested = {name.strip() for name in fields.split(",") if name.strip()}
+    unknown = requested - set(schema.model_fields)
+    if unknown:
+        raise InvalidFieldsException(f"Unknown fields: {', '.join(sorted(unknown))}")
+    requested.add("id")
+    return tuple(name for name in schema.model_fields if name in requested)
+
+
+def parse_expand(expand: str | None, allowed: tuple[str, ...]) -> tuple[str, ...]:
+    if not expand:
+        return ()
+    requested = {name.strip() for name in expand.split(",") if name.strip()}
+    unknown = requested - set(allowed)
+    if unknown:
+        raise InvalidFieldsException(f"Unknown expand: {', '.join(sorted(unknown))}")
+    return tuple(name for name in allowed if name in requested)
+
+
+@lru_cache(maxsize=128)
+def projection_model(schema: type[BaseModel], fields: tuple[str, ...]) -> type[BaseModel]:
+    return create_model(
+        f"{schema.__name__}Projection",
+        __config__=ConfigDict(from_attributes=True),
+        **{name: (schema.model_fields[name].annotation, ...) for name in fields},
+    )
+
+
+def project(rows: list, schema: type[BaseModel], fields: tuple[str, ...]) -> list[BaseModel]:
+    model = projection_model(schema, fields)
+    return [model.model_validate(row) for row in rows]
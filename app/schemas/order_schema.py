@@ -1,5 +1,10 @@
+from datetime import datetime
+from decimal import Decimal
+from typing import Optional
 from pydantic import BaseModel, ConfigDict, Field
 from app.models.order_model import OrderStatus
+from app.schemas.product_schema import ProductResponse
+from app.schemas.user_schema import UserResponse
 
 class OrderCreate(BaseModel):
     product_id: int
@@ -16,4 +21,23 @@ class OrderResponse(BaseModel):
     product_id: int
     quantity: int
     status: OrderStatus
-    model_config = ConfigDict(from_attributes=True)
\ No newline at end of file
+    unit_price: Optional[Decimal] = None
+    created_at: Optional[datetime] = None
+    reserved_until: Optional[datetime] = None
+    model_config = ConfigDict(from_attributes=True)
+
+
+class OrderTicketResponse(BaseModel):
+    ticket_id: str
+    status: str
+    product_id: int
+    quantity: int
+    order_id: Optional[int] = None
+    detail: Optional[str] = None
+    attempts: int = 0
+    created_at: datetime
+
+
+class OrderExpandedResponse(OrderResponse):
+    product: Optional[ProductResponse] = None
+    user: Optional[UserResponse] = None
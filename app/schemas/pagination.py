@@ -1,5 +1,8 @@
-from typing import TypeVar, Generic, List
+import base64
+from datetime import datetime
+from typing import TypeVar, Generic, List, Optional
 from pydantic import BaseModel
+from app.core.exceptions import InvalidCursorException
 
 T = TypeVar("T")
 
@@ -23,4 +26,21 @@ class PaginatedResponse(BaseModel, Generic[T]):
             page=page,
             limit=limit,
             total_pages=(total + limit - 1) // limit
-        )
\ No newline at end of file
+        )
+
+
+class CursorPage(BaseModel, Generic[T]):
+    data: List[T]
+    next_cursor: Optional[str]
+
+
+def encode_cursor(timestamp: datetime, row_id: int) -> str:
+    return base64.urlsafe_b64encode(f"{timestamp.isoformat()}|{row_id}".encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        timestamp, row_id = base64.urlsafe_b64decode(cursor.encode() + b"=" * (-len(cursor) % 4)).decode().split("|")
+        return datetime.fromisoformat(timestamp), int(row_id)
+    except ValueError:
+        raise InvalidCursorException("Invalid cursor")
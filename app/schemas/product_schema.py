@@ -1,6 +1,8 @@
 from pydantic import BaseModel, ConfigDict, Field
-from typing import Optional
+from typing import Literal, Optional
 from decimal import Decimal
+from datetime import datetime
+from app.models.product_history_model import ProductChangeReason
 
 
 class ProductCreate(BaseModel):
@@ -17,10 +19,33 @@ class ProductUpdate(BaseModel):
     stock: Optional[int] = Field(default=None, ge=0)
 
 
+ProductSort = Literal["-id", "id", "price", "-price", "name", "-name"]
+
+
+class ProductFilter(BaseModel):
+    search: Optional[str] = None
+    min_price: Optional[Decimal] = None
+    max_price: Optional[Decimal] = None
+    in_stock: bool = False
+    sort: ProductSort = "-id"
+
+
 class ProductResponse(BaseModel):
     id: int
     name: str
     description: Optional[str]
     price: Decimal
     stock: int
-    model_config = ConfigDict(from_attributes=True)
\ No newline at end of file
+    model_config = ConfigDict(from_attributes=True)
+
+
+class ProductHistoryResponse(BaseModel):
+    id: int
+    product_id: int
+    reason: ProductChangeReason
+    price: Optional[Decimal]
+    stock: Optional[int]
+    stock_delta: Optional[int]
+    order_id: Optional[int]
+    changed_at: datetime
+    model_config = ConfigDict(from_attributes=True)
@@ -0,0 +1,201 @@
+import gc
+import logging
+import os
+import random
+import signal
+import socket
+import time
+import uvicorn
+from app.core.config import settings
+from app.core.logger import setup_logging
+
+logger = logging.getLogger(__name__)
+
+RESPAWN_BACKOFF_SECONDS = 1.0
+
+
+def _bind_socket() -> socket.socket:
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((settings.SERVER_HOST, settings.PORT))
+    sock.listen(settings.SERVER_BACKLOG)
+    sock.set_inheritable(True)
+    return sock
+
+
+def _rss_mb(pid: int) -> float | None:
+    try:
+        with open(f"/proc/{pid}/statm") as statm:
+            pages = int(statm.read().split()[1])
+    except (OSError, ValueError, IndexError):
+        return None
+    return pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+
+
+class _RequestLimit:
+
+    def __init__(self, app, limit: int):
+        self.app = app
+        self.limit = limit
+        self.count = 0
+        self.server: uvicorn.Server | None = None
+
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http":
+            self.count += 1
+            if self.count == self.limit:
+                logger.info(f"Worker reached max requests, recycling - pid: {os.getpid()}, requests: {self.count}")
+                self.server.should_exit = True
+        await self.app(scope, receive, send)
+
+
+def _run_worker(app, sock: socket.socket, worker_id: int):
+    signal.signal(signal.SIGTERM, signal.SIG_IGN)
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGHUP, signal.SIG_IGN)
+    # Archival, the reservation sweeper and the cache warm-up are cluster-wide, so only worker 0 schedules them.
+    # A respawned worker 0 picks them up again.
+    if worker_id != 0:
+        settings.RUN_PERIODIC_JOBS = False
+    max_requests = None
+    if settings.SERVER_MAX_REQUESTS > 0:
+        max_requests = settings.SERVER_MAX_REQUESTS + random.randint(0, settings.SERVER_MAX_REQUESTS_JITTER)
+        app = _RequestLimit(app, max_requests)
+    config = uvicorn.Config(
+        app,
+        lifespan="on",
+        log_config=None,
+        timeout_graceful_shutdown=settings.SERVER_GRACEFUL_TIMEOUT_SECONDS,
+    )
+    server = uvicorn.Server(config)
+    if max_requests is not None:
+        app.server = server
+    logger.info(f"Worker started - worker: {worker_id}, pid: {os.getpid()}, max requests: {max_requests}, periodic jobs: {settings.RUN_PERIODIC_JOBS}")
+    exit_code = 0
+    try:
+        server.run(sockets=[sock])
+    except BaseException as e:
+        logger.exception(f"Worker crashed - worker: {worker_id}, error: {e}")
+        exit_code = 1
+    finally:
+        logging.shutdown()
+        os._exit(exit_code)
+
+
+class Arbiter:
+
+    def __init__(self, app, workers: int):
+        self.app = app
+        self.workers = workers
+        self.sock = _bind_socket()
+        self.children: dict[int, tuple[int, float]] = {}
+        self.stopping = False
+
+
+    def spawn(self, worker_id: int):
+        pid = os.fork()
+        if pid == 0:
+            _run_worker(self.app, self.sock, worker_id)
+        self.children[pid] = (worker_id, time.monotonic())
+
+
+    def handle_stop(self, signum, frame):
+        if not self.stopping:
+            logger.info(f"Received {signal.Signals(signum).name}, draining workers")
+        self.stopping = True
+
+
+    def handle_reload(self, signum, frame):
+        logger.info("Received SIGHUP, recycling workers")
+        for pid in list(self.children):
+            self._signal(pid, signal.SIGTERM)
+
+
+    def _signal(self, pid: int, signum: int):
+        try:
+            os.kill(pid, signum)
+        except ProcessLookupError:
+            pass
+
+
+    def reap(self) -> list[int]:
+        exited = []
+        while self.children:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                break
+            if pid == 0:
+                break
+            worker_id, started = self.children.pop(pid)
+            code = os.waitstatus_to_exitcode(status)
+            if not self.stopping:
+                logger.info(f"Worker exited - worker: {worker_id}, pid: {pid}, code: {code}")
+                if code != 0 and time.monotonic() - started < RESPAWN_BACKOFF_SECONDS:
+                    time.sleep(RESPAWN_BACKOFF_SECONDS)
+            exited.append(worker_id)
+        return exited
+
+
+    def check_memory(self):
+        if settings.SERVER_MAX_MEMORY_MB <= 0:
+            return
+        for pid, (worker_id, _) in list(self.children.items()):
+            rss = _rss_mb(pid)
+            if rss is not None and rss > settings.SERVER_MAX_MEMORY_MB:
+                logger.warning(f"Worker over memory limit, recycling - worker: {worker_id}, pid: {pid}, rss: {rss:.0f}MB")
+                self._signal(pid, signal.SIGTERM)
+
+
+    def run(self):
+        signal.signal(signal.SIGTERM, self.handle_stop)
+        signal.signal(signal.SIGINT, self.handle_stop)
+        signal.signal(signal.SIGHUP, self.handle_reload)
+        gc.freeze()
+        for worker_id in range(self.workers):
+            self.spawn(worker_id)
+        logger.info(f"Serving on {settings.SERVER_HOST}:{settings.PORT} - workers: {self.workers}, master pid: {os.getpid()}")
+
+        last_memory_check = time.monotonic()
+        while not self.stopping:
+            for worker_id in self.reap():
+                if not self.stopping:
+                    self.spawn(worker_id)
+            if time.monotonic() - last_memory_check >= settings.SERVER_MEMORY_CHECK_SECONDS:
+                self.check_memory()
+                last_memory_check = time.monotonic()
+            time.sleep(0.2)
+        self.drain()
+
+
+    def drain(self):
+        self.sock.close()
+        for pid in list(self.children):
+            self._signal(pid, signal.SIGTERM)
+        deadline = time.monotonic() + settings.SERVER_GRACEFUL_TIMEOUT_SECONDS + settings.SERVER_SHUTDOWN_GRACE_SECONDS
+        while self.children and time.monotonic() < deadline:
+            self.reap()
+            time.sleep(0.1)
+        for pid, (worker_id, _) in list(self.children.items()):
+            logger.warning(f"Worker did not drain in time, killing - worker: {worker_id}, pid: {pid}")
+            self._signal(pid, signal.SIGKILL)
+        while self.children:
+            self.reap()
+            time.sleep(0.05)
+        logger.info("All workers stopped")
+
+
+def main():
+    setup_logging()
+    from app.main import app
+    from app.core.security import load_signing_keys, warm_password_hashing
+
+    load_signing_keys()
+    warm_password_hashing()
+    workers = settings.SERVER_WORKERS or os.cpu_count() or 1
+    Arbiter(app, workers).run()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+import logging
+from datetime import datetime, timedelta, timezone
+from app.models.analytics_model import RollupGranularity
+from app.models.order_model import OrderStatus
+from app.repository.analytics_repo import AnalyticsRepository
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WINDOWS = {
+    RollupGranularity.hour: timedelta(hours=24),
+    RollupGranularity.day: timedelta(days=30),
+}
+
+class AnalyticsService:
+
+    def __init__(self, repository: AnalyticsRepository):
+        self.repository = repository
+
+
+    def _resolve_window(self, granularity: RollupGranularity, start: datetime | None, end: datetime | None):
+        end = end or datetime.now(timezone.utc)
+        start = start or end - DEFAULT_WINDOWS[granularity]
+        return start, end
+
+
+    def get_sales(
+        self,
+        granularity: RollupGranularity,
+        start: datetime | None,
+        end: datetime | None,
+        product_id: int | None,
+        status: OrderStatus | None,
+    ):
+        start, end = self._resolve_window(granularity, start, end)
+        return self.repository.get_rollups(granularity, start, end, product_id, status)
+
+
+    def get_top_products(self, start: datetime | None, end: datetime | None, limit: int, metric: str):
+        start, end = self._resolve_window(RollupGranularity.day, start, end)
+        return self.repository.get_top_products(start, end, limit, order_by_units=metric == "units")
+
+
+    def rebuild_rollups(self):
+        self.repository.rebuild()
+        logger.info("Sales rollups rebuilt from orders table")
@@ -0,0 +1,141 @@
+import logging
+import queue
+import threading
+import time
+from datetime import datetime, timezone
+from sqlalchemy import insert
+from app.core.config import settings
+from app.db.database import create_session
+from app.models.product_history_model import ProductHistory, ProductChangeReason
+
+logger = logging.getLogger(__name__)
+
+
+class HistoryWriter:
+
+    def __init__(self, buffer_size: int, flush_size: int, flush_interval_seconds: float, enqueue_timeout_seconds: float):
+        self.flush_size = flush_size
+        self.flush_interval_seconds = flush_interval_seconds
+        self.enqueue_timeout_seconds = enqueue_timeout_seconds
+        self._queue: queue.Queue = queue.Queue(maxsize=buffer_size)
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._stats = {"written": 0, "dropped": 0, "failed": 0, "flushes": 0}
+
+
+    def record(self, rows: list[dict]):
+        if not settings.PRODUCT_HISTORY_ENABLED or not rows:
+            return
+        self._ensure_started()
+        now = datetime.now(timezone.utc)
+        for index, row in enumerate(rows):
+            row.setdefault("changed_at", now)
+            try:
+                self._queue.put(row, timeout=self.enqueue_timeout_seconds)
+            except queue.Full:
+                dropped = len(rows) - index
+                with self._lock:
+                    self._stats["dropped"] += dropped
+                logger.warning(f"Product history buffer full - dropped: {dropped}")
+                return
+
+
+    def _ensure_started(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._stop.clear()
+                self._thread = threading.Thread(target=self._run, name="product-history-writer", daemon=True)
+                self._thread.start()
+
+
+    def _collect(self) -> list[dict]:
+        try:
+            rows = [self._queue.get(timeout=0.5)]
+        except queue.Empty:
+            return []
+        deadline = time.monotonic() + self.flush_interval_seconds
+        while len(rows) < self.flush_size:
+            remaining = 0 if self._stop.is_set() else deadline - time.monotonic()
+            try:
+                rows.append(self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return rows
+
+
+    def _run(self):
+        while not self._stop.is_set() or not self._queue.empty():
+            rows = self._collect()
+            if rows:
+                self._flush(rows)
+
+
+    def _flush(self, rows: list[dict]):
+        db = create_session()
+        try:
+            db.execute(insert(ProductHistory).values(rows))
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            with self._lock:
+                self._stats["failed"] += len(rows)
+            logger.error(f"Product history flush failed - rows: {len(rows)}, error: {e}")
+            return
+        finally:
+            db.close()
+        with self._lock:
+            self._stats["written"] += len(rows)
+            self._stats["flushes"] += 1
+        logger.debug(f"Product history flushed - rows: {len(rows)}")
+
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {**self._stats, "pending": self._queue.qsize()}
+
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=settings.PRODUCT_HISTORY_SHUTDOWN_TIMEOUT_SECONDS)
+            if self._thread.is_alive():
+                logger.warning(f"Product history writer did not drain before shutdown - pending: {self._queue.qsize()}")
+            self._thread = None
+
+
+def product_change(product, reason: ProductChangeReason, stock_delta: int | None = None, order_id: int | None = None) -> dict:
+    return {
+        "product_id": product.id,
+        "reason": reason,
+        "price": product.price,
+        "stock": product.stock,
+        "stock_delta": stock_delta,
+        "order_id": order_id,
+    }
+
+
+def stock_changes(orders: list, stock_levels: dict[int, int], sign: int, reason: ProductChangeReason) -> list[dict]:
+    levels = dict(stock_levels)
+    for order in orders:
+        levels[order.product_id] = levels.get(order.product_id, 0) - sign * order.quantity
+    changes = []
+    for order in orders:
+        levels[order.product_id] += sign * order.quantity
+        changes.append({
+            "product_id": order.product_id,
+            "reason": reason,
+            "price": None,
+            "stock": levels[order.product_id],
+            "stock_delta": sign * order.quantity,
+            "order_id": order.id,
+        })
+    return changes
+
+
+history_writer = HistoryWriter(
+    settings.PRODUCT_HISTORY_BUFFER_SIZE,
+    settings.PRODUCT_HISTORY_FLUSH_SIZE,
+    settings.PRODUCT_HISTORY_FLUSH_INTERVAL_MS / 1000,
+    settings.PRODUCT_HISTORY_ENQUEUE_TIMEOUT_MS / 1000,
+)
@@ -0,0 +1,138 @@
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from sqlalchemy.exc import SQLAlchemyError
+from app.core.config import settings
+from app.core.deadline import remaining_seconds
+from app.core.exceptions import InsufficientStockException, OrderBatchTimeoutException, OrderOutcomeUnknownException, ProductNotFoundException
+from app.db.database import create_session
+from app.repository.analytics_repo import AnalyticsRepository
+from app.repository.order_repo import OrderRepository
+from app.services.order_service import OrderService
+
+logger = logging.getLogger(__name__)
+
+
+class OrderBatcher:
+
+    def __init__(self, window_seconds: float, max_size: int, timeout_seconds: float):
+        self.window_seconds = window_seconds
+        self.max_size = max_size
+        self.timeout_seconds = timeout_seconds
+        self._queue: queue.Queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+
+    def submit(self, user_id: int, product_id: int, quantity: int):
+        self._ensure_started()
+        future: Future = Future()
+        self._queue.put(((user_id, product_id, quantity), future))
+        try:
+            return future.result(timeout=self._wait_seconds())
+        except FutureTimeoutError:
+            if future.cancel():
+                logger.warning(f"Order batch wait timed out before processing - user: {user_id}, product: {product_id}")
+                raise OrderBatchTimeoutException("Order was not processed in time, please retry")
+        # The order's batch is already running, so it may commit: wait for the outcome rather than give up on it.
+        try:
+            return future.result(timeout=self._wait_seconds())
+        except FutureTimeoutError:
+            logger.error(f"Order batch outcome unknown - user: {user_id}, product: {product_id}")
+            raise OrderOutcomeUnknownException("Order outcome unknown, check your orders before retrying")
+
+
+    def _wait_seconds(self) -> float:
+        remaining = remaining_seconds()
+        if remaining is None:
+            return self.timeout_seconds
+        return max(min(self.timeout_seconds, remaining), 0)
+
+
+    def _ensure_started(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._stop.clear()
+                self._thread = threading.Thread(target=self._run, name="order-batcher", daemon=True)
+                self._thread.start()
+
+
+    def _collect(self) -> list:
+        try:
+            batch = [self._queue.get(timeout=0.5)]
+        except queue.Empty:
+            return []
+        deadline = time.monotonic() + self.window_seconds
+        while len(batch) < self.max_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+
+    def _run(self):
+        while not self._stop.is_set() or not self._queue.empty():
+            batch = self._collect()
+            if batch:
+                self._apply(batch)
+
+
+    def _apply(self, batch: list):
+        batch = [(request, future) for request, future in batch if future.set_running_or_notify_cancel()]
+        if not batch:
+            return
+        db = create_session()
+        try:
+            service = OrderService(OrderRepository(db), AnalyticsRepository(db))
+            results = service.create_orders_batch([request for request, _ in batch])
+        except SQLAlchemyError as e:
+            db.rollback()
+            logger.warning(f"Order batch failed, retrying orders one by one - size: {len(batch)}, error: {e}")
+            results = None
+        except Exception as e:
+            db.rollback()
+            logger.exception(f"Order batch failed - size: {len(batch)}, error: {e}")
+            results = [e] * len(batch)
+        finally:
+            db.close()
+        if results is None:
+            results = [self._apply_one(request) for request, _ in batch]
+        for (_, future), result in zip(batch, results):
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+
+    def _apply_one(self, request: tuple[int, int, int]):
+        db = create_session()
+        try:
+            return OrderService(OrderRepository(db), AnalyticsRepository(db)).create_order(*request)
+        except Exception as e:
+            db.rollback()
+            if not isinstance(e, (ProductNotFoundException, InsufficientStockException)):
+                logger.exception(f"Order failed - request: {request}, error: {e}")
+            return e
+        finally:
+            db.close()
+
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.timeout_seconds)
+            self._thread = None
+
+
+order_batcher = OrderBatcher(
+    settings.ORDER_BATCH_WINDOW_MS / 1000,
+    settings.ORDER_BATCH_MAX_SIZE,
+    settings.ORDER_BATCH_TIMEOUT_SECONDS,
+)
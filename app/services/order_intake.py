@@ -0,0 +1,223 @@
+import logging
+import queue
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from datetime import datetime, timezone
+from sqlalchemy.exc import IntegrityError
+from app.core.config import settings
+from app.core.deadline import check_deadline
+from app.core.exceptions import ProductNotFoundException, InsufficientStockException, OrderIntakeUnavailableException
+from app.core.redis_cache import get_redis_client
+from app.db.database import create_session
+from app.repository.analytics_repo import AnalyticsRepository
+from app.repository.order_repo import OrderRepository
+from app.services.order_service import OrderService
+
+logger = logging.getLogger(__name__)
+
+TICKET_PREFIX = "order_ticket:"
+FINAL_STATUSES = {"completed", "rejected", "failed"}
+
+
+def ticket_key(ticket_id: str) -> str:
+    return f"{TICKET_PREFIX}{ticket_id}"
+
+
+def _completed(order_id: int) -> dict:
+    return {"status": "completed", "order_id": order_id, "detail": ""}
+
+
+def find_intake_order(ticket_id: str) -> dict | None:
+    db = create_session()
+    try:
+        order_id = OrderRepository(db).get_intake_receipt(ticket_id)
+    finally:
+        db.close()
+    return _completed(order_id) if order_id is not None else None
+
+
+# The receipt is committed with the order, so a redelivered or retried ticket never creates a second order.
+def process_intake(ticket_id: str, user_id: int, product_id: int, quantity: int) -> dict:
+    db = create_session()
+    try:
+        repository = OrderRepository(db)
+        order_id = repository.get_intake_receipt(ticket_id)
+        if order_id is not None:
+            logger.info(f"Order intake already processed - ticket: {ticket_id}, OrderID: {order_id}")
+            return _completed(order_id)
+        order = OrderService(repository, AnalyticsRepository(db)).create_order(user_id, product_id, quantity, ticket_id)
+        return _completed(order.id)
+    except (ProductNotFoundException, InsufficientStockException) as e:
+        db.rollback()
+        return {"status": "rejected", "detail": str(e)}
+    except IntegrityError:
+        db.rollback()
+        order_id = OrderRepository(db).get_intake_receipt(ticket_id)
+        if order_id is None:
+            raise
+        logger.info(f"Order intake processed concurrently - ticket: {ticket_id}, OrderID: {order_id}")
+        return _completed(order_id)
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+def _parse_ticket(ticket_id: str, data: dict) -> dict:
+    return {
+        "ticket_id": ticket_id,
+        "status": data["status"],
+        "user_id": int(data["user_id"]),
+        "product_id": int(data["product_id"]),
+        "quantity": int(data["quantity"]),
+        "order_id": int(data["order_id"]) if data.get("order_id") else None,
+        "detail": data.get("detail") or None,
+        "attempts": int(data.get("attempts", 0)),
+        "created_at": data["created_at"],
+    }
+
+
+class RedisIntakeBackend:
+
+    def enqueue(self, ticket: dict):
+        key = ticket_key(ticket["ticket_id"])
+        check_deadline()
+        try:
+            pipe = get_redis_client().pipeline()
+            pipe.hset(key, mapping={name: value for name, value in ticket.items() if name != "ticket_id"})
+            pipe.expire(key, settings.ORDER_TICKET_TTL_SECONDS)
+            pipe.xadd(
+                settings.ORDER_INTAKE_STREAM,
+                {
+                    "ticket_id": ticket["ticket_id"],
+                    "user_id": ticket["user_id"],
+                    "product_id": ticket["product_id"],
+                    "quantity": ticket["quantity"],
+                },
+                maxlen=settings.ORDER_INTAKE_STREAM_MAXLEN,
+                approximate=True,
+            )
+            pipe.execute()
+        except Exception as e:
+            logger.error(f"Order intake enqueue failed - ticket: {ticket['ticket_id']}, error: {e}")
+            raise OrderIntakeUnavailableException("Order intake is unavailable")
+
+
+    def get_ticket(self, ticket_id: str) -> dict | None:
+        check_deadline()
+        try:
+            data = get_redis_client().hgetall(ticket_key(ticket_id))
+        except Exception as e:
+            logger.error(f"Order ticket lookup failed - ticket: {ticket_id}, error: {e}")
+            raise OrderIntakeUnavailableException("Order intake is unavailable")
+        return _parse_ticket(ticket_id, data) if data else None
+
+
+    def stop(self):
+        pass
+
+
+class LocalIntakeBackend:
+
+    def __init__(self, max_tickets: int = 10000):
+        self.max_tickets = max_tickets
+        self.tickets: OrderedDict[str, dict] = OrderedDict()
+        self.dead_letters: list[dict] = []
+        self._queue: queue.Queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+
+
+    def enqueue(self, ticket: dict):
+        with self._lock:
+            self.tickets[ticket["ticket_id"]] = dict(ticket)
+            while len(self.tickets) > self.max_tickets:
+                self.tickets.popitem(last=False)
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="order-intake", daemon=True)
+                self._thread.start()
+        self._queue.put(ticket["ticket_id"])
+
+
+    def get_ticket(self, ticket_id: str) -> dict | None:
+        with self._lock:
+            data = self.tickets.get(ticket_id)
+            return _parse_ticket(ticket_id, data) if data else None
+
+
+    def _update(self, ticket_id: str, **fields):
+        with self._lock:
+            if ticket_id in self.tickets:
+                self.tickets[ticket_id].update(fields)
+
+
+    def _run(self):
+        while True:
+            ticket_id = self._queue.get()
+            if ticket_id is None:
+                return
+            with self._lock:
+                ticket = dict(self.tickets.get(ticket_id) or {})
+            if ticket:
+                self._process(ticket_id, ticket)
+
+
+    def _process(self, ticket_id: str, ticket: dict):
+        error = ""
+        for attempt in range(1, settings.ORDER_INTAKE_MAX_ATTEMPTS + 1):
+            self._update(ticket_id, attempts=attempt)
+            try:
+                result = process_intake(ticket_id, ticket["user_id"], ticket["product_id"], ticket["quantity"])
+            except Exception as e:
+                logger.warning(f"Order intake attempt failed - ticket: {ticket_id}, attempt: {attempt}, error: {e}")
+                error = str(e)
+                if attempt < settings.ORDER_INTAKE_MAX_ATTEMPTS:
+                    time.sleep(settings.ORDER_INTAKE_RETRY_IDLE_MS / 1000)
+                continue
+            self._update(ticket_id, **result)
+            return
+        self._update(ticket_id, status="failed", detail="Order could not be processed")
+        with self._lock:
+            self.dead_letters.append({**ticket, "error": error})
+        logger.error(f"Order intake dead-lettered - ticket: {ticket_id}, error: {error}")
+
+
+    def stop(self):
+        if self._thread is not None and self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join(timeout=10)
+        self._thread = None
+
+
+_backends = {"redis": RedisIntakeBackend(), "local": LocalIntakeBackend()}
+
+
+def get_intake_backend():
+    return _backends[settings.ORDER_INTAKE_BACKEND]
+
+
+def submit_order(user_id: int, product_id: int, quantity: int) -> dict:
+    ticket = {
+        "ticket_id": uuid.uuid4().hex,
+        "status": "queued",
+        "user_id": user_id,
+        "product_id": product_id,
+        "quantity": quantity,
+        "attempts": 0,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+    }
+    get_intake_backend().enqueue(ticket)
+    logger.info(f"Order queued - Ticket: {ticket['ticket_id']}, UserID: {user_id}, ProductID: {product_id}, Quantity: {quantity}")
+    return _parse_ticket(ticket["ticket_id"], ticket)
+
+
+def get_ticket(ticket_id: str) -> dict | None:
+    return get_intake_backend().get_ticket(ticket_id)
+
+
+def stop_intake():
+    for backend in _backends.values():
+        backend.stop()
@@ -1,19 +1,33 @@
 import logging
+from datetime import datetime, timedelta, timezone
 from app.models.order_model import OrderStatus
 from app.models.user_model import UserRole
 from app.repository.order_repo import OrderRepository
+from app.repository.analytics_repo import AnalyticsRepository
 from app.schemas.pagination import PaginatedResponse
+from app.schemas.order_schema import OrderResponse, OrderExpandedResponse
+from app.schemas.product_schema import ProductResponse
+from app.schemas.user_schema import UserResponse
+from app.schemas.fieldsets import parse_fields, parse_expand, project
+from app.core.config import settings
+from app.core.events import publish_order_event, publish_stock_event
+from app.models.product_history_model import ProductChangeReason
+from app.services.history_writer import history_writer, stock_changes
+from app.core.order_read_model import get_user_orders_page, get_version, record_orders, store_user_orders
 from app.core.exceptions import OrderNotFoundException, ProductNotFoundException, InsufficientStockException, OrderAlreadyCancelledException, InvalidOrderStatusTransitionException
 
 logger = logging.getLogger(__name__)
 
+EXPANDABLE = {"product": ProductResponse, "user": UserResponse}
+
 class OrderService:
 
-    def __init__(self, repository: OrderRepository):
+    def __init__(self, repository: OrderRepository, analytics: AnalyticsRepository):
         self.repository = repository
+        self.analytics = analytics
 
 
-    def create_order(self, user_id: int, product_id: int, quantity: int):
+    def create_order(self, user_id: int, product_id: int, quantity: int, ticket_id: str | None = None):
         product = self.repository.get_product_for_update(product_id)
         if not product:
             logger.warning(f"Order creation failed - product not found: {product_id}, user: {user_id}")
@@ -22,27 +36,188 @@ class OrderService:
             logger.warning(f"Order creation failed - insufficient stock: product {product_id}, requested {quantity}, available {product.stock}")
             raise InsufficientStockException("Not enough stock")
         product.stock -= quantity
-        order = self.repository.create_order(user_id, product_id, quantity)
+        order = self.repository.create_order(user_id, product_id, quantity, product.price, self._reservation_deadline())
+        if ticket_id is not None:
+            self.repository.add_intake_receipt(ticket_id, order.id)
+        self.analytics.apply([(order, OrderStatus.pending, 1)])
+        self.repository.commit()
+        self.repository.refresh(order)
+        record_orders([order])
+        publish_order_event(order, "order.created")
+        publish_stock_event(product_id, product.stock)
+        history_writer.record(stock_changes([order], {product_id: product.stock}, -1, ProductChangeReason.ordered))
         logger.info(f"Order created successfully - OrderID: {order.id}, UserID: {user_id}, ProductID: {product_id}, Quantity: {quantity}")
         return order
 
 
-    def get_all_orders(self, page: int, limit: int):
-        skip = (page - 1) * limit
-        data = self.repository.get_all(skip, limit)
-        total = self.repository.count_all()
+    def _expanded(self, row, expand: tuple[str, ...], related: dict[str, dict] | None) -> dict:
+        nested = {}
+        for relation in expand:
+            if related is None:
+                obj = getattr(row, relation)
+            else:
+                obj = related[relation].get(getattr(row, f"{relation}_id"))
+            nested[relation] = EXPANDABLE[relation].model_validate(obj) if obj is not None else None
+        return nested
+
+
+    def _page(
+        self,
+        rows: list,
+        total: int,
+        page: int,
+        limit: int,
+        selected: tuple[str, ...] | None,
+        expand: tuple[str, ...],
+        related: dict[str, dict] | None = None,
+    ):
+        if selected:
+            data = []
+            for row, item in zip(rows, project(rows, OrderResponse, selected)):
+                nested = self._expanded(row, expand, related)
+                data.append({
+                    **item.model_dump(mode='json'),
+                    **{name: value.model_dump(mode='json') if value else None for name, value in nested.items()},
+                })
+            return PaginatedResponse.create(data, total, page, limit).model_dump(mode='json')
+        data = [
+            OrderExpandedResponse(
+                **OrderResponse.model_validate(row).model_dump(),
+                **self._expanded(row, expand, related),
+            )
+            for row in rows
+        ]
         return PaginatedResponse.create(data, total, page, limit)
 
 
-    def get_my_orders(self, user_id: int, page: int, limit: int):
+    def _list_orders(
+        self,
+        user_id: int | None,
+        page: int,
+        limit: int,
+        include_history: bool,
+        fields: str | None,
+        expand: str | None,
+    ):
+        selected = parse_fields(fields, OrderResponse)
+        relations = parse_expand(expand, tuple(EXPANDABLE))
         skip = (page - 1) * limit
-        data = self.repository.get_by_user(user_id, skip, limit)
-        total = self.repository.count_by_user(user_id)
-        return PaginatedResponse.create(data, total, page, limit)
+        related = None
+        if include_history:
+            data = self.repository.get_history(user_id, skip, limit, selected, relations)
+            total = self.repository.count_history(user_id)
+            related = self.repository.get_related(data, relations)
+        elif user_id is None:
+            data = self.repository.get_all(skip, limit, selected, relations)
+            total = self.repository.count_all()
+        else:
+            data = self.repository.get_by_user(user_id, skip, limit, selected, relations)
+            total = self.repository.count_by_user(user_id)
+        return self._page(data, total, page, limit, selected, relations, related)
+
+
+    def create_orders_batch(self, requests: list[tuple[int, int, int]]) -> list:
+        products = self.repository.get_products_for_update(sorted({product_id for _, product_id, _ in requests}))
+        stock = {product_id: product.stock for product_id, product in products.items()}
+        now = datetime.now(timezone.utc)
+        reserved_until = self._reservation_deadline()
+        results: list = [None] * len(requests)
+        accepted: list[int] = []
+        rows: list[dict] = []
+        for index, (user_id, product_id, quantity) in enumerate(requests):
+            if product_id not in products:
+                logger.warning(f"Order creation failed - product not found: {product_id}, user: {user_id}")
+                results[index] = ProductNotFoundException("Product not found")
+            elif stock[product_id] < quantity:
+                logger.warning(f"Order creation failed - insufficient stock: product {product_id}, requested {quantity}, available {stock[product_id]}")
+                results[index] = InsufficientStockException("Not enough stock")
+            else:
+                stock[product_id] -= quantity
+                accepted.append(index)
+                rows.append({
+                    "user_id": user_id,
+                    "product_id": product_id,
+                    "quantity": quantity,
+                    "unit_price": products[product_id].price,
+                    "status": OrderStatus.pending,
+                    "created_at": now,
+                    "reserved_until": reserved_until,
+                })
+        if not rows:
+            self.repository.rollback()
+            return results
+
+        orders = self.repository.create_orders(rows)
+        deltas: dict[int, int] = {}
+        for order in orders:
+            deltas[order.product_id] = deltas.get(order.product_id, 0) - order.quantity
+        stock_levels = self.repository.adjust_stock(deltas, lock=False)
+        self.analytics.apply([(order, OrderStatus.pending, 1) for order in orders])
+        self.repository.commit()
+
+        # RETURNING order is not guaranteed; orders with the same user, product and quantity are interchangeable.
+        created: dict[tuple, list] = {}
+        for order in orders:
+            created.setdefault((order.user_id, order.product_id, order.quantity), []).append(order)
+        for index in accepted:
+            results[index] = created[requests[index]].pop()
+            publish_order_event(results[index], "order.created")
+        record_orders(orders)
+        for product_id, level in stock_levels.items():
+            publish_stock_event(product_id, level)
+        history_writer.record(stock_changes(orders, stock_levels, -1, ProductChangeReason.ordered))
+        logger.info(f"Order batch committed - accepted: {len(orders)}, rejected: {len(requests) - len(orders)}")
+        return results
+
+
+    def _reservation_deadline(self) -> datetime | None:
+        if settings.ORDER_RESERVATION_TTL_MINUTES <= 0:
+            return None
+        return datetime.now(timezone.utc) + timedelta(minutes=settings.ORDER_RESERVATION_TTL_MINUTES)
+
+
+    def get_all_orders(
+        self,
+        page: int,
+        limit: int,
+        include_history: bool = False,
+        fields: str | None = None,
+        expand: str | None = None,
+    ):
+        return self._list_orders(None, page, limit, include_history, fields, expand)
+
+
+    def get_my_orders(
+        self,
+        user_id: int,
+        page: int,
+        limit: int,
+        include_history: bool = False,
+        fields: str | None = None,
+        expand: str | None = None,
+    ):
+        if include_history or expand:
+            return self._list_orders(user_id, page, limit, include_history, fields, expand)
+        selected = parse_fields(fields, OrderResponse)
+        skip = (page - 1) * limit
+        cached = get_user_orders_page(user_id, skip, limit)
+        if cached is not None:
+            data, total = cached
+            logger.debug(f"Orders served from read model - UserID: {user_id}, page: {page}")
+            return self._page(data, total, page, limit, selected, ())
+        version = get_version(user_id)
+        orders = self.repository.get_recent_by_user(user_id, settings.ORDER_READ_MODEL_MAX_ORDERS + 1)
+        if len(orders) > settings.ORDER_READ_MODEL_MAX_ORDERS:
+            return self._list_orders(user_id, page, limit, include_history, fields, expand)
+        # A replica may lag behind a write that bumped the version, so its snapshot is only kept briefly.
+        ttl = settings.ORDER_READ_MODEL_REPLICA_TTL_SECONDS if self.repository.reads_from_replica() else None
+        store_user_orders(user_id, version, orders, ttl)
+        return self._page(orders[skip:skip + limit], len(orders), page, limit, selected, ())
     
     
     def update_status(self, order_id: int, new_status: OrderStatus):
-        order = self.repository.get_by_id_with_relations(order_id)
+        # Locked so a concurrent cancel or reservation sweep cannot change the status between this check and the write.
+        order = self.repository.get_by_id(order_id)
         if not order:
             logger.warning(f"Update status failed - order not found: {order_id}")
             raise OrderNotFoundException("Order not found")
@@ -54,16 +229,47 @@ class OrderService:
             raise InvalidOrderStatusTransitionException(
                 "Delivered orders cannot be modified"
             )
+        stock_levels = {}
         if new_status == OrderStatus.cancelled:
-            order.product.stock += order.quantity
-            logger.info(f"Order status updated to CANCELLED - OrderID: {order_id}, stock restored: {order.quantity}")           
+            stock_levels = self.repository.adjust_stock({order.product_id: order.quantity})
+            logger.info(f"Order status updated to CANCELLED - OrderID: {order_id}, stock restored: {order.quantity}")
         else:
             logger.info(f"Order status updated - OrderID: {order_id}, new status: {new_status.value}")
+        if order.status != new_status:
+            self.analytics.apply([(order, order.status, -1), (order, new_status, 1)])
         order.status = new_status
         self.repository.commit()
+        record_orders([order])
+        publish_order_event(order, "order.status")
+        if new_status == OrderStatus.cancelled:
+            publish_stock_event(order.product_id, stock_levels[order.product_id])
+            history_writer.record(stock_changes([order], stock_levels, 1, ProductChangeReason.cancelled))
         return order
 
 
+    def expire_reservations(self, batch_size: int) -> tuple[int, dict[int, int]]:
+        expired = self.repository.cancel_expired_reservations(datetime.now(timezone.utc), batch_size)
+        if not expired:
+            return 0, {}
+        released: dict[int, int] = {}
+        for order in expired:
+            released[order.product_id] = released.get(order.product_id, 0) + order.quantity
+        stock_levels = self.repository.adjust_stock(released)
+        self.analytics.apply(
+            [(order, OrderStatus.pending, -1) for order in expired]
+            + [(order, OrderStatus.cancelled, 1) for order in expired]
+        )
+        self.repository.commit()
+        record_orders(expired)
+        for order in expired:
+            publish_order_event(order, "order.status")
+        for product_id, stock in stock_levels.items():
+            publish_stock_event(product_id, stock)
+        history_writer.record(stock_changes(expired, stock_levels, 1, ProductChangeReason.expired))
+        logger.info(f"Expired reservations cancelled - orders: {len(expired)}, units released: {sum(released.values())}")
+        return len(expired), released
+
+
     def cancel_order(self, order_id: int, current_user):
         order = self.repository.get_by_id(order_id)
         if not order:
@@ -80,8 +286,13 @@ class OrderService:
             raise InvalidOrderStatusTransitionException(
                 "Cannot cancel shipped/delivered order"
             )
-        order.product.stock += order.quantity
+        stock_levels = self.repository.adjust_stock({order.product_id: order.quantity})
+        self.analytics.apply([(order, order.status, -1), (order, OrderStatus.cancelled, 1)])
         order.status = OrderStatus.cancelled
         self.repository.commit()
+        record_orders([order])
+        publish_order_event(order, "order.status")
+        publish_stock_event(order.product_id, stock_levels[order.product_id])
+        history_writer.record(stock_changes([order], stock_levels, 1, ProductChangeReason.cancelled))
         logger.info(f"Order cancelled successfully - OrderID: {order_id}, cancelled by user: {current_user.id}, stock restored: {order.quantity}")
         return order
\ No newline at end of file
@@ -1,14 +1,22 @@
 import logging
 from app.repository.product_repo import ProductRepository
-from app.schemas.pagination import PaginatedResponse
-from app.schemas.product_schema import ProductCreate, ProductUpdate, ProductResponse
-from app.core.redis_cache import cache_get, cache_set, cache_delete, cache_delete_pattern
-from app.core.exceptions import ProductNotFoundException, ProductNotDeletedException
+from app.schemas.pagination import PaginatedResponse, encode_cursor, decode_cursor
+from app.schemas.product_schema import ProductCreate, ProductUpdate, ProductResponse, ProductFilter
+from app.schemas.fieldsets import parse_fields, project
+from app.core.redis_cache import cache_get_variant, cache_set, cache_set_many, cache_invalidate, body_keys
+from app.core.compression import EncodedBody, precompress
+from app.core.config import settings
+from app.core.events import publish_stock_event
+from app.models.product_history_model import ProductChangeReason
+from app.services.history_writer import history_writer, product_change
+from app.core.exceptions import ProductNotFoundException, ProductNotDeletedException, InvalidFieldsException
 
 logger = logging.getLogger(__name__)
 
 PRODUCT_TTL = 300
 
+MISSING_MARKER = {"missing": True}
+
 class ProductService:
 
     def __init__(self, repository: ProductRepository):
@@ -18,56 +26,117 @@ class ProductService:
     def create_product(self, product_data: ProductCreate):
         product = self.repository.create(product_data.model_dump())
         logger.info(f"Product created - ID: {product.id}, Name: {product_data.name}")
-        cache_delete_pattern("products:list:*")
+        history_writer.record([product_change(product, ProductChangeReason.created, stock_delta=product.stock)])
+        cache_invalidate(keys=self._product_keys(product.id), patterns=["products:list:*"])
         return product
 
 
-    def get_all_products(self, page: int, limit: int, search: str | None):
-        cache_key = f"products:list:{page}:{limit}:{search or 'none'}"
-        cached = cache_get(cache_key)
-        if cached:
+    def _product_keys(self, product_id: int) -> list[str]:
+        key = f"products:single:{product_id}"
+        return [key, *body_keys(key)]
+
+
+    def _list_cache_key(self, page: int, limit: int, filters: ProductFilter, selected: tuple[str, ...] | None) -> str:
+        price_range = ":".join(
+            format(value.normalize(), "f") if value is not None else "any"
+            for value in (filters.min_price, filters.max_price)
+        )
+        return (
+            f"products:list:{page}:{limit}:{filters.search or 'none'}:{','.join(selected) if selected else 'all'}"
+            f":{price_range}:{'in_stock' if filters.in_stock else 'any'}:{filters.sort}"
+        )
+
+
+    def get_all_products(
+        self,
+        page: int,
+        limit: int,
+        filters: ProductFilter,
+        fields: str | None = None,
+        encoding: str | None = None,
+    ):
+        if filters.min_price is not None and filters.max_price is not None and filters.min_price > filters.max_price:
+            raise InvalidFieldsException("min_price must not exceed max_price")
+        selected = parse_fields(fields, ProductResponse)
+        cached, body = cache_get_variant(self._list_cache_key(page, limit, filters, selected), encoding)
+        if body is not None:
+            return EncodedBody(body, encoding)
+        if cached is not None:
             return cached
+        return self._load_page(page, limit, filters, selected)
+
+
+    def _load_page(self, page: int, limit: int, filters: ProductFilter, selected: tuple[str, ...] | None) -> dict:
         skip = (page - 1) * limit
-        data = self.repository.get_all(skip, limit, search)
-        total = self.repository.count_all(search)
-        result = PaginatedResponse.create(data, total, page, limit)
-        serializable = {
-            "data": [ProductResponse.model_validate(p).model_dump(mode='json') for p in data],
-            "total": total,
-            "page": page,
-            "limit": limit,
-            "total_pages": (total + limit - 1)
-        }
-        cache_set(cache_key, serializable, ttl=PRODUCT_TTL)
+        rows = self.repository.get_all(skip, limit, filters, selected)
+        total = self.repository.count_all(filters)
+        if selected:
+            data = project(rows, ProductResponse, selected)
+        else:
+            data = [ProductResponse.model_validate(p) for p in rows]
+        result = PaginatedResponse.create(data, total, page, limit).model_dump(mode='json')
+        cache_set(self._list_cache_key(page, limit, filters, selected), result, ttl=PRODUCT_TTL, bodies=precompress(result))
         return result
 
 
-    def get_product(self, product_id: int):
+    def get_product(self, product_id: int, encoding: str | None = None):
         cache_key = f"products:single:{product_id}"
-        cached = cache_get(cache_key)
-        if cached:
+        cached, body = cache_get_variant(cache_key, encoding)
+        if body is not None:
+            return EncodedBody(body, encoding)
+        if cached is not None:
+            if cached == MISSING_MARKER:
+                raise ProductNotFoundException("Product not found")
             return cached
         product = self.repository.get_by_id(product_id)
         if not product:
             logger.warning(f"Get product attempt for non-existent product: {product_id}")
+            cache_set(cache_key, MISSING_MARKER, ttl=settings.PRODUCT_NEGATIVE_CACHE_TTL_SECONDS)
             raise ProductNotFoundException("Product not found")
         logger.info(f"Product retrieved - ID: {product_id}")
-        cache_set(cache_key, ProductResponse.model_validate(product).model_dump(mode='json'), ttl=PRODUCT_TTL)
+        value = ProductResponse.model_validate(product).model_dump(mode='json')
+        cache_set(cache_key, value, ttl=PRODUCT_TTL, bodies=precompress(value))
         return product
 
 
+    def warm_cache(self, product_ids: list[int], pages: int, limit: int):
+        products = self.repository.get_by_ids(product_ids)
+        cache_set_many(
+            {
+                f"products:single:{product.id}": ProductResponse.model_validate(product).model_dump(mode='json')
+                for product in products
+            },
+            ttl=PRODUCT_TTL,
+        )
+        warmed_pages = 0
+        for page in range(1, pages + 1):
+            result = self._load_page(page, limit, ProductFilter(), None)
+            warmed_pages += 1
+            if page >= result["total_pages"]:
+                break
+        logger.info(f"Product cache warmed - products: {len(products)}, pages: {warmed_pages}")
+
+
     def update_product(self, product_id: int, update_data: ProductUpdate):
         product = self.repository.get_by_id(product_id)
         if not product:
             logger.warning(f"Update attempt for non-existent product: {product_id}")
             raise ProductNotFoundException("Product not found")
+        previous = (product.price, product.stock)
         updated_product = self.repository.update(
             product,
             update_data.model_dump(exclude_unset=True),
         )
         logger.info(f"Product updated - ID: {product_id}")
-        cache_delete(f"products:single:{product_id}")
-        cache_delete_pattern("products:list:*")
+        if (updated_product.price, updated_product.stock) != previous:
+            history_writer.record([product_change(
+                updated_product,
+                ProductChangeReason.updated,
+                stock_delta=updated_product.stock - previous[1],
+            )])
+        if update_data.stock is not None:
+            publish_stock_event(product_id, updated_product.stock)
+        cache_invalidate(keys=self._product_keys(product_id), patterns=["products:list:*"])
         return updated_product
 
 
@@ -78,8 +147,7 @@ class ProductService:
             raise ProductNotFoundException("Product not found")
         self.repository.soft_delete(product)
         logger.info(f"Product soft deleted - ID: {product_id}")
-        cache_delete(f"products:single:{product_id}")
-        cache_delete_pattern("products:list:*")
+        cache_invalidate(keys=self._product_keys(product_id), patterns=["products:list:*"])
 
 
     def restore_product(self, product_id: int):
@@ -92,6 +160,14 @@ class ProductService:
             raise ProductNotDeletedException("Product is not deleted")
         restored_product = self.repository.restore(product)
         logger.info(f"Product restored - ID: {product_id}")
-        cache_delete(f"products:single:{product_id}")
-        cache_delete_pattern("products:list:*")
-        return restored_product
\ No newline at end of file
+        cache_invalidate(keys=self._product_keys(product_id), patterns=["products:list:*"])
+        return restored_product
+
+
+    def get_history(self, product_id: int, limit: int, cursor: str | None):
+        if not self.repository.get_by_id(product_id, include_deleted=True):
+            raise ProductNotFoundException("Product not found")
+        before = decode_cursor(cursor) if cursor else None
+        rows = self.repository.get_history(product_id, before, limit + 1)
+        next_cursor = encode_cursor(rows[limit - 1].changed_at, rows[limit - 1].id) if len(rows) > limit else None
+        return {"data": rows[:limit], "next_cursor": next_cursor}
\ No newline at end of file
@@ -0,0 +1,26 @@
+import logging
+from app.core.security import create_access_token
+from app.core.session_store import rotate_session, revoke_all_sessions, revoke_token_family
+
+logger = logging.getLogger(__name__)
+
+class SessionService:
+
+    def refresh_token(self, refresh_token: str):
+        session = rotate_session(refresh_token)
+        new_access_token = create_access_token(session["user_id"], session["role"])
+        logger.info(f"Access token refreshed - UserID: {session['user_id']}")
+        return {
+            "access_token": new_access_token,
+            "refresh_token": session["refresh_token"],
+            "token_type": "bearer"
+        }
+
+
+    def logout_user(self, user_id: int, refresh_token: str | None = None):
+        if refresh_token:
+            revoke_token_family(user_id, refresh_token)
+            logger.info(f"User logged out - ID: {user_id}")
+        else:
+            revoke_all_sessions(user_id)
+            logger.info(f"User logged out from all sessions - ID: {user_id}")
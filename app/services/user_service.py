@@ -1,11 +1,11 @@
 import logging
-from jose import JWTError, jwt
 from app.schemas.pagination import PaginatedResponse
-from app.schemas.user_schema import UserCreate, UserUpdate
-from app.core.security import create_refresh_token, hash_password, verify_password, create_access_token
+from app.schemas.user_schema import UserCreate, UserUpdate, UserResponse
+from app.schemas.fieldsets import parse_fields, project
+from app.core.security import hash_password, verify_password, create_access_token
+from app.core.session_store import create_session, revoke_all_sessions
 from app.repository.user_repo import UserRepository
 from app.models.user_model import UserRole
-from app.core.config import settings
 from app.core.exceptions import UserAlreadyExistsException, InvalidCredentialsException, UserNotFoundException, UnauthorizedException
 
 logger = logging.getLogger(__name__)
@@ -32,9 +32,8 @@ class UserService:
         if not user or not verify_password(password, user.hashed_password):
             logger.warning(f"Failed login attempt for email: {email}")
             raise InvalidCredentialsException("Invalid credentials")
-        access_token = create_access_token(user)
-        refresh_token = create_refresh_token(user)
-        self.repository.update(user, {"refresh_token": refresh_token})
+        access_token = create_access_token(user.id, user.role.value)
+        refresh_token = create_session(user.id, user.role.value)
         logger.info(f"User logged in successfully - ID: {user.id}, Email: {email}")
         return {
             "access_token": access_token,
@@ -43,36 +42,13 @@ class UserService:
         }
 
 
-    def refresh_token(self, refresh_token: str):
-        credentials_exception = InvalidCredentialsException("Invalid or expired refresh token")
-        try:
-            payload = jwt.decode(refresh_token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-            user_id: str = payload.get("sub")
-            token_type: str = payload.get("type")
-            if user_id is None or token_type != "refresh":
-                raise credentials_exception
-        except (JWTError, ValueError, TypeError):
-            raise credentials_exception
-        user = self.repository.get_by_id(int(user_id))
-        if not user or user.refresh_token != refresh_token:
-            raise credentials_exception
-        new_access_token = create_access_token(user)
-        logger.info(f"Access token refreshed - UserID: {user.id}")
-        return {"access_token": new_access_token, "token_type": "bearer"}
-
-
-    def logout_user(self, user_id: int):
-        user = self.repository.get_by_id(user_id)
-        if not user:
-            raise UserNotFoundException("User not found")
-        self.repository.update(user, {"refresh_token": None})
-        logger.info(f"User logged out - ID: {user_id}")
-
-
-    def get_all_users(self, page: int, limit: int):
+    def get_all_users(self, page: int, limit: int, fields: str | None = None):
+        selected = parse_fields(fields, UserResponse)
         skip = (page - 1) * limit
-        data = self.repository.get_all(skip, limit)
+        data = self.repository.get_all(skip, limit, selected)
         total = self.repository.count_all()
+        if selected:
+            return PaginatedResponse.create(project(data, UserResponse, selected), total, page, limit).model_dump(mode='json')
         return PaginatedResponse.create(data, total, page, limit)
 
 
@@ -108,6 +84,7 @@ class UserService:
             raise UserNotFoundException("User not found")
         new_role = UserRole.admin if user.role == UserRole.user else UserRole.user
         updated_user = self.repository.update(user, {"role": new_role})
+        revoke_all_sessions(user_id)
         logger.info(f"User role updated - ID: {user_id}, New Role: {new_role.value}")
         return updated_user
 
@@ -118,4 +95,5 @@ class UserService:
             logger.warning(f"Delete attempt for non-existent user: {user_id}")
             raise UserNotFoundException("User not found")
         self.repository.delete(user)
+        revoke_all_sessions(user_id)
         logger.info(f"User deleted successfully - ID: {user_id}")
\ No newline at end of file
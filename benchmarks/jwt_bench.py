@@ -0,0 +1,72 @@
+import argparse
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec, rsa
+
+KEY_FACTORIES = {
+    "ES256": lambda: ec.generate_private_key(ec.SECP256R1()),
+    "RS256": lambda: rsa.generate_private_key(public_exponent=65537, key_size=2048),
+}
+
+
+def write_key(directory: Path, algorithm: str):
+    key = KEY_FACTORIES[algorithm]()
+    pem = key.private_bytes(serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption())
+    (directory / "bench.pem").write_bytes(pem)
+
+
+def time_per_call(func, iterations: int) -> float:
+    started = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return (time.perf_counter() - started) / iterations * 1_000_000
+
+
+def bench(algorithm: str, iterations: int) -> dict:
+    from app.core import security
+    from app.core.config import settings
+
+    settings.ALGORITHM = algorithm
+    security._key_ring.cache_clear()
+    security._verified_tokens.clear()
+    token = security.create_access_token(1, "user")
+    key = security._verification_key(token)
+    raw = time_per_call(lambda: security.jwt.decode(token, key, algorithms=[algorithm]), iterations)
+
+    settings.TOKEN_CACHE_SIZE = 0
+    uncached = time_per_call(lambda: security.decode_token(token, "access"), iterations)
+    settings.TOKEN_CACHE_SIZE = 10000
+    cached = time_per_call(lambda: security.decode_token(token, "access"), iterations)
+    return {
+        "algorithm": algorithm,
+        "sign_us": round(time_per_call(lambda: security.create_access_token(1, "user"), max(iterations // 10, 1)), 1),
+        "jwt_decode_us": round(raw, 1),
+        "decode_token_us": round(uncached, 1),
+        "decode_token_cached_us": round(cached, 1),
+        "token_bytes": len(token),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare access token sign/verify cost per JWT algorithm")
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--algorithms", default="HS256,ES256,RS256")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        os.environ["JWT_KEYS_DIR"] = directory
+        os.environ["JWT_ACTIVE_KID"] = "bench"
+        for algorithm in [name.strip() for name in args.algorithms.split(",") if name.strip()]:
+            for path in Path(directory).glob("*.pem"):
+                path.unlink()
+            if algorithm in KEY_FACTORIES:
+                write_key(Path(directory), algorithm)
+            print(json.dumps(bench(algorithm, args.iterations)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+PROBE = """
+import json, time
+started = time.perf_counter()
+from app.main import app
+imported = time.perf_counter()
+from fastapi.testclient import TestClient
+with TestClient(app) as client:
+    started_up = time.perf_counter()
+    while client.get("/ready").status_code != 200:
+        time.sleep(0.01)
+    ready = time.perf_counter()
+print(json.dumps({
+    "import_ms": (imported - started) * 1000,
+    "startup_ms": (started_up - imported) * 1000,
+    "ready_ms": (ready - imported) * 1000,
+    "total_ms": (ready - started) * 1000,
+}))
+"""
+
+
+def run_probe(schema_mode: str) -> dict:
+    env = {**os.environ, "BOOT_SCHEMA_MODE": schema_mode}
+    result = subprocess.run([sys.executable, "-c", PROBE], env=env, capture_output=True, text=True, check=True)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def summarize(samples: list[dict]) -> dict:
+    summary = {}
+    for key in samples[0]:
+        values = sorted(sample[key] for sample in samples)
+        summary[key] = {
+            "median": round(statistics.median(values), 1),
+            "max": round(values[-1], 1),
+        }
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure cold start time of the API in fresh interpreters")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--modes", default="fingerprint,create_all")
+    args = parser.parse_args()
+
+    for mode in [mode.strip() for mode in args.modes.split(",") if mode.strip()]:
+        samples = [run_probe(mode) for _ in range(args.runs)]
+        print(json.dumps({"schema_mode": mode, "runs": args.runs, **summarize(samples)}))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+import fakeredis
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+from app.core import redis_cache
+from app.models.product_model import Product
+from app.services import product_service
+import app.models.user_model  # noqa: F401
+import app.models.order_model  # noqa: F401
+
+
+class FakeSession:
+
+    def __init__(self):
+        self.rollbacks = 0
+        self.closed = False
+
+    def rollback(self):
+        self.rollbacks += 1
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def fake_session():
+    return FakeSession()
+
+
+@pytest.fixture
+def fake_redis(monkeypatch):
+    server = fakeredis.FakeServer()
+    client = fakeredis.FakeRedis(server=server, decode_responses=True)
+    monkeypatch.setattr(redis_cache, "_redis_client", client)
+    monkeypatch.setattr(redis_cache, "_binary_client", fakeredis.FakeRedis(server=server))
+    monkeypatch.setattr(redis_cache.cache_breaker, "state", "closed")
+    redis_cache.cache_breaker._calls.clear()
+    redis_cache._flush_needed.clear()
+    return client
+
+
+@pytest.fixture
+def product_db(monkeypatch):
+    engine = create_engine("sqlite://", poolclass=StaticPool)
+    Product.__table__.create(engine)
+    monkeypatch.setattr(product_service.history_writer, "record", lambda changes: None)
+    with Session(engine) as db:
+        yield db
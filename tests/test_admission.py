@@ -0,0 +1,42 @@
+import asyncio
+import pytest
+from app.core.admission import AdmissionRejected, ConcurrencyLimiter, get_limiter
+
+
+def test_limiter_sheds_when_queue_full():
+    async def scenario():
+        limiter = ConcurrencyLimiter("test", max_concurrent=1, max_queue=1, queue_timeout=1)
+        release = asyncio.Event()
+
+        async def hold():
+            async with limiter.slot():
+                await release.wait()
+
+        holder = asyncio.create_task(hold())
+        waiter = asyncio.create_task(hold())
+        await asyncio.sleep(0)
+        with pytest.raises(AdmissionRejected):
+            async with limiter.slot():
+                pass
+        release.set()
+        await asyncio.gather(holder, waiter)
+
+    asyncio.run(scenario())
+
+
+def test_limiter_rejects_after_queue_timeout():
+    async def scenario():
+        limiter = ConcurrencyLimiter("test", max_concurrent=1, max_queue=5, queue_timeout=0.01)
+        async with limiter.slot():
+            with pytest.raises(AdmissionRejected):
+                async with limiter.slot():
+                    pass
+
+    asyncio.run(scenario())
+
+
+def test_route_groups():
+    assert get_limiter("POST", "/api/v1/users/login").name == "auth"
+    assert get_limiter("GET", "/api/v1/products/5").name == "catalogue"
+    assert get_limiter("POST", "/api/v1/orders/").name == "order_writes"
+    assert get_limiter("GET", "/api/v1/orders/me") is None
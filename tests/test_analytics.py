@@ -0,0 +1,77 @@
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from types import SimpleNamespace
+from sqlalchemy.dialects import postgresql
+from app.models.analytics_model import RollupGranularity
+from app.models.order_model import OrderStatus
+from app.repository.analytics_repo import AnalyticsRepository, truncate_bucket
+
+CREATED_AT = datetime(2026, 3, 14, 15, 9, 26, tzinfo=timezone.utc)
+
+
+class RecordingSession:
+
+    def __init__(self):
+        self.statements = []
+
+    def execute(self, statement):
+        self.statements.append(statement)
+
+
+def _order(product_id: int, quantity: int, unit_price: str, created_at=CREATED_AT):
+    return SimpleNamespace(product_id=product_id, quantity=quantity, unit_price=Decimal(unit_price), created_at=created_at)
+
+
+def _rows(statement) -> list[dict]:
+    compiled = statement.compile(dialect=postgresql.dialect())
+    params = compiled.params
+    columns = ("bucket", "product_id", "status", "order_count", "units", "revenue")
+    count = sum(1 for key in params if key.startswith("bucket_m"))
+    return [{column: params[f"{column}_m{index}"] for column in columns} for index in range(count)]
+
+
+def test_truncate_bucket_normalises_to_utc():
+    moment = datetime(2026, 3, 14, 1, 30, tzinfo=timezone(timedelta(hours=2)))
+
+    assert truncate_bucket(moment, RollupGranularity.hour) == datetime(2026, 3, 13, 23, tzinfo=timezone.utc)
+    assert truncate_bucket(moment, RollupGranularity.day) == datetime(2026, 3, 13, tzinfo=timezone.utc)
+    assert truncate_bucket(datetime(2026, 3, 14, 1, 30), RollupGranularity.hour) == datetime(2026, 3, 14, 1, tzinfo=timezone.utc)
+
+
+def test_apply_merges_changes_per_bucket():
+    db = RecordingSession()
+    later = CREATED_AT + timedelta(hours=2)
+
+    AnalyticsRepository(db).apply([
+        (_order(1, 2, "10.00"), OrderStatus.pending, 1),
+        (_order(1, 3, "10.00"), OrderStatus.pending, 1),
+        (_order(1, 1, "10.00", created_at=later), OrderStatus.pending, 1),
+    ])
+
+    hourly, daily = (_rows(statement) for statement in db.statements)
+    assert [(row["bucket"].hour, row["order_count"], row["units"], row["revenue"]) for row in hourly] == [
+        (15, 2, 5, Decimal("50.00")),
+        (17, 1, 1, Decimal("10.00")),
+    ]
+    assert [(row["order_count"], row["units"], row["revenue"]) for row in daily] == [(3, 6, Decimal("60.00"))]
+
+
+def test_status_change_moves_totals_between_statuses():
+    db = RecordingSession()
+    order = _order(1, 2, "5.00")
+
+    AnalyticsRepository(db).apply([(order, OrderStatus.pending, -1), (order, OrderStatus.cancelled, 1)])
+
+    daily = _rows(db.statements[1])
+    assert {row["status"]: (row["order_count"], row["units"], row["revenue"]) for row in daily} == {
+        OrderStatus.pending: (-1, -2, Decimal("-10.00")),
+        OrderStatus.cancelled: (1, 2, Decimal("10.00")),
+    }
+
+
+def test_apply_skips_orders_without_timestamp():
+    db = RecordingSession()
+
+    AnalyticsRepository(db).apply([(_order(1, 1, "1.00", created_at=None), OrderStatus.pending, 1)])
+
+    assert db.statements == []
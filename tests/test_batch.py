@@ -0,0 +1,102 @@
+import pytest
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+from app.core.batch import plan_waves, run_batch, validate_batch
+from app.core.config import settings
+from app.core.exceptions import InvalidBatchException
+from app.core.security import load_principal
+from app.main import app
+from app.models.user_model import User, UserRole
+from app.schemas.batch_schema import BatchRequest, BatchSubRequest
+
+
+def _subrequests(*specs):
+    return [BatchSubRequest(id=str(index), method=method, path=path) for index, (method, path) in enumerate(specs)]
+
+
+def _batch_app(db) -> FastAPI:
+    api = FastAPI()
+
+    @api.get("/api/v1/items/{item_id}")
+    async def get_item(item_id: int, request: Request):
+        return {
+            "id": item_id,
+            "shared_db": getattr(request.state, "batch_db", None) is db,
+            "principal": request.state.batch_principal,
+            "authorization": request.headers.get("authorization"),
+        }
+
+    @api.post("/api/v1/items")
+    async def create_item(request: Request):
+        return {"shared_db": request.state.batch_db is db, "body": await request.json()}
+
+    @api.delete("/api/v1/items/{item_id}")
+    async def delete_item(item_id: int):
+        raise HTTPException(status_code=404, detail="Item not found")
+
+    @api.post("/batch")
+    async def batch(batch: BatchRequest, request: Request):
+        return await run_batch(request, batch.requests, "principal", db)
+
+    return api
+
+
+def test_validate_batch_rejects_nested_and_oversized_batches(monkeypatch):
+    validate_batch(_subrequests(("GET", "/api/v1/products/?page=2")))
+    for path in ("/api/v1/batch", "/api/v1/events/stream", "/health"):
+        with pytest.raises(InvalidBatchException):
+            validate_batch(_subrequests(("GET", path)))
+
+    monkeypatch.setattr(settings, "BATCH_MAX_REQUESTS", 2)
+    with pytest.raises(InvalidBatchException):
+        validate_batch(_subrequests(*[("GET", "/api/v1/products/")] * 3))
+
+
+def test_consecutive_reads_share_a_wave_and_writes_run_alone():
+    requests = _subrequests(
+        ("GET", "/api/v1/a"), ("GET", "/api/v1/b"), ("POST", "/api/v1/c"),
+        ("GET", "/api/v1/d"), ("DELETE", "/api/v1/e"), ("POST", "/api/v1/f"),
+    )
+
+    assert plan_waves(requests) == [[0, 1], [2], [3], [4], [5]]
+
+
+def test_run_batch_dispatches_in_order_and_rolls_back_failed_writes(fake_session):
+    db = fake_session
+    client = TestClient(_batch_app(db))
+
+    response = client.post("/batch", headers={"Authorization": "Bearer token"}, json={"requests": [
+        {"id": "read", "path": "/api/v1/items/1?verbose=1"},
+        {"id": "read-2", "path": "/api/v1/items/2"},
+        {"id": "write", "method": "POST", "path": "/api/v1/items", "body": {"name": "Lamp"}},
+        {"id": "missing", "method": "DELETE", "path": "/api/v1/items/9"},
+    ]})
+
+    results = response.json()
+    assert [(result["id"], result["status"]) for result in results] == [("read", 200), ("read-2", 200), ("write", 200), ("missing", 404)]
+    assert results[0]["body"] == {"id": 1, "shared_db": False, "principal": "principal", "authorization": "Bearer token"}
+    assert results[2]["body"] == {"shared_db": True, "body": {"name": "Lamp"}}
+    assert results[3]["body"] == {"detail": "Item not found"}
+    assert db.rollbacks == 1
+
+
+def test_batch_endpoint_requires_a_token():
+    response = TestClient(app).post("/api/v1/batch", json={"requests": [{"path": "/api/v1/products/"}]})
+
+    assert response.status_code == 401
+
+
+def test_loading_the_principal_ends_the_parent_transaction():
+    engine = create_engine("sqlite://", poolclass=StaticPool)
+    User.__table__.create(engine)
+    with Session(engine) as db:
+        db.add(User(name="Ada", email="ada@example.com", hashed_password="x", role=UserRole.admin))
+        db.commit()
+
+        principal = load_principal(db, {"sub": 1})
+
+        assert not db.in_transaction()
+        assert (principal.id, principal.role) == (1, UserRole.admin)
@@ -0,0 +1,48 @@
+import pytest
+from fastapi.testclient import TestClient
+from app.core import boot
+from app.core.config import settings
+from app.main import app
+
+
+@pytest.fixture
+def steps(monkeypatch):
+    calls = []
+
+    def fail():
+        calls.append("db-pool")
+        raise ConnectionError("database unavailable")
+
+    monkeypatch.setattr(boot, "prewarm_pool", fail)
+    monkeypatch.setattr(boot, "warm_password_hashing", lambda: calls.append("password-hashing"))
+    monkeypatch.setattr(boot, "run_cache_warmup", lambda: calls.append("cache"))
+    boot.reset_ready()
+    yield calls
+    boot.reset_ready()
+
+
+def test_ready_only_after_warm_up(steps):
+    client = TestClient(app)
+    assert client.get("/ready").status_code == 503
+    assert client.get("/health").status_code == 200
+
+    boot.run_boot_warmup()
+
+    assert client.get("/ready").json() == {"status": "ready"}
+
+
+def test_failed_step_does_not_block_readiness(steps, monkeypatch):
+    monkeypatch.setattr(settings, "BOOT_WARM_CACHE", True)
+
+    boot.run_boot_warmup()
+
+    assert steps == ["db-pool", "password-hashing", "cache"]
+    assert boot.is_ready()
+
+
+def test_cache_warm_up_can_be_disabled(steps, monkeypatch):
+    monkeypatch.setattr(settings, "BOOT_WARM_CACHE", False)
+
+    boot.run_boot_warmup()
+
+    assert steps == ["db-pool", "password-hashing"]
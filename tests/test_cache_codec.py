@@ -0,0 +1,53 @@
+import json
+import pytest
+from app.core import redis_cache
+from app.core.config import settings
+from app.core.redis_cache import cache_get, cache_set, decode_value, encode_value
+
+PAGE = {"data": [{"id": index, "name": f"Product {index}", "price": "9.50"} for index in range(200)], "total": 200}
+
+
+@pytest.mark.parametrize("codec", ["json", "msgpack"])
+@pytest.mark.parametrize("compression", ["none", "zlib"])
+def test_encoded_values_round_trip(monkeypatch, codec, compression):
+    monkeypatch.setattr(settings, "CACHE_CODEC", codec)
+    monkeypatch.setattr(settings, "CACHE_COMPRESSION", compression)
+
+    data = encode_value(PAGE)
+
+    assert data[:3] == redis_cache.HEADER_MAGIC + bytes((redis_cache.CODECS[codec][0], redis_cache.COMPRESSORS[compression][0]))
+    assert decode_value(data) == PAGE
+
+
+def test_large_values_are_compressed_and_small_ones_are_not(monkeypatch):
+    monkeypatch.setattr(settings, "CACHE_CODEC", "msgpack")
+    monkeypatch.setattr(settings, "CACHE_COMPRESSION", "zlib")
+
+    large = encode_value(PAGE)
+    small = encode_value({"id": 1})
+
+    assert large[2] == redis_cache.COMPRESSORS["zlib"][0]
+    assert len(large) < len(json.dumps(PAGE)) / 4
+    assert small[2] == 0
+
+
+def test_legacy_json_values_still_decode(fake_redis):
+    redis_cache.get_binary_redis_client().set("products:1", json.dumps({"id": 1}))
+
+    assert cache_get("products:1") == {"id": 1}
+    assert redis_cache.get_cache_stats()["legacy_decodes"] >= 1
+
+
+def test_corrupt_value_is_a_miss(fake_redis):
+    redis_cache.get_binary_redis_client().set("products:1", redis_cache.HEADER_MAGIC + b"\x02\x01not zlib")
+    errors = redis_cache.get_cache_stats()["decode_errors"]
+
+    assert cache_get("products:1") is None
+    assert redis_cache.get_cache_stats()["decode_errors"] == errors + 1
+
+
+def test_cache_set_and_get_use_binary_client(fake_redis):
+    cache_set("products:list:1", PAGE, ttl=60)
+
+    assert redis_cache.get_binary_redis_client().get("products:list:1").startswith(redis_cache.HEADER_MAGIC)
+    assert cache_get("products:list:1") == PAGE
@@ -0,0 +1,121 @@
+import pytest
+import redis
+from app.core import redis_cache
+from app.core.config import settings
+from app.core.redis_cache import CacheUnavailable, CircuitBreaker, cache_breaker, cache_get, cache_invalidate, guarded
+
+
+def _breaker(**overrides) -> CircuitBreaker:
+    options = {
+        "window_seconds": 10,
+        "min_calls": 4,
+        "error_rate": 0.5,
+        "slow_call_ms": 100,
+        "slow_call_rate": 0.75,
+        "open_seconds": 5,
+    }
+    return CircuitBreaker("test", **{**options, **overrides})
+
+
+def _expire_open_state(breaker: CircuitBreaker):
+    breaker.opened_at -= breaker.open_seconds
+
+
+def test_breaker_waits_for_min_calls_before_opening():
+    breaker = _breaker()
+    for _ in range(3):
+        breaker.record(False, 0.001)
+
+    assert breaker.state == "closed"
+    breaker.record(True, 0.001)
+    assert breaker.state == "open"
+    assert not breaker.allow()
+    assert breaker.snapshot() == {"state": "open", "trips": 1, "rejected": 1}
+
+
+def test_slow_calls_open_the_breaker():
+    breaker = _breaker()
+    for _ in range(3):
+        breaker.record(True, 0.2)
+    breaker.record(True, 0.001)
+
+    assert breaker.state == "open"
+
+
+def test_half_open_allows_one_probe_and_closes_on_success():
+    breaker = _breaker(min_calls=1)
+    breaker.record(False, 0.001)
+    _expire_open_state(breaker)
+
+    assert breaker.allow()
+    assert breaker.state == "half_open"
+    assert not breaker.allow()
+    breaker.record(True, 0.001)
+    assert breaker.state == "closed"
+
+
+def test_failed_or_slow_probe_reopens():
+    breaker = _breaker(min_calls=1)
+    breaker.record(False, 0.001)
+    _expire_open_state(breaker)
+    breaker.allow()
+
+    breaker.record(True, 0.5)
+
+    assert breaker.state == "open"
+    assert breaker.trips == 2
+
+
+def test_open_breaker_skips_reads_and_invalidation(fake_redis, monkeypatch):
+    client = redis_cache.get_binary_redis_client()
+    client.set("products:single:1", b"stale")
+    monkeypatch.setattr(cache_breaker, "state", "open")
+    monkeypatch.setattr(cache_breaker, "opened_at", float("inf"))
+    monkeypatch.setattr(client, "unlink", lambda *keys: pytest.fail("Redis used while breaker is open"))
+
+    with pytest.raises(CacheUnavailable):
+        guarded(lambda client: client.get("products:single:1"))
+    assert cache_get("products:single:1") is None
+
+    cache_invalidate(keys=["products:single:1"])
+    assert client.get("products:single:1") == b"stale"
+
+
+def test_entries_left_stale_while_open_are_flushed_on_recovery(fake_redis, monkeypatch):
+    client = redis_cache.get_binary_redis_client()
+    client.set("products:single:1", b"stale")
+    client.set("products:list:1:10", b"stale")
+    client.set("orders:{user:4}:ready", b"1")
+    client.set("sessions:abc", b"kept")
+    monkeypatch.setattr(cache_breaker, "state", "open")
+    monkeypatch.setattr(cache_breaker, "opened_at", 0.0)
+    monkeypatch.setattr(cache_breaker, "open_seconds", float("inf"))
+    cache_invalidate(keys=["products:single:1"])
+    monkeypatch.setattr(cache_breaker, "open_seconds", 0)
+
+    assert cache_get("products:single:1") is None
+
+    assert cache_breaker.state == "closed"
+    assert client.keys("*") == [b"sessions:abc"]
+    client.set("products:single:1", b"fresh")
+    assert guarded(lambda client: client.get("products:single:1")) == b"fresh"
+
+
+def test_redis_errors_are_recorded_and_degrade_to_misses(fake_redis, monkeypatch):
+    def fail(key):
+        raise redis.ConnectionError("down")
+
+    monkeypatch.setattr(redis_cache.get_binary_redis_client(), "get", fail)
+
+    assert cache_get("products:single:1") is None
+    assert [ok for _, ok, _ in cache_breaker._calls] == [False]
+
+
+def test_cache_client_uses_bounded_blocking_pool(monkeypatch):
+    monkeypatch.setattr(redis_cache, "_binary_client", None)
+
+    pool = redis_cache.get_binary_redis_client().connection_pool
+
+    assert isinstance(pool, redis.BlockingConnectionPool)
+    assert pool.max_connections == settings.REDIS_CACHE_MAX_CONNECTIONS
+    assert pool.connection_kwargs["socket_timeout"] == settings.REDIS_CACHE_SOCKET_TIMEOUT_MS / 1000
@@ -0,0 +1,98 @@
+import gzip
+import json
+from decimal import Decimal
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse, Response, StreamingResponse
+from fastapi.testclient import TestClient
+from app.core import compression
+from app.core.compression import CompressionMiddleware, EncodedBody, negotiate, render_json
+from app.core.config import settings
+from app.models.product_model import Product
+from app.repository.product_repo import ProductRepository
+from app.services.product_service import ProductService
+
+ITEMS = {"items": [{"id": index, "name": f"Product {index}"} for index in range(100)]}
+
+
+@pytest.fixture
+def client():
+    api = FastAPI()
+
+    @api.get("/large")
+    async def large():
+        return ITEMS
+
+    @api.get("/small")
+    async def small():
+        return {"ok": True}
+
+    @api.get("/encoded")
+    async def encoded():
+        return Response(gzip.compress(render_json(ITEMS)), media_type="application/json", headers={"Content-Encoding": "gzip"})
+
+    @api.get("/stream")
+    async def stream():
+        return StreamingResponse(iter([b"data: x\n\n"] * 200), media_type="text/event-stream")
+
+    @api.get("/text")
+    async def text():
+        return PlainTextResponse("x" * 2000)
+
+    api.add_middleware(CompressionMiddleware, minimum_size=1024)
+    return TestClient(api)
+
+
+def test_negotiate_picks_highest_weighted_supported_encoding(monkeypatch):
+    monkeypatch.setattr(compression, "ENCODERS", {"br": bytes, "gzip": bytes})
+
+    assert negotiate("gzip, br") == "br"
+    assert negotiate("br;q=0.2, gzip") == "gzip"
+    assert negotiate("br;q=0, gzip;q=0") is None
+    assert negotiate("*;q=0.5, br;q=0") == "gzip"
+    assert negotiate("identity") is None
+    assert negotiate("br;q=bogus, gzip") == "gzip"
+    assert negotiate(None) is None
+
+
+def test_negotiate_respects_disabled_setting(monkeypatch):
+    monkeypatch.setattr(settings, "COMPRESSION_ENABLED", False)
+
+    assert negotiate("gzip") is None
+
+
+def test_large_json_is_compressed(client):
+    response = client.get("/large", headers={"Accept-Encoding": "gzip"})
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert int(response.headers["content-length"]) < len(render_json(ITEMS))
+    assert response.json() == ITEMS
+
+
+def test_small_or_unaccepted_responses_are_left_alone(client):
+    assert "content-encoding" not in client.get("/small", headers={"Accept-Encoding": "gzip"}).headers
+    assert "content-encoding" not in client.get("/large", headers={"Accept-Encoding": "identity"}).headers
+
+
+def test_encoded_and_streaming_responses_pass_through(client):
+    encoded = client.get("/encoded", headers={"Accept-Encoding": "gzip"})
+    stream = client.get("/stream", headers={"Accept-Encoding": "gzip"})
+
+    assert encoded.json() == ITEMS
+    assert "content-encoding" not in stream.headers
+    assert stream.text.count("data: x") == 200
+    assert client.get("/text", headers={"Accept-Encoding": "gzip"}).headers["content-encoding"] == "gzip"
+
+
+def test_cached_product_is_served_precompressed(fake_redis, product_db, monkeypatch):
+    monkeypatch.setattr(settings, "COMPRESSION_MIN_BYTES", 0)
+    product_db.add(Product(name="Lamp", description="Warm light", price=Decimal("9.50"), stock=3))
+    product_db.commit()
+    service = ProductService(ProductRepository(product_db))
+    service.get_product(1, "gzip")
+
+    cached = service.get_product(1, "gzip")
+
+    assert isinstance(cached, EncodedBody) and cached.encoding == "gzip"
+    assert json.loads(gzip.decompress(cached.content)) == service.get_product(1)
@@ -0,0 +1,54 @@
+import time
+import pytest
+from app.core import redis_cache
+from app.core.config import settings
+from app.core.deadline import remaining_seconds, reset_deadline, resolve_timeout, start_deadline
+from app.core.exceptions import DeadlineExceededException
+from app.core.rate_limit import RateLimiter
+from app.core.redis_cache import CacheUnavailable, guarded
+from app.core.session_store import create_session
+
+
+@pytest.fixture
+def expired_deadline():
+    _, token = start_deadline(0.001)
+    time.sleep(0.002)
+    yield
+    reset_deadline(token)
+
+
+def test_header_timeout_is_capped():
+    assert resolve_timeout("GET", "/api/v1/products/", str(settings.REQUEST_TIMEOUT_MAX_SECONDS * 10)) == settings.REQUEST_TIMEOUT_MAX_SECONDS
+    assert resolve_timeout("GET", "/api/v1/products/", "nonsense") == resolve_timeout("GET", "/api/v1/products/", None)
+
+
+def test_non_finite_timeout_header_is_ignored():
+    default = resolve_timeout("GET", "/api/v1/products/", None)
+
+    assert [resolve_timeout("GET", "/api/v1/products/", value) for value in ("nan", "inf", "-Infinity")] == [default] * 3
+
+
+def test_nested_deadline_never_extends_outer():
+    _, outer = start_deadline(1)
+    remaining, inner = start_deadline(60)
+    try:
+        assert remaining <= 1 and remaining_seconds() <= 1
+    finally:
+        reset_deadline(inner)
+        reset_deadline(outer)
+
+
+def test_redis_helpers_stop_after_deadline(fake_redis, expired_deadline):
+    with pytest.raises(DeadlineExceededException):
+        create_session(1, "user")
+    with pytest.raises(DeadlineExceededException):
+        RateLimiter("test", capacity=1, refill_per_second=1).check("ip:1")
+    with pytest.raises(CacheUnavailable):
+        guarded(lambda client: client.get("key"))
+    assert fake_redis.keys("*") == []
+
+
+def test_request_client_has_socket_timeout(monkeypatch):
+    monkeypatch.setattr(redis_cache, "_redis_client", None)
+    client = redis_cache.get_redis_client()
+    assert client.connection_pool.connection_kwargs["socket_timeout"] == settings.REDIS_SOCKET_TIMEOUT_MS / 1000
@@ -0,0 +1,76 @@
+import asyncio
+import json
+import time
+from types import SimpleNamespace
+import pytest
+from fastapi.testclient import TestClient
+from app.core import redis_cache
+from app.core.events import EventHub, event_hub, product_channel, publish_order_event, publish_stock_event, user_channel
+from app.core.exceptions import EventStreamLimitException
+from app.core.security import create_access_token
+from app.main import app
+from app.models.order_model import OrderStatus
+
+
+def test_hub_enforces_connection_limit_and_releases_once(fake_redis):
+    hub = EventHub(max_connections=1, queue_size=10)
+
+    async def scenario():
+        subscription = hub.subscribe({"events:user:1"})
+        with pytest.raises(EventStreamLimitException):
+            hub.subscribe({"events:user:2"})
+        hub.unsubscribe(subscription)
+        hub.unsubscribe(subscription)
+        assert hub._count == 0
+        hub.unsubscribe(hub.subscribe({"events:user:2"}))
+
+    try:
+        asyncio.run(scenario())
+    finally:
+        hub.stop()
+
+
+def test_stream_rejected_with_503_when_full(fake_redis, monkeypatch):
+    monkeypatch.setattr(event_hub, "max_connections", 0)
+    response = TestClient(app).get(
+        "/api/v1/events/stream", headers={"Authorization": f"Bearer {create_access_token(1, 'user')}"}
+    )
+    assert response.status_code == 503
+    assert event_hub._count == 0
+
+
+def test_published_events_reach_only_subscribed_channels(fake_redis):
+    hub = EventHub(max_connections=2, queue_size=10)
+    order = SimpleNamespace(id=7, user_id=1, product_id=3, quantity=2, status=OrderStatus.pending)
+
+    async def scenario():
+        own = hub.subscribe({user_channel(1), product_channel(3)})
+        other = hub.subscribe({user_channel(2)})
+        for _ in range(200):
+            if fake_redis.pubsub_numpat():
+                break
+            await asyncio.sleep(0.01)
+        publish_order_event(order, "order.created")
+        publish_stock_event(3, 5)
+        received = [json.loads(await asyncio.wait_for(own.queue.get(), 2)) for _ in range(2)]
+        await asyncio.sleep(0.1)
+        return received, other.queue.empty()
+
+    try:
+        received, other_empty = asyncio.run(scenario())
+    finally:
+        hub.stop()
+    assert [event["type"] for event in received] == ["order.created", "product.stock"]
+    assert received[0]["order_id"] == 7 and received[1]["stock"] == 5
+    assert other_empty
+
+
+def test_publish_skips_redis_while_breaker_is_open(fake_redis, monkeypatch):
+    monkeypatch.setattr(redis_cache.cache_breaker, "state", "open")
+    monkeypatch.setattr(redis_cache.cache_breaker, "opened_at", time.monotonic())
+    monkeypatch.setattr(redis_cache, "get_binary_redis_client", lambda: pytest.fail("Redis used while breaker is open"))
+    rejected = redis_cache.cache_breaker.rejected
+
+    publish_stock_event(3, 5)
+
+    assert redis_cache.cache_breaker.rejected == rejected + 1
@@ -0,0 +1,50 @@
+from decimal import Decimal
+from types import SimpleNamespace
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session
+from app.core.exceptions import InvalidFieldsException
+from app.models.product_model import Product
+from app.repository.product_repo import ProductRepository
+from app.schemas.fieldsets import parse_expand, parse_fields, project
+from app.schemas.order_schema import OrderResponse
+from app.schemas.product_schema import ProductFilter, ProductResponse
+import app.models.user_model  # noqa: F401
+
+
+def test_parse_fields_keeps_schema_order_and_adds_id():
+    assert parse_fields(None, OrderResponse) is None
+    assert parse_fields(" status, quantity ,", OrderResponse) == ("id", "quantity", "status")
+
+
+def test_parse_fields_rejects_unknown_names():
+    with pytest.raises(InvalidFieldsException, match="Unknown fields: password, secret"):
+        parse_fields("id,secret,password", OrderResponse)
+
+
+def test_parse_expand_accepts_only_allowed_relations():
+    assert parse_expand("user,product", ("product", "user")) == ("product", "user")
+    with pytest.raises(InvalidFieldsException, match="Unknown expand: orders"):
+        parse_expand("orders", ("product", "user"))
+
+
+def test_project_validates_only_selected_fields():
+    row = SimpleNamespace(id=1, name="Lamp")
+
+    projected = project([row], ProductResponse, ("id", "name"))
+
+    assert [item.model_dump() for item in projected] == [{"id": 1, "name": "Lamp"}]
+
+
+def test_product_projection_selects_only_requested_columns():
+    engine = create_engine("sqlite://")
+    Product.__table__.create(engine)
+    with Session(engine) as db:
+        db.add(Product(name="Lamp", description="x" * 1000, price=Decimal("9.50"), stock=3))
+        db.commit()
+        statements = []
+        event.listen(engine, "before_cursor_execute", lambda conn, cursor, sql, *args: statements.append(sql))
+        rows = ProductRepository(db).get_all(0, 10, ProductFilter(), ("id", "name"))
+
+    assert [tuple(row) for row in rows] == [(1, "Lamp")]
+    assert "description" not in statements[0]
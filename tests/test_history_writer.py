@@ -0,0 +1,87 @@
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from types import SimpleNamespace
+import pytest
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from app.models.product_history_model import ProductChangeReason, ProductHistory
+from app.models.product_model import Product
+from app.repository.product_repo import ProductRepository
+from app.services import history_writer as history_module
+from app.services.history_writer import HistoryWriter, stock_changes
+from app.services.product_service import ProductService
+
+
+@pytest.fixture
+def history_sessions(monkeypatch):
+    engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+    ProductHistory.__table__.create(engine)
+    sessions = sessionmaker(bind=engine)
+    monkeypatch.setattr(history_module, "create_session", sessions)
+    return sessions
+
+
+def _row(product_id: int, stock: int) -> dict:
+    return {"product_id": product_id, "reason": ProductChangeReason.updated, "price": None, "stock": stock, "stock_delta": None, "order_id": None}
+
+
+def test_rows_are_written_in_bulk_and_drained_on_stop(history_sessions):
+    writer = HistoryWriter(buffer_size=100, flush_size=50, flush_interval_seconds=0.2, enqueue_timeout_seconds=0.1)
+
+    writer.record([_row(1, stock) for stock in range(10)])
+    writer.stop()
+
+    with history_sessions() as db:
+        assert db.execute(select(func.count()).select_from(ProductHistory)).scalar_one() == 10
+    stats = writer.stats()
+    assert (stats["written"], stats["dropped"], stats["failed"], stats["pending"]) == (10, 0, 0, 0)
+    assert stats["flushes"] < 10
+
+
+def test_full_buffer_drops_rows_instead_of_blocking(monkeypatch):
+    writer = HistoryWriter(buffer_size=2, flush_size=50, flush_interval_seconds=5, enqueue_timeout_seconds=0)
+    monkeypatch.setattr(writer, "_ensure_started", lambda: None)
+
+    writer.record([_row(1, stock) for stock in range(5)])
+
+    assert writer.stats()["dropped"] == 3
+    assert writer.stats()["pending"] == 2
+
+
+def test_failed_flush_is_counted(monkeypatch):
+    engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+    monkeypatch.setattr(history_module, "create_session", sessionmaker(bind=engine))
+    writer = HistoryWriter(buffer_size=10, flush_size=10, flush_interval_seconds=0.01, enqueue_timeout_seconds=0.1)
+
+    writer.record([_row(1, 1), _row(1, 2)])
+    writer.stop()
+
+    assert writer.stats()["failed"] == 2
+
+
+def test_stock_changes_replay_stock_levels_per_order():
+    orders = [SimpleNamespace(id=order_id, product_id=5, quantity=quantity) for order_id, quantity in ((1, 2), (2, 3))]
+
+    changes = stock_changes(orders, {5: 5}, -1, ProductChangeReason.ordered)
+
+    assert [(change["order_id"], change["stock"], change["stock_delta"]) for change in changes] == [(1, 8, -2), (2, 5, -3)]
+
+
+def test_history_is_paged_newest_first_with_a_cursor(product_db):
+    ProductHistory.__table__.create(product_db.get_bind())
+    product_db.add(Product(name="Lamp", price=Decimal("9.50"), stock=3))
+    started = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    product_db.add_all(
+        ProductHistory(product_id=1, reason=ProductChangeReason.updated, stock=stock, changed_at=started + timedelta(minutes=stock))
+        for stock in range(5)
+    )
+    product_db.commit()
+    service = ProductService(ProductRepository(product_db))
+
+    first = service.get_history(1, 2, None)
+    second = service.get_history(1, 2, first["next_cursor"])
+    last = service.get_history(1, 2, second["next_cursor"])
+
+    assert [row.stock for row in first["data"] + second["data"] + last["data"]] == [4, 3, 2, 1, 0]
+    assert last["next_cursor"] is None
@@ -0,0 +1,50 @@
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from sqlalchemy import create_engine
+from app.core.config import settings
+from app.db.partitions import _month_start, ensure_order_partitions
+from app.jobs import order_archival
+
+
+class FakeOrderRepository:
+
+    batches: list[list] = []
+
+    def __init__(self, db):
+        self.db = db
+
+    def archive_terminal_orders(self, cutoff, limit):
+        return self.batches.pop(0) if self.batches else []
+
+    def prune_intake_receipts(self, cutoff):
+        return 0
+
+
+def _moved(*user_ids):
+    return [SimpleNamespace(user_id=user_id) for user_id in user_ids]
+
+
+def test_month_start_rolls_over_years():
+    assert _month_start(2026, 13) == datetime(2027, 1, 1, tzinfo=timezone.utc)
+    assert _month_start(2026, 0) == datetime(2025, 12, 1, tzinfo=timezone.utc)
+
+
+def test_partition_maintenance_skips_other_dialects():
+    ensure_order_partitions(create_engine("sqlite://"))
+
+
+def test_archival_moves_batches_until_short_and_drops_read_models(monkeypatch, fake_session):
+    monkeypatch.setattr(settings, "ORDER_ARCHIVE_BATCH_SIZE", 2)
+    db = fake_session
+    invalidated = []
+    FakeOrderRepository.batches = [_moved(1, 2), _moved(2, 3), _moved(4), _moved(5)]
+    monkeypatch.setattr(order_archival, "get_engine", lambda: create_engine("sqlite://"))
+    monkeypatch.setattr(order_archival, "create_session", lambda: db)
+    monkeypatch.setattr(order_archival, "OrderRepository", FakeOrderRepository)
+    monkeypatch.setattr(order_archival, "invalidate_users", invalidated.append)
+
+    assert order_archival.run_order_archival() == 5
+
+    assert invalidated == [{1, 2}, {2, 3}, {4}]
+    assert FakeOrderRepository.batches == [_moved(5)]
+    assert db.closed and db.rollbacks == 0
@@ -0,0 +1,180 @@
+import threading
+import time
+from types import SimpleNamespace
+import pytest
+from sqlalchemy.exc import IntegrityError
+from fastapi import BackgroundTasks
+from app.api.v1 import orders as orders_api
+from app.core.deadline import reset_deadline, start_deadline
+from app.core.exceptions import (
+    InsufficientStockException,
+    OrderBatchTimeoutException,
+    OrderOutcomeUnknownException,
+    ProductNotFoundException,
+)
+from app.models.order_model import OrderStatus
+from app.schemas.order_schema import OrderCreate
+from app.services import order_batcher as batcher_module
+from app.services.order_batcher import OrderBatcher
+from app.services.order_service import OrderService
+
+
+class FakeOrderService:
+    delay = 0.0
+    batch_error: Exception | None = None
+    applied: list = []
+
+    def __init__(self, repository, analytics):
+        pass
+
+
+    def create_orders_batch(self, requests):
+        time.sleep(self.delay)
+        if self.batch_error is not None:
+            raise self.batch_error
+        self.applied.extend(requests)
+        return [SimpleNamespace(id=index, request=request) for index, request in enumerate(requests)]
+
+
+    def create_order(self, user_id, product_id, quantity):
+        if product_id == 2:
+            raise IntegrityError("INSERT INTO orders", {}, Exception("violates foreign key constraint"))
+        self.applied.append((user_id, product_id, quantity))
+        return SimpleNamespace(id=product_id, request=(user_id, product_id, quantity))
+
+
+@pytest.fixture
+def service(monkeypatch, fake_session):
+    monkeypatch.setattr(batcher_module, "create_session", lambda: fake_session)
+    monkeypatch.setattr(batcher_module, "OrderService", FakeOrderService)
+    monkeypatch.setattr(FakeOrderService, "delay", 0.0)
+    monkeypatch.setattr(FakeOrderService, "batch_error", None)
+    monkeypatch.setattr(FakeOrderService, "applied", [])
+    return FakeOrderService
+
+
+def run_batch(batcher: OrderBatcher, requests: list) -> list:
+    results: list = [None] * len(requests)
+
+    def submit(index, request):
+        try:
+            results[index] = batcher.submit(*request)
+        except Exception as e:
+            results[index] = e
+
+    threads = [threading.Thread(target=submit, args=(index, request)) for index, request in enumerate(requests)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def test_failing_order_does_not_fail_its_batch(service):
+    service.batch_error = IntegrityError("INSERT INTO orders", {}, Exception("violates foreign key constraint"))
+    batcher = OrderBatcher(window_seconds=0.05, max_size=10, timeout_seconds=5)
+    try:
+        results = run_batch(batcher, [(1, 1, 1), (1, 2, 1), (1, 3, 1)])
+    finally:
+        batcher.stop()
+    assert results[0].request == (1, 1, 1)
+    assert isinstance(results[1], IntegrityError)
+    assert results[2].request == (1, 3, 1)
+    assert sorted(service.applied) == [(1, 1, 1), (1, 3, 1)]
+
+
+def test_timed_out_order_is_never_applied(service, monkeypatch):
+    batcher = OrderBatcher(window_seconds=0, max_size=10, timeout_seconds=0.05)
+    monkeypatch.setattr(batcher, "_ensure_started", lambda: None)
+    with pytest.raises(OrderBatchTimeoutException):
+        batcher.submit(1, 1, 1)
+    batcher._apply(batcher._collect())
+    assert service.applied == []
+
+
+def test_started_batch_is_waited_for(service):
+    service.delay = 0.1
+    batcher = OrderBatcher(window_seconds=0, max_size=10, timeout_seconds=0.08)
+    try:
+        assert batcher.submit(1, 1, 1).request == (1, 1, 1)
+    finally:
+        batcher.stop()
+
+
+def test_stuck_batch_reports_unknown_outcome(service):
+    service.delay = 0.3
+    batcher = OrderBatcher(window_seconds=0, max_size=10, timeout_seconds=0.05)
+    try:
+        with pytest.raises(OrderOutcomeUnknownException):
+            batcher.submit(1, 1, 1)
+    finally:
+        batcher.stop()
+
+
+def test_wait_is_bounded_by_request_deadline(service, monkeypatch):
+    batcher = OrderBatcher(window_seconds=0, max_size=10, timeout_seconds=10)
+    monkeypatch.setattr(batcher, "_ensure_started", lambda: None)
+    _, token = start_deadline(0.05)
+    started = time.monotonic()
+    try:
+        with pytest.raises(OrderBatchTimeoutException):
+            batcher.submit(1, 1, 1)
+    finally:
+        reset_deadline(token)
+    assert time.monotonic() - started < 1
+
+
+def test_batched_create_releases_request_session_before_waiting(monkeypatch):
+    events = []
+    db = SimpleNamespace(rollback=lambda: events.append("rollback"))
+
+    def submit(user_id, product_id, quantity):
+        events.append(("submit", user_id, product_id, quantity))
+        return SimpleNamespace(id=7)
+
+    monkeypatch.setattr(orders_api.settings, "ORDER_INTAKE_MODE", "batched")
+    monkeypatch.setattr(orders_api.order_batcher, "submit", submit)
+    result = orders_api.create_order(OrderCreate(product_id=3, quantity=2), BackgroundTasks(), None, SimpleNamespace(id=5), db)
+    assert result.id == 7
+    assert events == ["rollback", ("submit", 5, 3, 2)]
+
+
+class FakeOrderRepository:
+
+    def __init__(self, stock: dict[int, int]):
+        self.products = {product_id: SimpleNamespace(price=10.0, stock=level) for product_id, level in stock.items()}
+        self.committed = False
+
+
+    def get_products_for_update(self, product_ids):
+        return {product_id: self.products[product_id] for product_id in product_ids if product_id in self.products}
+
+
+    def create_orders(self, rows):
+        return [SimpleNamespace(id=index + 1, **row) for index, row in enumerate(rows)]
+
+
+    def adjust_stock(self, deltas, lock=True):
+        for product_id, delta in deltas.items():
+            self.products[product_id].stock += delta
+        return {product_id: self.products[product_id].stock for product_id in deltas}
+
+
+    def commit(self):
+        self.committed = True
+
+
+    def rollback(self):
+        pass
+
+
+def test_batch_accepts_orders_in_arrival_order(fake_redis, monkeypatch):
+    monkeypatch.setattr("app.services.order_service.settings.PRODUCT_HISTORY_ENABLED", False)
+    repository = FakeOrderRepository({1: 3})
+    service = OrderService(repository, SimpleNamespace(apply=lambda changes: None))
+    results = service.create_orders_batch([(1, 1, 2), (2, 1, 2), (3, 1, 1), (4, 9, 1)])
+    assert results[0].user_id == 1
+    assert isinstance(results[1], InsufficientStockException)
+    assert results[2].user_id == 3 and results[2].status == OrderStatus.pending
+    assert isinstance(results[3], ProductNotFoundException)
+    assert repository.products[1].stock == 0 and repository.committed
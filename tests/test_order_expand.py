@@ -0,0 +1,80 @@
+from datetime import datetime, timezone
+from decimal import Decimal
+from types import SimpleNamespace
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+from app.models.order_model import OrderStatus
+from app.repository.order_repo import OrderRepository
+from app.services.order_service import OrderService
+import app.models.user_model  # noqa: F401
+
+PRODUCT = SimpleNamespace(id=5, name="Lamp", description=None, price=Decimal("9.50"), stock=3)
+USER = SimpleNamespace(id=2, name="Ada", email="ada@example.com")
+
+
+def _order(order_id: int, **relations):
+    return SimpleNamespace(
+        id=order_id,
+        user_id=2,
+        product_id=5,
+        quantity=1,
+        status=OrderStatus.pending,
+        unit_price=Decimal("9.50"),
+        created_at=datetime(2026, 1, 1, tzinfo=timezone.utc),
+        reserved_until=None,
+        **relations,
+    )
+
+
+class FakeOrderRepository:
+
+    def __init__(self):
+        self.related_calls = []
+
+    def get_all(self, skip, limit, fields=None, expand=()):
+        return [_order(1, product=PRODUCT, user=USER), _order(2, product=PRODUCT, user=USER)]
+
+    def count_all(self):
+        return 2
+
+    def get_history(self, user_id, skip, limit, fields=None, expand=()):
+        return [_order(1), _order(2)]
+
+    def count_history(self, user_id):
+        return 2
+
+    def get_related(self, rows, expand):
+        self.related_calls.append((len(rows), expand))
+        return {"product": {5: PRODUCT}, "user": {2: USER}}
+
+
+def test_expand_embeds_loaded_relations():
+    service = OrderService(FakeOrderRepository(), None)
+
+    page = service.get_all_orders(1, 10, expand="user")
+
+    assert [order.user.email for order in page.data] == ["ada@example.com", "ada@example.com"]
+    assert all(order.product is None for order in page.data)
+
+
+def test_history_expand_fetches_related_rows_once_per_page():
+    repository = FakeOrderRepository()
+    service = OrderService(repository, None)
+
+    page = service.get_all_orders(1, 10, include_history=True, fields="status", expand="product,user")
+
+    assert repository.related_calls == [(2, ("product", "user"))]
+    assert page["data"][0] == {
+        "id": 1,
+        "status": "pending",
+        "product": {"id": 5, "name": "Lamp", "description": None, "price": "9.50", "stock": 3},
+        "user": {"id": 2, "name": "Ada", "email": "ada@example.com"},
+    }
+
+
+def test_expand_query_loads_relation_keys_with_selected_fields():
+    query = OrderRepository(Session(create_engine("sqlite://")))._query(("id", "status"), ("product",))
+    sql = str(query)
+
+    assert "orders.product_id" in sql and "orders.status" in sql
+    assert "orders.quantity" not in sql and "products." not in sql
@@ -0,0 +1,124 @@
+from types import SimpleNamespace
+import pytest
+import redis
+from sqlalchemy.exc import IntegrityError
+from app.core.config import settings
+from app.jobs import order_intake_worker as worker
+from app.services import order_intake
+from app.services.order_intake import get_ticket, process_intake, submit_order, ticket_key
+
+
+class FakeDatabase:
+
+    def __init__(self):
+        self.orders: list[tuple] = []
+        self.receipts: dict[str, int] = {}
+        self.hide_receipts_once = False
+
+
+    def repository(self, db):
+        database = self
+
+        class Repository:
+
+            def get_intake_receipt(self, ticket_id):
+                if database.hide_receipts_once:
+                    database.hide_receipts_once = False
+                    return None
+                return database.receipts.get(ticket_id)
+
+        return Repository()
+
+
+    def service(self, repository, analytics):
+        database = self
+
+        class Service:
+
+            def create_order(self, user_id, product_id, quantity, ticket_id=None):
+                if ticket_id in database.receipts:
+                    raise IntegrityError("INSERT INTO order_intake_receipts", {}, Exception("duplicate key"))
+                database.orders.append((user_id, product_id, quantity))
+                order_id = len(database.orders)
+                database.receipts[ticket_id] = order_id
+                return SimpleNamespace(id=order_id)
+
+        return Service()
+
+
+@pytest.fixture
+def database(fake_redis, fake_session, monkeypatch):
+    database = FakeDatabase()
+    monkeypatch.setattr(order_intake, "create_session", lambda: fake_session)
+    monkeypatch.setattr(order_intake, "OrderRepository", database.repository)
+    monkeypatch.setattr(order_intake, "OrderService", database.service)
+    monkeypatch.setattr(order_intake, "AnalyticsRepository", lambda db: None)
+    monkeypatch.setattr(settings, "ORDER_INTAKE_BACKEND", "redis")
+    worker.ensure_group(fake_redis)
+    return database
+
+
+def read_entry(client):
+    response = client.xreadgroup(settings.ORDER_INTAKE_GROUP, "test", {settings.ORDER_INTAKE_STREAM: ">"}, count=1)
+    return response[0][1][0]
+
+
+def pending(client) -> int:
+    return client.xpending(settings.ORDER_INTAKE_STREAM, settings.ORDER_INTAKE_GROUP)["pending"]
+
+
+def test_redelivered_entry_does_not_create_second_order(fake_redis, database):
+    ticket = submit_order(1, 2, 3)
+    entry_id, fields = read_entry(fake_redis)
+    worker.handle_entry(fake_redis, entry_id, fields)
+    fake_redis.hset(ticket_key(ticket["ticket_id"]), "status", "processing")
+    worker.handle_entry(fake_redis, entry_id, fields)
+    assert database.orders == [(1, 2, 3)]
+    assert get_ticket(ticket["ticket_id"])["order_id"] == 1
+
+
+def test_redis_failure_after_commit_is_not_retried_as_new_order(fake_redis, database, monkeypatch):
+    ticket = submit_order(1, 2, 3)
+    entry_id, fields = read_entry(fake_redis)
+    complete = worker._complete
+
+    def failing_complete(*args):
+        monkeypatch.setattr(worker, "_complete", complete)
+        raise redis.ConnectionError("connection lost")
+
+    monkeypatch.setattr(worker, "_complete", failing_complete)
+    with pytest.raises(redis.ConnectionError):
+        worker.handle_entry(fake_redis, entry_id, fields)
+    assert pending(fake_redis) == 1
+
+    worker.handle_entry(fake_redis, entry_id, fields)
+    assert database.orders == [(1, 2, 3)]
+    assert get_ticket(ticket["ticket_id"])["status"] == "completed"
+    assert pending(fake_redis) == 0
+
+
+def test_committed_order_is_not_dead_lettered_after_max_attempts(fake_redis, database):
+    ticket = submit_order(1, 2, 3)
+    entry_id, fields = read_entry(fake_redis)
+    process_intake(ticket["ticket_id"], 1, 2, 3)
+    fake_redis.hset(ticket_key(ticket["ticket_id"]), "attempts", settings.ORDER_INTAKE_MAX_ATTEMPTS)
+    worker.handle_entry(fake_redis, entry_id, fields)
+    assert get_ticket(ticket["ticket_id"])["status"] == "completed"
+    assert fake_redis.xlen(settings.ORDER_INTAKE_DEAD_LETTER_STREAM) == 0
+    assert database.orders == [(1, 2, 3)]
+
+
+def test_concurrent_duplicate_returns_existing_order(database):
+    process_intake("t1", 1, 2, 3)
+    database.hide_receipts_once = True
+    assert process_intake("t1", 1, 2, 3) == {"status": "completed", "order_id": 1, "detail": ""}
+    assert database.orders == [(1, 2, 3)]
+
+
+def test_ticket_updates_keep_a_ttl(fake_redis, database):
+    ticket = submit_order(1, 2, 3)
+    key = ticket_key(ticket["ticket_id"])
+    entry_id, fields = read_entry(fake_redis)
+    fake_redis.delete(key)
+    worker.handle_entry(fake_redis, entry_id, fields)
+    assert 0 < fake_redis.ttl(key) <= settings.ORDER_TICKET_TTL_SECONDS
@@ -0,0 +1,80 @@
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from app.core import order_read_model
+from app.core.config import settings
+from app.core.order_read_model import get_user_orders_page, get_version, invalidate_users, record_orders, store_user_orders
+from app.models.order_model import OrderStatus
+from app.services.order_service import OrderService
+
+
+def make_order(order_id: int, user_id: int = 1, minutes_ago: int = 0):
+    return SimpleNamespace(
+        id=order_id,
+        user_id=user_id,
+        product_id=7,
+        quantity=1,
+        status=OrderStatus.pending,
+        unit_price=None,
+        created_at=datetime.now(timezone.utc) - timedelta(minutes=minutes_ago),
+        reserved_until=None,
+    )
+
+
+def test_rebuild_is_served_newest_first(fake_redis):
+    assert store_user_orders(1, get_version(1), [make_order(1, minutes_ago=5), make_order(2)])
+    data, total = get_user_orders_page(1, 0, 10)
+    assert total == 2 and [order["id"] for order in data] == [2, 1]
+
+
+def test_rebuild_skipped_when_version_moved_before_store(fake_redis):
+    version = get_version(1)
+    invalidate_users({1})
+    assert not store_user_orders(1, version, [make_order(1)])
+    assert get_user_orders_page(1, 0, 10) is None
+
+
+def test_rebuild_aborted_when_version_moves_during_transaction(fake_redis, monkeypatch):
+    payload = order_read_model._payload
+
+    def payload_with_concurrent_write(order):
+        fake_redis.incr("orders:{user:1}:version")
+        return payload(order)
+
+    version = get_version(1)
+    monkeypatch.setattr(order_read_model, "_payload", payload_with_concurrent_write)
+    assert not store_user_orders(1, version, [make_order(1)])
+    assert get_user_orders_page(1, 0, 10) is None
+
+
+def test_order_recorded_after_rebuild_is_visible(fake_redis):
+    store_user_orders(1, get_version(1), [make_order(1, minutes_ago=5)])
+    record_orders([make_order(2)])
+    data, total = get_user_orders_page(1, 0, 10)
+    assert total == 2 and data[0]["id"] == 2
+
+
+class FakeRepository:
+
+    def __init__(self, orders: list, replica: bool):
+        self.orders = orders
+        self.replica = replica
+
+
+    def reads_from_replica(self) -> bool:
+        return self.replica
+
+
+    def get_recent_by_user(self, user_id: int, limit: int) -> list:
+        return self.orders[:limit]
+
+
+def ready_ttl(client, user_id: int) -> int:
+    return client.ttl(f"orders:{{user:{user_id}}}:ready")
+
+
+def test_replica_rebuild_is_kept_briefly(fake_redis):
+    OrderService(FakeRepository([make_order(1)], replica=True), None).get_my_orders(1, 1, 10)
+    assert 0 < ready_ttl(fake_redis, 1) <= settings.ORDER_READ_MODEL_REPLICA_TTL_SECONDS
+
+    OrderService(FakeRepository([make_order(2, user_id=2)], replica=False), None).get_my_orders(2, 1, 10)
+    assert ready_ttl(fake_redis, 2) > settings.ORDER_READ_MODEL_REPLICA_TTL_SECONDS
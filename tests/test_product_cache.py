@@ -0,0 +1,58 @@
+from decimal import Decimal
+import pytest
+from app.core import redis_cache
+from app.core.exceptions import ProductNotFoundException
+from app.models.product_model import Product
+from app.repository.product_repo import ProductRepository
+from app.schemas.product_schema import ProductCreate
+from app.services.product_service import MISSING_MARKER, ProductService
+
+
+class CountingRepository(ProductRepository):
+
+    def __init__(self, db):
+        super().__init__(db)
+        self.lookups = 0
+
+    def get_by_id(self, product_id, include_deleted=False):
+        self.lookups += 1
+        return super().get_by_id(product_id, include_deleted)
+
+
+def _add_products(db, count: int):
+    db.add_all(Product(name=f"Product {index}", price=Decimal("9.50"), stock=index) for index in range(1, count + 1))
+    db.commit()
+
+
+def test_missing_product_is_cached_briefly(fake_redis, product_db):
+    repository = CountingRepository(product_db)
+    service = ProductService(repository)
+
+    for _ in range(3):
+        with pytest.raises(ProductNotFoundException):
+            service.get_product(42)
+
+    assert repository.lookups == 1
+    assert redis_cache.cache_get("products:single:42") == MISSING_MARKER
+    assert 0 < redis_cache.get_binary_redis_client().ttl("products:single:42") <= 30
+
+
+def test_creating_product_clears_negative_entry(fake_redis, product_db):
+    service = ProductService(ProductRepository(product_db))
+    with pytest.raises(ProductNotFoundException):
+        service.get_product(1)
+
+    service.create_product(ProductCreate(name="Lamp", price=Decimal("9.50"), stock=3))
+
+    assert service.get_product(1).name == "Lamp"
+
+
+def test_warm_cache_loads_products_and_list_pages(fake_redis, product_db):
+    _add_products(product_db, 25)
+
+    ProductService(ProductRepository(product_db)).warm_cache([1, 2, 999], pages=5, limit=10)
+
+    client = redis_cache.get_binary_redis_client()
+    assert sorted(key.decode() for key in client.keys("products:single:*")) == ["products:single:1", "products:single:2"]
+    assert len(client.keys("products:list:*:all:*")) == 3
+    assert redis_cache.cache_get("products:single:2")["name"] == "Product 2"
@@ -0,0 +1,57 @@
+from decimal import Decimal
+import pytest
+from app.core.exceptions import InvalidFieldsException
+from app.models.product_model import Product
+from app.repository.product_repo import ProductRepository
+from app.schemas.product_schema import ProductFilter
+from app.services.product_service import ProductService
+
+
+@pytest.fixture
+def repository(product_db):
+    product_db.add_all([
+        Product(name="Desk", price=Decimal("120.00"), stock=2),
+        Product(name="Lamp", price=Decimal("25.00"), stock=0),
+        Product(name="Chair", price=Decimal("60.00"), stock=5),
+        Product(name="Bin", price=Decimal("25.00"), stock=1),
+        Product(name="Shelf", price=Decimal("80.00"), stock=4, is_deleted=True),
+    ])
+    product_db.commit()
+    return ProductRepository(product_db)
+
+
+def _names(repository, **filters) -> list[str]:
+    return [product.name for product in repository.get_all(0, 10, ProductFilter(**filters))]
+
+
+def test_default_sort_is_newest_first(repository):
+    assert _names(repository) == ["Bin", "Chair", "Lamp", "Desk"]
+
+
+def test_price_sorts_break_ties_by_id(repository):
+    assert _names(repository, sort="price") == ["Lamp", "Bin", "Chair", "Desk"]
+    assert _names(repository, sort="-price") == ["Desk", "Chair", "Bin", "Lamp"]
+    assert _names(repository, sort="name") == ["Bin", "Chair", "Desk", "Lamp"]
+
+
+def test_price_range_and_stock_filters(repository):
+    filters = {"min_price": Decimal("25"), "max_price": Decimal("60"), "in_stock": True, "sort": "price"}
+
+    assert _names(repository, **filters) == ["Bin", "Chair"]
+    assert repository.count_all(ProductFilter(**filters)) == 2
+    assert repository.count_all(ProductFilter()) == 4
+
+
+def test_inverted_price_range_is_rejected(repository):
+    with pytest.raises(InvalidFieldsException):
+        ProductService(repository).get_all_products(1, 10, ProductFilter(min_price=Decimal("50"), max_price=Decimal("10")))
+
+
+def test_list_cache_key_includes_filters(repository):
+    service = ProductService(repository)
+
+    plain = service._list_cache_key(1, 10, ProductFilter(), None)
+    filtered = service._list_cache_key(1, 10, ProductFilter(min_price=Decimal("25.0"), in_stock=True, sort="price"), None)
+
+    assert plain == "products:list:1:10:none:all:any:any:any:-id"
+    assert filtered == "products:list:1:10:none:all:25:any:in_stock:price"
@@ -0,0 +1,89 @@
+import inspect
+import time
+from fastapi import APIRouter, Depends, FastAPI
+from fastapi.responses import JSONResponse
+from fastapi.testclient import TestClient
+from starlette.requests import Request
+from app.core import profiler
+from app.core.config import settings
+from app.core.profiler import ProfiledRoute, should_profile
+from app.main import app
+
+
+def make_request(headers: dict[str, str]) -> Request:
+    raw = [(name.lower().encode(), value.encode()) for name, value in headers.items()]
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": raw})
+
+
+def wrap_depth(func) -> int:
+    depth = 0
+    while getattr(func, "__profiled__", False):
+        func = func.__wrapped__
+        depth += 1
+    return depth
+
+
+def test_sync_endpoints_are_profiled_once():
+    routes = [route for route in app.routes if isinstance(route, ProfiledRoute)]
+    assert routes
+    for route in routes:
+        expected = 0 if inspect.iscoroutinefunction(route.endpoint) else 1
+        assert wrap_depth(route.endpoint) == expected, route.path
+
+
+def test_token_not_verified_unless_profile_requested(monkeypatch):
+    def verify(request):
+        raise AssertionError("token verified for an unprofiled request")
+
+    monkeypatch.setattr(profiler, "get_bearer_claims", verify)
+    monkeypatch.setattr(settings, "PROFILER_SAMPLE_RATE", 0.0)
+    monkeypatch.setattr(settings, "PROFILER_ENABLED", True)
+    assert not should_profile(make_request({"Authorization": "Bearer token"}))
+    monkeypatch.setattr(settings, "PROFILER_ENABLED", False)
+    assert not should_profile(make_request({"Authorization": "Bearer token", "X-Profile": "1"}))
+
+
+def test_profile_requires_admin(monkeypatch):
+    monkeypatch.setattr(settings, "PROFILER_ENABLED", True)
+    monkeypatch.setattr(profiler, "get_bearer_claims", lambda request: {"role": "user"})
+    assert not should_profile(make_request({"X-Profile": "1"}))
+    monkeypatch.setattr(profiler, "get_bearer_claims", lambda request: {"role": "admin"})
+    assert should_profile(make_request({"X-Profile": "1"}))
+
+
+def test_dependencies_and_serialization_are_timed_outside_the_endpoint(tmp_path, monkeypatch):
+    class SlowResponse(JSONResponse):
+
+        def render(self, content) -> bytes:
+            time.sleep(0.03)
+            return super().render(content)
+
+    def slow_dependency():
+        time.sleep(0.05)
+
+    router = APIRouter(route_class=ProfiledRoute)
+
+    @router.get("/item", response_class=SlowResponse)
+    def item(_: None = Depends(slow_dependency)):
+        time.sleep(0.02)
+        return {"ok": True}
+
+    api = FastAPI()
+    api.include_router(router)
+
+    @api.middleware("http")
+    async def profile(request, call_next):
+        session, token = profiler.start_profile(request.method, request.url.path)
+        try:
+            response = await call_next(request)
+        finally:
+            profiler.stop_profile(session, token)
+        response.headers.update(profiler.finish_profile(session))
+        return response
+
+    monkeypatch.setattr(settings, "PROFILER_DIR", str(tmp_path))
+    headers = TestClient(api).get("/item").headers
+
+    assert float(headers["x-profile-dependencies-ms"]) >= 50
+    assert 20 <= float(headers["x-profile-endpoint-ms"]) < 50
+    assert float(headers["x-profile-serialization-ms"]) >= 30
@@ -0,0 +1,37 @@
+from datetime import datetime, timezone
+from unittest.mock import MagicMock
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+from app.db.query_log import explain_options, normalize_sql
+from app.models.product_model import Product
+from app.repository.order_repo import OrderRepository
+
+
+def compiled(statement) -> str:
+    return normalize_sql(str(statement.compile(dialect=postgresql.dialect())))
+
+
+def test_plain_select_gets_analyze():
+    assert explain_options(compiled(select(Product.id).where(Product.price > 10))) == "ANALYZE, BUFFERS, FORMAT JSON"
+    assert explain_options("SELECT orders.updated_at FROM orders") == "ANALYZE, BUFFERS, FORMAT JSON"
+    assert explain_options("WITH recent AS (SELECT orders.id FROM orders) SELECT recent.id FROM recent") == "ANALYZE, BUFFERS, FORMAT JSON"
+
+
+def test_locking_select_is_not_executed():
+    assert explain_options(compiled(select(Product).where(Product.id == 1).with_for_update())) == "FORMAT JSON"
+    assert explain_options(compiled(select(Product.id).with_for_update(skip_locked=True))) == "FORMAT JSON"
+    assert explain_options(compiled(select(Product.id).with_for_update(read=True))) == "FORMAT JSON"
+    assert explain_options(compiled(select(Product.id).with_for_update(key_share=True))) == "FORMAT JSON"
+
+
+def test_data_modifying_cte_is_not_executed():
+    session = MagicMock()
+    OrderRepository(session).archive_terminal_orders(datetime.now(timezone.utc), 10)
+    sql = compiled(session.execute.call_args[0][0])
+    assert sql.startswith("WITH")
+    assert explain_options(sql) == "FORMAT JSON"
+
+
+def test_writes_are_never_explained():
+    assert explain_options("INSERT INTO orders (user_id) VALUES (?)") is None
+    assert explain_options("UPDATE products SET stock=? WHERE products.id = ?") is None
@@ -0,0 +1,55 @@
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.responses import JSONResponse
+from fastapi.testclient import TestClient
+from app.core import rate_limit
+from app.core.exceptions import RateLimitExceededException
+from app.core.rate_limit import RateLimiter, limit_login
+
+
+@pytest.fixture
+def login_client(fake_redis, monkeypatch):
+    monkeypatch.setattr(rate_limit, "login_rate_limiter", RateLimiter("login", capacity=2, refill_per_second=0.001))
+    monkeypatch.setattr(rate_limit, "login_account_rate_limiter", RateLimiter("login-account", capacity=4, refill_per_second=0.001))
+    app = FastAPI()
+
+    @app.exception_handler(RateLimitExceededException)
+    async def rate_limited(request, exc):
+        return JSONResponse(status_code=429, content={"detail": str(exc)})
+
+    @app.post("/login", dependencies=[Depends(limit_login)])
+    def login():
+        return {"ok": True}
+
+    return TestClient(app)
+
+
+def attempt(client, username: str) -> int:
+    return client.post("/login", data={"username": username, "password": "x"}).status_code
+
+
+def test_login_limited_per_account_and_ip(login_client):
+    assert [attempt(login_client, "Alice@example.com"), attempt(login_client, "alice@example.com")] == [200, 200]
+    assert attempt(login_client, "alice@example.com ") == 429
+
+
+def test_throttled_ip_cannot_lock_out_an_account(login_client, monkeypatch):
+    ip = "10.0.0.66"
+    monkeypatch.setattr(rate_limit, "get_client_ip", lambda request: ip)
+    assert [attempt(login_client, "alice@example.com") for _ in range(5)] == [200, 200, 429, 429, 429]
+
+    ip = "10.0.0.1"
+    assert attempt(login_client, "alice@example.com") == 200
+
+
+def test_login_capped_per_account_across_ips(login_client, monkeypatch):
+    ips = iter(f"10.0.0.{index}" for index in range(1, 10))
+    monkeypatch.setattr(rate_limit, "get_client_ip", lambda request: next(ips))
+
+    assert [attempt(login_client, "alice@example.com") for _ in range(5)] == [200, 200, 200, 200, 429]
+
+
+def test_login_limited_per_ip_across_accounts(login_client):
+    assert attempt(login_client, "a@example.com") == 200
+    assert attempt(login_client, "b@example.com") == 200
+    assert attempt(login_client, "c@example.com") == 429
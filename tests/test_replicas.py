@@ -0,0 +1,85 @@
+import itertools
+from types import SimpleNamespace
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from app.core import read_your_writes
+from app.core.read_your_writes import has_recent_write, mark_recent_write
+from app.db import database
+
+
+@pytest.fixture
+def engines(tmp_path, monkeypatch):
+    primary = create_engine(f"sqlite:///{tmp_path / 'primary.db'}")
+    down = create_engine(f"sqlite:///{tmp_path / 'missing' / 'replica.db'}")
+    replica = create_engine(f"sqlite:///{tmp_path / 'replica.db'}")
+    monkeypatch.setattr(database, "_engine", primary)
+    monkeypatch.setattr(database, "_SessionLocal", sessionmaker(bind=primary))
+    monkeypatch.setattr(database, "_ReplicaSessionLocals", [sessionmaker(bind=down), sessionmaker(bind=replica)])
+    monkeypatch.setattr(database, "_replica_down_until", [0.0, 0.0])
+    monkeypatch.setattr(database, "_replica_cursor", itertools.count())
+    return SimpleNamespace(primary=primary, down=down, replica=replica)
+
+
+def _request(pin_primary: bool = False):
+    return SimpleNamespace(state=SimpleNamespace(pin_primary=pin_primary))
+
+
+def _read_bind(request):
+    sessions = database.get_read_db(request)
+    db = next(sessions)
+    bind = db.get_bind()
+    sessions.close()
+    return bind
+
+
+def test_reads_skip_unreachable_replica(engines):
+    assert _read_bind(_request()) is engines.replica
+    assert database._replica_down_until[0] > 0
+    assert database._replica_down_until[1] == 0
+    assert _read_bind(_request()) is engines.replica
+
+
+def test_pinned_reads_and_no_healthy_replica_use_primary(engines, monkeypatch):
+    assert _read_bind(_request(pin_primary=True)) is engines.primary
+
+    monkeypatch.setattr(database, "_ReplicaSessionLocals", database._ReplicaSessionLocals[:1])
+    monkeypatch.setattr(database, "_replica_down_until", [0.0])
+    db = next(database.get_read_db(_request()))
+    assert db.get_bind() is engines.primary
+    assert not database.is_replica_session(db)
+
+
+def test_recent_write_is_seen_locally_without_redis(fake_redis, monkeypatch):
+    monkeypatch.setattr(read_your_writes, "_local_writes", {})
+    assert not has_recent_write(1)
+
+    mark_recent_write(1)
+    fake_redis.delete("ryw:user:1")
+
+    assert has_recent_write(1)
+    assert not has_recent_write(2)
+
+
+def test_recent_write_is_shared_through_redis(fake_redis, monkeypatch):
+    mark_recent_write(1)
+    monkeypatch.setattr(read_your_writes, "_local_writes", {})
+
+    assert has_recent_write(1)
+    assert fake_redis.ttl("ryw:user:1") > 0
+
+
+def test_expired_local_writes_are_pruned_on_insert(fake_redis, monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(read_your_writes, "_local_writes", {})
+    monkeypatch.setattr(read_your_writes, "time", SimpleNamespace(monotonic=lambda: now[0]))
+    monkeypatch.setattr(read_your_writes.settings, "READ_YOUR_WRITES_SECONDS", 5)
+    mark_recent_write(1)
+    mark_recent_write(2)
+    now[0] = 103.0
+    mark_recent_write(1)
+
+    now[0] = 106.0
+    mark_recent_write(3)
+
+    assert list(read_your_writes._local_writes) == [1, 3]
@@ -0,0 +1,133 @@
+from types import SimpleNamespace
+import pytest
+from app.core.config import settings
+from app.core.exceptions import OrderAlreadyCancelledException
+from app.jobs import reservation_sweeper
+from app.models.order_model import OrderStatus
+from app.services import order_service
+from app.services.order_service import OrderService
+
+
+class FakeOrderRepository:
+
+    def __init__(self, expired):
+        self.expired = expired
+        self.calls = []
+
+    def cancel_expired_reservations(self, now, batch_size):
+        self.calls.append("cancel")
+        return self.expired
+
+    def adjust_stock(self, deltas):
+        self.calls.append(("adjust", deltas))
+        return {product_id: 10 + quantity for product_id, quantity in deltas.items()}
+
+    def commit(self):
+        self.calls.append("commit")
+
+
+class FakeAnalytics:
+
+    def __init__(self):
+        self.changes = []
+
+    def apply(self, changes):
+        self.changes.extend((order.id, status, sign) for order, status, sign in changes)
+
+
+def _order(order_id: int, product_id: int, quantity: int):
+    return SimpleNamespace(id=order_id, user_id=1, product_id=product_id, quantity=quantity, status=OrderStatus.cancelled)
+
+
+def test_expire_reservations_releases_stock_per_product(monkeypatch):
+    events = []
+    monkeypatch.setattr(order_service, "record_orders", lambda orders: events.append(("read_model", len(orders))))
+    monkeypatch.setattr(order_service, "publish_order_event", lambda order, kind: events.append((kind, order.id)))
+    monkeypatch.setattr(order_service, "publish_stock_event", lambda product_id, stock: events.append(("stock", product_id, stock)))
+    monkeypatch.setattr(order_service.history_writer, "record", lambda changes: events.append(("history", len(changes))))
+    repository = FakeOrderRepository([_order(1, 5, 2), _order(2, 5, 1), _order(3, 6, 4)])
+    analytics = FakeAnalytics()
+
+    count, released = OrderService(repository, analytics).expire_reservations(10)
+
+    assert (count, released) == (3, {5: 3, 6: 4})
+    assert repository.calls == ["cancel", ("adjust", {5: 3, 6: 4}), "commit"]
+    assert analytics.changes[:3] == [(1, OrderStatus.pending, -1), (2, OrderStatus.pending, -1), (3, OrderStatus.pending, -1)]
+    assert analytics.changes[3:] == [(1, OrderStatus.cancelled, 1), (2, OrderStatus.cancelled, 1), (3, OrderStatus.cancelled, 1)]
+    assert events == [
+        ("read_model", 3),
+        ("order.status", 1), ("order.status", 2), ("order.status", 3),
+        ("stock", 5, 13), ("stock", 6, 14),
+        ("history", 3),
+    ]
+
+
+def test_expire_reservations_without_expired_orders_does_nothing():
+    repository = FakeOrderRepository([])
+
+    assert OrderService(repository, FakeAnalytics()).expire_reservations(10) == (0, {})
+    assert repository.calls == ["cancel"]
+
+
+def test_sweep_runs_batches_and_records_metrics(monkeypatch, fake_session):
+    batches = [(2, {5: 3}), (2, {5: 1, 6: 2}), (1, {6: 1}), (2, {7: 9})]
+
+    class FakeService:
+
+        def __init__(self, repository, analytics):
+            pass
+
+        def expire_reservations(self, batch_size):
+            return batches.pop(0)
+
+    db = fake_session
+    monkeypatch.setattr(settings, "ORDER_SWEEP_BATCH_SIZE", 2)
+    monkeypatch.setattr(reservation_sweeper, "create_session", lambda: db)
+    monkeypatch.setattr(reservation_sweeper, "OrderService", FakeService)
+    before = reservation_sweeper.get_sweeper_metrics()
+
+    assert reservation_sweeper.run_reservation_sweep() == {5: 4, 6: 3}
+
+    after = reservation_sweeper.get_sweeper_metrics()
+    assert batches == [(2, {7: 9})]
+    assert db.closed
+    assert after["runs"] == before["runs"] + 1
+    assert after["orders_expired"] == before["orders_expired"] + 5
+    assert (after["last_run_orders_expired"], after["last_run_units_released"]) == (5, 7)
+
+
+class LockingOrderRepository(FakeOrderRepository):
+
+    def __init__(self, order):
+        super().__init__([])
+        self.order = order
+
+    def get_by_id(self, order_id):
+        self.calls.append(("lock", order_id))
+        return self.order
+
+
+def test_status_update_rechecks_order_cancelled_by_sweeper():
+    repository = LockingOrderRepository(_order(1, 5, 2))
+
+    with pytest.raises(OrderAlreadyCancelledException):
+        OrderService(repository, FakeAnalytics()).update_status(1, OrderStatus.shipped)
+    assert repository.calls == [("lock", 1)]
+
+
+def test_cancelling_through_status_update_releases_stock_relatively(monkeypatch):
+    events = []
+    monkeypatch.setattr(order_service, "record_orders", lambda orders: None)
+    monkeypatch.setattr(order_service, "publish_order_event", lambda order, kind: None)
+    monkeypatch.setattr(order_service, "publish_stock_event", lambda product_id, stock: events.append((product_id, stock)))
+    monkeypatch.setattr(order_service.history_writer, "record", lambda changes: None)
+    order = _order(1, 5, 2)
+    order.status = OrderStatus.pending
+    repository = LockingOrderRepository(order)
+    analytics = FakeAnalytics()
+
+    OrderService(repository, analytics).update_status(1, OrderStatus.cancelled)
+
+    assert repository.calls == [("lock", 1), ("adjust", {5: 2}), "commit"]
+    assert analytics.changes == [(1, OrderStatus.pending, -1), (1, OrderStatus.cancelled, 1)]
+    assert events == [(5, 12)]
@@ -0,0 +1,62 @@
+from types import SimpleNamespace
+import pytest
+from sqlalchemy import MetaData, create_engine, inspect, text
+from sqlalchemy.pool import StaticPool
+from app.db import schema
+from app.models.product_model import Product
+
+
+@pytest.fixture
+def engine(monkeypatch):
+    # orders is partitioned with a composite key SQLite cannot create, so apply just products
+    metadata = MetaData()
+    Product.__table__.to_metadata(metadata)
+    schema.schema_meta.to_metadata(metadata)
+    monkeypatch.setattr(schema, "Base", SimpleNamespace(metadata=metadata))
+    return create_engine("sqlite://", poolclass=StaticPool)
+
+
+def _product_indexes(engine):
+    return {index["name"] for index in inspect(engine).get_indexes("products")}
+
+
+def _drop_price_index(engine):
+    with engine.begin() as conn:
+        conn.execute(text("DROP INDEX ix_products_active_price"))
+
+
+def test_create_all_mode_adds_missing_indexes_to_existing_tables(engine):
+    schema.ensure_schema(engine, "create_all")
+    _drop_price_index(engine)
+
+    schema.ensure_schema(engine, "create_all")
+
+    assert "ix_products_active_price" in _product_indexes(engine)
+
+
+def test_changed_fingerprint_adds_missing_indexes(engine):
+    schema.ensure_schema(engine, "fingerprint")
+    _drop_price_index(engine)
+    with engine.begin() as conn:
+        conn.execute(text("UPDATE schema_meta SET fingerprint = 'old'"))
+
+    schema.ensure_schema(engine, "fingerprint")
+
+    assert "ix_products_active_price" in _product_indexes(engine)
+
+
+def test_pre_existing_orders_table_is_upgraded_before_indexing():
+    engine = create_engine("sqlite://", poolclass=StaticPool)
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE users (id INTEGER PRIMARY KEY, name VARCHAR, email VARCHAR, password VARCHAR, role VARCHAR)"))
+        conn.execute(text("CREATE TABLE products (id INTEGER PRIMARY KEY, name VARCHAR(255), description VARCHAR(1000), price NUMERIC(10, 2), stock INTEGER, is_deleted BOOLEAN)"))
+        conn.execute(text("CREATE TABLE orders (id INTEGER PRIMARY KEY, user_id INTEGER, product_id INTEGER, quantity INTEGER, status VARCHAR(9))"))
+        conn.execute(text("INSERT INTO orders VALUES (1, 1, 1, 2, 'pending')"))
+
+    schema.ensure_schema(engine, "fingerprint")
+
+    columns = {column["name"] for column in inspect(engine).get_columns("orders")}
+    assert {"unit_price", "created_at", "reserved_until"} <= columns
+    assert {"ix_orders_user_created", "ix_orders_pending_reserved_until"} <= {index["name"] for index in inspect(engine).get_indexes("orders")}
+    with engine.connect() as conn:
+        assert conn.execute(text("SELECT created_at IS NOT NULL, unit_price FROM orders")).one() == (1, None)
@@ -0,0 +1,133 @@
+import time
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec
+from fastapi.testclient import TestClient
+from jose import jwt
+from app.core import security
+from app.core.config import settings
+from app.core.security import create_access_token, decode_token
+from app.main import app
+
+
+def _private_pem() -> str:
+    return ec.generate_private_key(ec.SECP256R1()).private_bytes(
+        serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption()
+    ).decode()
+
+
+def _public_pem(private_pem: str) -> str:
+    key = serialization.load_pem_private_key(private_pem.encode(), password=None)
+    return key.public_key().public_bytes(
+        serialization.Encoding.PEM, serialization.PublicFormat.SubjectPublicKeyInfo
+    ).decode()
+
+
+@pytest.fixture(autouse=True)
+def clean_token_cache():
+    security._verified_tokens.clear()
+    security._key_ring.cache_clear()
+    yield
+    security._verified_tokens.clear()
+    security._key_ring.cache_clear()
+
+
+@pytest.fixture
+def key_ring(tmp_path, monkeypatch):
+    retired = _private_pem()
+    (tmp_path / "2024-01.pub.pem").write_text(_public_pem(retired))
+    (tmp_path / "2025-01.pem").write_text(_private_pem())
+    (tmp_path / "2026-01.pem").write_text(_private_pem())
+    monkeypatch.setattr(settings, "ALGORITHM", "ES256")
+    monkeypatch.setattr(settings, "JWT_KEYS_DIR", str(tmp_path))
+    monkeypatch.setattr(settings, "JWT_ACTIVE_KID", "2026-01")
+    return retired
+
+
+def _digest(token: str) -> bytes:
+    return security.hashlib.sha256(token.encode()).digest()
+
+
+def _access_payload(user_id: int, expires_in: int = 600) -> dict:
+    return {"sub": str(user_id), "role": "user", "type": "access", "exp": int(time.time()) + expires_in}
+
+
+def test_cached_token_skips_signature_check(monkeypatch):
+    token = create_access_token(1, "user")
+    assert decode_token(token, "access")["sub"] == 1
+
+    def fail(*args, **kwargs):
+        raise AssertionError("token verified twice")
+
+    monkeypatch.setattr(security.jwt, "decode", fail)
+    assert decode_token(token, "access")["sub"] == 1
+
+
+def test_token_cache_evicts_least_recently_used(monkeypatch):
+    monkeypatch.setattr(settings, "TOKEN_CACHE_SIZE", 2)
+    first, second, third = (create_access_token(user_id, "user") for user_id in (1, 2, 3))
+    decode_token(first, "access")
+    decode_token(second, "access")
+    decode_token(first, "access")
+    decode_token(third, "access")
+
+    assert list(security._verified_tokens) == [_digest(first), _digest(third)]
+    assert decode_token(second, "access")["sub"] == 2
+    assert list(security._verified_tokens) == [_digest(third), _digest(second)]
+
+
+def test_expired_cached_token_is_rejected():
+    payload = _access_payload(1, expires_in=-10)
+    token = jwt.encode(payload, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+    digest = _digest(token)
+    security._verified_tokens[digest] = payload
+
+    assert decode_token(token, "access") is None
+    assert digest not in security._verified_tokens
+
+
+def test_es256_tokens_carry_active_kid(key_ring):
+    token = create_access_token(7, "user")
+
+    assert jwt.get_unverified_header(token) == {"alg": "ES256", "typ": "JWT", "kid": "2026-01"}
+    assert decode_token(token, "access")["sub"] == 7
+
+
+def test_es256_accepts_older_and_retired_keys(key_ring, tmp_path):
+    older = jwt.encode(_access_payload(8), (tmp_path / "2025-01.pem").read_text(), algorithm="ES256", headers={"kid": "2025-01"})
+    retired = jwt.encode(_access_payload(9), key_ring, algorithm="ES256", headers={"kid": "2024-01"})
+
+    assert decode_token(older, "access")["sub"] == 8
+    assert decode_token(retired, "access")["sub"] == 9
+
+
+def test_es256_rejects_unknown_or_mismatched_kid(key_ring):
+    unknown = jwt.encode(_access_payload(1), key_ring, algorithm="ES256", headers={"kid": "1999-01"})
+    mismatched = jwt.encode(_access_payload(1), key_ring, algorithm="ES256", headers={"kid": "2026-01"})
+
+    assert decode_token(unknown, "access") is None
+    assert decode_token(mismatched, "access") is None
+
+
+def test_missing_active_private_key_fails_loading(key_ring, monkeypatch):
+    monkeypatch.setattr(settings, "JWT_ACTIVE_KID", "2024-01")
+
+    with pytest.raises(RuntimeError):
+        security.load_signing_keys()
+
+
+def test_jwks_lists_public_keys(key_ring):
+    response = TestClient(app).get("/.well-known/jwks.json")
+
+    assert response.status_code == 200
+    assert response.headers["cache-control"] == f"public, max-age={settings.JWKS_MAX_AGE_SECONDS}"
+    keys = response.json()["keys"]
+    assert [key["kid"] for key in keys] == ["2024-01", "2025-01", "2026-01"]
+    for key in keys:
+        assert key["kty"] == "EC" and key["crv"] == "P-256"
+        assert key["alg"] == "ES256" and key["use"] == "sig"
+        assert "d" not in key
+
+
+def test_jwks_empty_for_shared_secret():
+    assert TestClient(app).get("/.well-known/jwks.json").json() == {"keys": []}
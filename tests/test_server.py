@@ -0,0 +1,116 @@
+import asyncio
+import os
+import signal
+import socket
+import time
+from types import SimpleNamespace
+import pytest
+from app import server
+from app.core.config import settings
+from app.server import Arbiter, _RequestLimit
+
+
+@pytest.fixture
+def arbiter(monkeypatch):
+    monkeypatch.setattr(server, "_bind_socket", lambda: socket.socket())
+    arbiter = Arbiter(app=None, workers=2)
+    yield arbiter
+    for pid in list(arbiter.children):
+        arbiter._signal(pid, signal.SIGKILL)
+        os.waitpid(pid, 0)
+    arbiter.sock.close()
+
+
+def _fork(action) -> int:
+    pid = os.fork()
+    if pid == 0:
+        try:
+            action()
+        finally:
+            os._exit(0)
+    return pid
+
+
+def test_request_limit_counts_http_requests_and_asks_server_to_exit():
+    calls = []
+
+    async def app(scope, receive, send):
+        calls.append(scope["type"])
+
+    limited = _RequestLimit(app, 2)
+    limited.server = SimpleNamespace(should_exit=False)
+
+    async def run():
+        await limited({"type": "lifespan"}, None, None)
+        await limited({"type": "http"}, None, None)
+        assert not limited.server.should_exit
+        await limited({"type": "http"}, None, None)
+
+    asyncio.run(run())
+    assert calls == ["lifespan", "http", "http"]
+    assert limited.count == 2
+    assert limited.server.should_exit
+
+
+def test_reap_returns_exited_workers(arbiter):
+    pid = _fork(lambda: os._exit(3))
+    arbiter.children[pid] = (1, time.monotonic() - 60)
+    os.waitid(os.P_PID, pid, os.WEXITED | os.WNOWAIT)
+
+    assert arbiter.reap() == [1]
+    assert arbiter.children == {}
+
+
+def test_memory_check_recycles_large_workers(arbiter, monkeypatch):
+    signals = []
+    arbiter.children = {101: (0, 0.0), 102: (1, 0.0)}
+    monkeypatch.setattr(settings, "SERVER_MAX_MEMORY_MB", 100)
+    monkeypatch.setattr(server, "_rss_mb", lambda pid: 150.0 if pid == 102 else 50.0)
+    monkeypatch.setattr(arbiter, "_signal", lambda pid, signum: signals.append((pid, signum)))
+
+    arbiter.check_memory()
+
+    assert signals == [(102, signal.SIGTERM)]
+    arbiter.children = {}
+
+
+def test_drain_stops_workers_and_kills_stragglers(arbiter, monkeypatch):
+    monkeypatch.setattr(settings, "SERVER_GRACEFUL_TIMEOUT_SECONDS", 0)
+    monkeypatch.setattr(settings, "SERVER_SHUTDOWN_GRACE_SECONDS", 0.5)
+
+    def ignore_term():
+        signal.signal(signal.SIGTERM, signal.SIG_IGN)
+        time.sleep(30)
+
+    polite = _fork(lambda: time.sleep(30))
+    stubborn = _fork(ignore_term)
+    arbiter.children = {polite: (0, time.monotonic()), stubborn: (1, time.monotonic())}
+    arbiter.stopping = True
+    time.sleep(0.1)
+
+    arbiter.drain()
+
+    assert arbiter.children == {}
+    assert arbiter.sock.fileno() == -1
+
+
+@pytest.mark.parametrize("worker_id, runs_jobs", [(0, True), (1, False)])
+def test_only_first_worker_runs_periodic_jobs(monkeypatch, worker_id, runs_jobs):
+    class FakeServer:
+
+        def __init__(self, config):
+            pass
+
+        def run(self, sockets):
+            assert settings.RUN_PERIODIC_JOBS is runs_jobs
+
+    monkeypatch.setattr(settings, "SERVER_MAX_REQUESTS", 0)
+    monkeypatch.setattr(settings, "RUN_PERIODIC_JOBS", True)
+    monkeypatch.setattr(server.uvicorn, "Server", FakeServer)
+    pid = os.fork()
+    if pid == 0:
+        server._run_worker(None, None, worker_id)
+
+    _, status = os.waitpid(pid, 0)
+    assert os.waitstatus_to_exitcode(status) == 0
+    assert settings.RUN_PERIODIC_JOBS
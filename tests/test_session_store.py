@@ -0,0 +1,78 @@
+import pytest
+from fastapi.testclient import TestClient
+from app.core.exceptions import InvalidCredentialsException
+from app.core.security import create_access_token
+from app.core.session_store import create_session, revoke_all_sessions, revoke_token_family, rotate_session
+from app.db import database
+from app.main import app
+
+
+def test_rotate_returns_new_token_and_invalidates_old(fake_redis):
+    token = create_session(1, "user")
+    rotated = rotate_session(token)
+    assert rotated["user_id"] == 1 and rotated["role"] == "user"
+    assert rotated["refresh_token"] != token
+    with pytest.raises(InvalidCredentialsException):
+        rotate_session(token)
+
+
+def test_reusing_rotated_token_revokes_family(fake_redis):
+    token = create_session(1, "user")
+    current = rotate_session(token)["refresh_token"]
+    with pytest.raises(InvalidCredentialsException):
+        rotate_session(token)
+    with pytest.raises(InvalidCredentialsException):
+        rotate_session(current)
+    assert fake_redis.smembers("user_sessions:1") == set()
+
+
+def test_devices_rotate_independently(fake_redis):
+    laptop = create_session(1, "user")
+    phone = create_session(1, "user")
+    rotate_session(laptop)
+    with pytest.raises(InvalidCredentialsException):
+        rotate_session(laptop)
+    assert rotate_session(phone)["user_id"] == 1
+
+
+def test_logout_with_token_revokes_only_that_device(fake_redis):
+    laptop = create_session(1, "user")
+    phone = create_session(1, "user")
+    revoke_token_family(1, laptop)
+    with pytest.raises(InvalidCredentialsException):
+        rotate_session(laptop)
+    assert rotate_session(phone)["user_id"] == 1
+
+
+def test_logout_with_token_of_another_user_is_rejected(fake_redis):
+    token = create_session(1, "user")
+    with pytest.raises(InvalidCredentialsException):
+        revoke_token_family(2, token)
+    assert rotate_session(token)["user_id"] == 1
+
+
+def test_logout_without_token_revokes_all_devices(fake_redis):
+    tokens = [create_session(1, "user"), create_session(1, "user")]
+    other_user = create_session(2, "user")
+    revoke_all_sessions(1)
+    for token in tokens:
+        with pytest.raises(InvalidCredentialsException):
+            rotate_session(token)
+    assert rotate_session(other_user)["user_id"] == 2
+
+
+def test_refresh_and_logout_endpoints_do_not_need_postgres(fake_redis, monkeypatch):
+    monkeypatch.setattr(database, "_SessionLocal", None)
+    client = TestClient(app)
+    token = create_session(1, "user")
+    response = client.post("/api/v1/users/refresh", json={"refresh_token": token})
+    assert response.status_code == 200
+    refreshed = response.json()["refresh_token"]
+
+    response = client.post(
+        "/api/v1/users/logout",
+        json={"refresh_token": refreshed},
+        headers={"Authorization": f"Bearer {create_access_token(1, 'user')}"},
+    )
+    assert response.status_code == 200
+    assert client.post("/api/v1/users/refresh", json={"refresh_token": refreshed}).status_code == 401